@@ -0,0 +1,179 @@
+"""
+SYNAPSE-X — AST Audit Engine
+Structural alternative to the Doctor agent's regex rules. The code is
+parsed once and every rule runs as a visitor over a single walk of the
+tree, so comments and string literals can no longer trigger (or satisfy)
+a rule. The walk also records the anchors healers need — module docstring
+end, the ``app = FastAPI(...)`` statement, secret literals — as absolute
+offsets for positional edits.
+"""
+
+from __future__ import annotations
+
+import ast
+import io
+import re
+from typing import Any, Callable, Sequence
+
+_SECRET_NAME = re.compile(r"(?i)(password|secret|api_key)")
+
+
+def _name_of(node: ast.AST) -> str | None:
+    """Identifier for a Name/Attribute node, else None."""
+    if isinstance(node, ast.Name):
+        return node.id
+    if isinstance(node, ast.Attribute):
+        return node.attr
+    return None
+
+
+def _imports(node: ast.AST) -> list[str]:
+    """Module and alias names brought in by an import statement."""
+    if isinstance(node, ast.Import):
+        return [a.name for a in node.names]
+    if isinstance(node, ast.ImportFrom):
+        return [node.module or ""] + [a.name for a in node.names]
+    return []
+
+
+# ── Rule visitors ────────────────────────────────────────────────────────────
+# Each visitor returns True when ``node`` is a hit for its rule.
+
+def _hit_logging(node: ast.AST) -> bool:
+    if any(name.split(".")[0] == "logging" for name in _imports(node)):
+        return True
+    return isinstance(node, ast.Call) and _name_of(node.func) == "getLogger"
+
+
+def _hit_error_handling(node: ast.AST) -> bool:
+    return isinstance(node, (ast.Try, getattr(ast, "TryStar", ast.Try)))
+
+
+def _hit_input_validation(node: ast.AST) -> bool:
+    if isinstance(node, ast.ClassDef):
+        return any(_name_of(b) == "BaseModel" for b in node.bases)
+    if isinstance(node, ast.Call):
+        return _name_of(node.func) in ("Field", "validator", "field_validator")
+    return isinstance(node, (ast.Name, ast.Attribute)) and _name_of(node) in ("validator", "field_validator")
+
+
+def _hit_cors(node: ast.AST) -> bool:
+    if "CORSMiddleware" in _imports(node):
+        return True
+    return isinstance(node, (ast.Name, ast.Attribute)) and _name_of(node) in ("CORSMiddleware", "add_middleware")
+
+
+def _hit_rate_limiting(node: ast.AST) -> bool:
+    names = _imports(node) or ([_name_of(node)] if isinstance(node, (ast.Name, ast.Attribute)) else [])
+    return any(n and ("RateLimiter" in n or "slowapi" in n or "throttle" in n) for n in names)
+
+
+def _secret_literals(node: ast.AST) -> list[tuple[str, ast.Constant]]:
+    """``(name, literal)`` pairs for secret-looking names bound to string literals."""
+    pairs: list[tuple[str | None, ast.AST | None]] = []
+    if isinstance(node, ast.Assign):
+        pairs = [(_name_of(t), node.value) for t in node.targets]
+    elif isinstance(node, ast.AnnAssign):
+        pairs = [(_name_of(node.target), node.value)]
+    elif isinstance(node, ast.keyword):
+        pairs = [(node.arg, node.value)]
+    return [
+        (name, value) for name, value in pairs
+        if name and _SECRET_NAME.search(name)
+        and isinstance(value, ast.Constant) and isinstance(value.value, str) and value.value
+    ]
+
+
+def _hit_hardcoded_secret(node: ast.AST) -> bool:
+    return bool(_secret_literals(node))
+
+
+_VISITORS: dict[str, Callable[[ast.AST], bool]] = {
+    "MISSING_LOGGING": _hit_logging,
+    "NO_ERROR_HANDLING": _hit_error_handling,
+    "HARDCODED_SECRETS": _hit_hardcoded_secret,
+    "NO_INPUT_VALIDATION": _hit_input_validation,
+    "NO_CORS": _hit_cors,
+    "NO_RATE_LIMITING": _hit_rate_limiting,
+}
+
+
+class AstAudit:
+    """
+    Result of a single-walk audit of one Python source string.
+
+    Attributes:
+        issues:          Findings in the same shape as the regex engine's.
+        secrets:         ``(name, start, end)`` offsets of secret literals.
+        docstring_end:   Offset just past the module docstring, or None.
+        app_end:         Offset just past ``app = FastAPI(...)``, or None.
+        imports_os:      Whether ``os`` is imported at module level.
+    """
+
+    def __init__(self, code: str, rules: Sequence[dict[str, Any]]) -> None:
+        tree = ast.parse(code)
+        # Split exactly like the tokenizer (\n, \r\n, \r) so AST positions line up
+        self._lines = io.StringIO(code, newline="").readlines()
+        self._line_starts = [0]
+        for line in self._lines:
+            self._line_starts.append(self._line_starts[-1] + len(line))
+
+        self.secrets: list[tuple[str, int, int]] = []
+        self.docstring_end: int | None = None
+        self.app_end: int | None = None
+        self.imports_os = False
+
+        hits: dict[str, list[ast.AST]] = {r["id"]: [] for r in rules}
+        active = [(r["id"], _VISITORS[r["id"]]) for r in rules if r["id"] in _VISITORS]
+
+        body = tree.body
+        if body and isinstance(body[0], ast.Expr) and isinstance(body[0].value, ast.Constant) \
+                and isinstance(body[0].value.value, str):
+            self.docstring_end = self._end(body[0])
+        for stmt in body:
+            if isinstance(stmt, ast.Import) and any(a.name == "os" for a in stmt.names):
+                self.imports_os = True
+            if self.app_end is None and isinstance(stmt, ast.Assign) and isinstance(stmt.value, ast.Call) \
+                    and any(_name_of(t) == "app" for t in stmt.targets) and _name_of(stmt.value.func) == "FastAPI":
+                self.app_end = self._end(stmt)
+
+        # Single walk: every node is offered to every rule visitor
+        for node in ast.walk(tree):
+            for rule_id, visit in active:
+                if visit(node):
+                    hits[rule_id].append(node)
+        for node in hits.get("HARDCODED_SECRETS", []):
+            for name, literal in _secret_literals(node):
+                self.secrets.append((name, self._start(literal), self._end(literal)))
+        self.secrets.sort(key=lambda s: s[1])
+
+        self.issues: list[dict[str, Any]] = []
+        for rule in rules:
+            found = hits.get(rule["id"], [])
+            if rule["must_match"] and not found:
+                self.issues.append({
+                    "id": rule["id"],
+                    "severity": rule["severity"],
+                    "description": rule["description"],
+                })
+            elif not rule["must_match"] and found:
+                self.issues.append({
+                    "id": rule["id"],
+                    "severity": rule["severity"],
+                    "description": rule["description"],
+                    "locations": [
+                        {"line": n.lineno, "start": self._start(n), "end": self._end(n)}  # type: ignore[attr-defined]
+                        for n in found
+                    ],
+                })
+
+    def _offset(self, lineno: int, col: int) -> int:
+        """Convert an AST (line, UTF-8 byte column) to a str offset."""
+        line = self._lines[lineno - 1] if lineno - 1 < len(self._lines) else ""
+        return self._line_starts[lineno - 1] + len(line.encode("utf-8")[:col].decode("utf-8", "ignore"))
+
+    def _start(self, node: ast.AST) -> int:
+        return self._offset(node.lineno, node.col_offset)  # type: ignore[attr-defined]
+
+    def _end(self, node: ast.AST) -> int:
+        return self._offset(node.end_lineno, node.end_col_offset)  # type: ignore[attr-defined]
@@ -0,0 +1,194 @@
+"""
+SYNAPSE-X — Result Cache
+Small thread-safe LRU cache with per-entry TTL used to memoise agent
+results. Lookups and inserts are O(1); expired entries are dropped lazily
+when they are read or reach the cold end of the LRU order. An optional
+subclass mirrors entries to an append-only JSON-lines file so they survive
+restarts.
+"""
+
+from __future__ import annotations
+
+import json
+import os
+import threading
+import time
+from collections import OrderedDict
+from pathlib import Path
+from typing import Any, Hashable
+
+
+class TTLCache:
+    """
+    Least-recently-used cache whose entries expire after ``ttl_seconds``.
+
+    Args:
+        maxsize:      Maximum number of entries; ``0`` disables caching.
+        ttl_seconds:  Entry lifetime; ``None`` keeps entries until evicted.
+    """
+
+    def __init__(self, maxsize: int = 256, ttl_seconds: float | None = 3600.0) -> None:
+        if maxsize < 0:
+            raise ValueError("maxsize must be >= 0")
+        self.maxsize = maxsize
+        self.ttl_seconds = ttl_seconds
+        self._lock = threading.Lock()
+        self._data: OrderedDict[Hashable, tuple[float | None, Any]] = OrderedDict()
+        self._hits = 0
+        self._misses = 0
+        self._evictions = 0
+        self._expirations = 0
+
+    def __len__(self) -> int:
+        return len(self._data)
+
+    def get(self, key: Hashable, default: Any = None) -> Any:
+        """Return the cached value for ``key`` and mark it recently used."""
+        with self._lock:
+            item = self._data.get(key)
+            if item is not None:
+                expires, value = item
+                if expires is None or expires > time.monotonic():
+                    self._data.move_to_end(key)
+                    self._hits += 1
+                    return value
+                del self._data[key]
+                self._expirations += 1
+            self._misses += 1
+            return default
+
+    def set(self, key: Hashable, value: Any, expires_at: float | None = None) -> None:
+        """
+        Store ``value``, evicting the least recently used entry when full.
+
+        ``expires_at`` (``time.monotonic()`` clock) overrides the default TTL.
+        """
+        if self.maxsize == 0:
+            return
+        if expires_at is None and self.ttl_seconds is not None:
+            expires_at = time.monotonic() + self.ttl_seconds
+        with self._lock:
+            self._data[key] = (expires_at, value)
+            self._data.move_to_end(key)
+            while len(self._data) > self.maxsize:
+                self._data.popitem(last=False)
+                self._evictions += 1
+
+    def clear(self) -> int:
+        """Drop every entry and return how many were removed."""
+        with self._lock:
+            count = len(self._data)
+            self._data.clear()
+        return count
+
+    def stats(self) -> dict[str, Any]:
+        """Occupancy and hit/miss counters."""
+        with self._lock:
+            lookups = self._hits + self._misses
+            return {
+                "size": len(self._data),
+                "maxsize": self.maxsize,
+                "ttl_seconds": self.ttl_seconds,
+                "hits": self._hits,
+                "misses": self._misses,
+                "hit_rate": round(self._hits / lookups, 4) if lookups else 0.0,
+                "evictions": self._evictions,
+                "expirations": self._expirations,
+            }
+
+
+class PersistentTTLCache(TTLCache):
+    """
+    :class:`TTLCache` backed by an append-only JSON-lines file.
+
+    Every insert appends one ``{"key", "created", "value"}`` line; on start-up
+    the file is replayed, entries past their TTL are skipped and a torn final
+    line is ignored. The file is rewritten with only the live entries once it
+    holds more than twice ``maxsize`` lines. Keys must be strings and values
+    JSON-serialisable.
+
+    Args:
+        path:         JSON-lines file (parent directories are created).
+        maxsize:      As for :class:`TTLCache`.
+        ttl_seconds:  As for :class:`TTLCache`; measured in wall-clock time
+                      across restarts.
+    """
+
+    def __init__(
+        self,
+        path: str | os.PathLike[str],
+        maxsize: int = 256,
+        ttl_seconds: float | None = 3600.0,
+    ) -> None:
+        super().__init__(maxsize, ttl_seconds)
+        self.path = Path(path)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._file_lock = threading.Lock()
+        self._created: dict[str, float] = {}
+        self._lines = 0
+        self._load()
+
+    def _load(self) -> None:
+        """Replay the file into memory, then compact it if it is mostly stale."""
+        if not self.path.exists():
+            return
+        now_wall, now_mono = time.time(), time.monotonic()
+        with open(self.path, encoding="utf-8") as fh:
+            for line in fh:
+                self._lines += 1
+                try:
+                    record = json.loads(line)
+                except ValueError:
+                    continue  # torn write from a crash
+                expires_at = None
+                if self.ttl_seconds is not None:
+                    remaining = record["created"] + self.ttl_seconds - now_wall
+                    if remaining <= 0:
+                        continue
+                    expires_at = now_mono + remaining
+                super().set(record["key"], record["value"], expires_at=expires_at)
+                self._created[record["key"]] = record["created"]
+        if self._lines > len(self):
+            self._rewrite()
+
+    def _rewrite(self) -> None:
+        """Atomically replace the file with one line per live entry."""
+        with self._lock:
+            live = [(key, value) for key, (_, value) in self._data.items()]
+        with self._file_lock:
+            self._created = {key: self._created.get(key, time.time()) for key, _ in live}
+            tmp = self.path.with_suffix(self.path.suffix + ".tmp")
+            with open(tmp, "w", encoding="utf-8") as fh:
+                for key, value in live:
+                    fh.write(json.dumps(
+                        {"key": key, "created": self._created[key], "value": value},
+                        separators=(",", ":"),
+                    ) + "\n")
+            os.replace(tmp, self.path)
+            self._lines = len(live)
+
+    def set(self, key: Hashable, value: Any, expires_at: float | None = None) -> None:
+        super().set(key, value, expires_at)
+        if self.maxsize == 0:
+            return
+        created = time.time()
+        line = json.dumps({"key": key, "created": created, "value": value}, separators=(",", ":"))
+        with self._file_lock:
+            self._created[key] = created  # type: ignore[index]
+            with open(self.path, "a", encoding="utf-8") as fh:
+                fh.write(line + "\n")
+            self._lines += 1
+            compact = self._lines > 2 * self.maxsize
+        if compact:
+            self._rewrite()
+
+    def clear(self) -> int:
+        count = super().clear()
+        with self._file_lock:
+            self.path.unlink(missing_ok=True)
+            self._created.clear()
+            self._lines = 0
+        return count
+
+    def stats(self) -> dict[str, Any]:
+        return {**super().stats(), "path": str(self.path), "file_lines": self._lines}
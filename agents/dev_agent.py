@@ -5,117 +5,189 @@ Generates backend service code, FastAPI scaffolds, endpoints, and route definiti
 
 from __future__ import annotations
 
+import json
+import keyword
+import re
+import string
 import textwrap
 from datetime import datetime, timezone
-from typing import Any
+from typing import Any, NamedTuple
 
 
-def _generate_fastapi_scaffold(prompt: str, tasks: list[dict[str, Any]]) -> str:
-    """Produce a syntactically valid FastAPI service scaffold."""
+# ── Templates ────────────────────────────────────────────────────────────────
+# Dedented and split into literal/field chunks once, at import; rendering a
+# scaffold is then a single join whose cost grows only with the endpoints.
 
-    # Extract meaningful identifiers from the prompt
-    app_name = prompt.split()[1] if len(prompt.split()) > 1 else "service"
-    app_name = "".join(c for c in app_name if c.isalnum()).lower() or "service"
+class _Template:
+    """A ``str.format``-style template pre-split into ``(literal, field)`` chunks."""
 
-    # Build CRUD endpoint stubs from the task graph
-    endpoint_blocks: list[str] = []
-    for task in tasks:
-        if task.get("category") == "backend":
-            slug = task["title"].lower().replace(" ", "_")[:30]
-            endpoint_blocks.append(textwrap.dedent(f"""\
-                @app.get("/{slug}")
-                async def {slug}():
-                    \"\"\"Auto-generated endpoint: {task['title']}\"\"\"
-                    return {{"status": "ok", "task": "{task['title']}"}}
-            """))
-
-    if not endpoint_blocks:
-        endpoint_blocks.append(textwrap.dedent("""\
-            @app.get("/items")
-            async def list_items():
-                \"\"\"List all items.\"\"\"
-                return {"items": []}
-
-            @app.post("/items")
-            async def create_item(name: str = "default"):
-                \"\"\"Create a new item.\"\"\"
-                return {"created": name}
-
-            @app.get("/items/{item_id}")
-            async def get_item(item_id: int):
-                \"\"\"Get item by ID.\"\"\"
-                return {"item_id": item_id, "name": "sample"}
-
-            @app.delete("/items/{item_id}")
-            async def delete_item(item_id: int):
-                \"\"\"Delete item by ID.\"\"\"
-                return {"deleted": item_id}
-        """))
-
-    endpoints_code = "\n".join(endpoint_blocks)
-
-    code = textwrap.dedent(f"""\
-        \"\"\"
-        Auto-generated FastAPI service: {app_name}
-        Generated by SYNAPSE-X Developer Agent
-        \"\"\"
-        from fastapi import FastAPI, HTTPException
-        from pydantic import BaseModel
-        from typing import Optional, List
-        import logging
-
-        logging.basicConfig(level=logging.INFO)
-        logger = logging.getLogger("{app_name}")
-
-        app = FastAPI(
-            title="{app_name.capitalize()} Service",
-            description="Auto-generated by SYNAPSE-X Dev Agent",
-            version="0.1.0",
-        )
+    __slots__ = ("_chunks",)
 
+    def __init__(self, text: str) -> None:
+        self._chunks = [
+            (literal, field)
+            for literal, field, _spec, _conversion in string.Formatter().parse(textwrap.dedent(text))
+        ]
 
-        class Item(BaseModel):
-            id: Optional[int] = None
-            name: str
-            description: Optional[str] = None
+    def render(self, **values: str) -> str:
+        parts: list[str] = []
+        for literal, field in self._chunks:
+            parts.append(literal)
+            if field is not None:
+                parts.append(values[field])
+        return "".join(parts)
 
 
-        @app.get("/")
-        async def root():
-            return {{"service": "{app_name}", "status": "running"}}
+_SERVICE_TEMPLATE = _Template("""\
+    \"\"\"
+    Auto-generated FastAPI service: {app_name}
+    Generated by SYNAPSE-X Developer Agent
+    \"\"\"
+    from fastapi import FastAPI, HTTPException
+    from pydantic import BaseModel
+    from typing import Optional, List
+    import logging
 
+    logging.basicConfig(level=logging.INFO)
+    logger = logging.getLogger("{app_name}")
 
-        @app.get("/health")
-        async def health():
-            return {{"healthy": True}}
+    app = FastAPI(
+        title="{app_title} Service",
+        description="Auto-generated by SYNAPSE-X Dev Agent",
+        version="0.1.0",
+    )
 
 
-        {endpoints_code}
-    """)
-    return code
+    class Item(BaseModel):
+        id: Optional[int] = None
+        name: str
+        description: Optional[str] = None
 
 
-def _generate_route_definitions(tasks: list[dict[str, Any]]) -> list[dict[str, str]]:
-    """Generate a list of route definition dicts."""
-    routes: list[dict[str, str]] = [
-        {"method": "GET", "path": "/", "description": "Root / health check"},
-        {"method": "GET", "path": "/health", "description": "Health probe"},
-    ]
+    @app.get("/")
+    async def root():
+        return {{"service": "{app_name}", "status": "running"}}
+
+
+    @app.get("/health")
+    async def health():
+        return {{"healthy": True}}
+
+
+    {endpoints}
+""")
+
+_ENDPOINT_TEMPLATE = _Template("""\
+    @app.get("/{slug}")
+    async def {slug}():
+        \"\"\"Auto-generated endpoint: {doc_title}\"\"\"
+        return {{"status": "ok", "task": {title_literal}}}
+""")
+
+_DEFAULT_ENDPOINTS = textwrap.dedent("""\
+    @app.get("/items")
+    async def list_items():
+        \"\"\"List all items.\"\"\"
+        return {"items": []}
+
+    @app.post("/items")
+    async def create_item(name: str = "default"):
+        \"\"\"Create a new item.\"\"\"
+        return {"created": name}
+
+    @app.get("/items/{item_id}")
+    async def get_item(item_id: int):
+        \"\"\"Get item by ID.\"\"\"
+        return {"item_id": item_id, "name": "sample"}
+
+    @app.delete("/items/{item_id}")
+    async def delete_item(item_id: int):
+        \"\"\"Delete item by ID.\"\"\"
+        return {"deleted": item_id}
+""")
+
+_BASE_ROUTES: tuple[dict[str, str], ...] = (
+    {"method": "GET", "path": "/", "description": "Root / health check"},
+    {"method": "GET", "path": "/health", "description": "Health probe"},
+)
+
+_DEFAULT_ROUTES: tuple[dict[str, str], ...] = (
+    {"method": "GET", "path": "/items", "description": "List items"},
+    {"method": "POST", "path": "/items", "description": "Create item"},
+    {"method": "GET", "path": "/items/{item_id}", "description": "Get item"},
+    {"method": "DELETE", "path": "/items/{item_id}", "description": "Delete item"},
+)
+
+_NON_IDENTIFIER = re.compile(r"[^0-9a-z]+")
+
+# Module-level names the service template already defines
+_RESERVED_NAMES = frozenset({"app", "health", "logger", "logging", "root"})
+
+
+class _Endpoint(NamedTuple):
+    """A backend task's endpoint, slugged once and shared by code and routes."""
+
+    slug: str
+    title: str
+
+
+def _slugify(title: str) -> str:
+    """Lower-case identifier usable both as a URL segment and a function name."""
+    slug = _NON_IDENTIFIER.sub("_", title.lower()).strip("_")[:30].rstrip("_") or "task"
+    return f"task_{slug}" if slug[0].isdigit() or keyword.iskeyword(slug) else slug
+
+
+def _endpoints(tasks: list[dict[str, Any]]) -> list[_Endpoint]:
+    """Backend tasks' endpoints; slugs that collide get a numeric suffix."""
+    taken = set(_RESERVED_NAMES)
+    endpoints: list[_Endpoint] = []
     for task in tasks:
-        if task.get("category") == "backend":
-            slug = task["title"].lower().replace(" ", "_")[:30]
-            routes.append({
-                "method": "GET",
-                "path": f"/{slug}",
-                "description": task["title"],
-            })
-    if len(routes) == 2:
-        routes.extend([
-            {"method": "GET", "path": "/items", "description": "List items"},
-            {"method": "POST", "path": "/items", "description": "Create item"},
-            {"method": "GET", "path": "/items/{item_id}", "description": "Get item"},
-            {"method": "DELETE", "path": "/items/{item_id}", "description": "Delete item"},
-        ])
+        if task.get("category") != "backend":
+            continue
+        base = slug = _slugify(task["title"])
+        n = 2
+        while slug in taken:
+            slug = f"{base}_{n}"
+            n += 1
+        taken.add(slug)
+        endpoints.append(_Endpoint(slug, task["title"]))
+    return endpoints
+
+
+def _generate_fastapi_scaffold(prompt: str, endpoints: list[_Endpoint]) -> str:
+    """Produce a syntactically valid FastAPI service scaffold."""
+
+    # Extract meaningful identifiers from the prompt
+    words = prompt.split()
+    app_name = words[1] if len(words) > 1 else "service"
+    app_name = "".join(c for c in app_name if c.isalnum()).lower() or "service"
+
+    # Build endpoint stubs from the task graph
+    if endpoints:
+        endpoints_code = "\n".join(
+            _ENDPOINT_TEMPLATE.render(
+                slug=ep.slug,
+                doc_title=ep.title.replace("\\", "\\\\").replace('"', '\\"'),
+                title_literal=json.dumps(ep.title),
+            )
+            for ep in endpoints
+        )
+    else:
+        endpoints_code = _DEFAULT_ENDPOINTS
+
+    return _SERVICE_TEMPLATE.render(
+        app_name=app_name,
+        app_title=app_name.capitalize(),
+        endpoints=endpoints_code,
+    )
+
+
+def _generate_route_definitions(endpoints: list[_Endpoint]) -> list[dict[str, str]]:
+    """Generate a list of route definition dicts."""
+    routes = [dict(r) for r in _BASE_ROUTES]
+    routes.extend({"method": "GET", "path": f"/{ep.slug}", "description": ep.title} for ep in endpoints)
+    if not endpoints:
+        routes.extend(dict(r) for r in _DEFAULT_ROUTES)
     return routes
 
 
@@ -128,10 +200,10 @@ def generate(prompt: str, task_graph: list[dict[str, Any]]) -> dict[str, Any]:
     Returns:
         dict with keys: service_code, route_definitions, status
     """
-    backend_tasks = [t for t in task_graph if t.get("category") == "backend"]
+    endpoints = _endpoints(task_graph)
 
-    service_code = _generate_fastapi_scaffold(prompt, backend_tasks)
-    route_defs = _generate_route_definitions(backend_tasks)
+    service_code = _generate_fastapi_scaffold(prompt, endpoints)
+    route_defs = _generate_route_definitions(endpoints)
 
     return {
         "agent": "dev_agent",
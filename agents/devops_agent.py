@@ -1,81 +1,125 @@
 """
 SYNAPSE-X — DevOps Child Agent
 Generates Dockerfiles, deployment scripts, and simulated CI/CD pipeline configs.
+
+Artifacts depend only on the infrastructure parameters (Python version, port,
+CI provider, health endpoint, image name), never on the prompt, so each one
+is rendered once per distinct parameter tuple and the same immutable string
+is shared by every later build.
 """
 
 from __future__ import annotations
 
+import os
+import re
 import textwrap
 from datetime import datetime, timezone
-from typing import Any
-
-
-def _generate_dockerfile(prompt: str) -> str:
-    """Produce a production-ready multi-stage Dockerfile."""
-    return textwrap.dedent("""\
-        # ── SYNAPSE-X Auto-Generated Dockerfile ──────────────────────────────
-        # Multi-stage build for Python FastAPI service
-
-        # Stage 1 — Builder
-        FROM python:3.12-slim AS builder
-        WORKDIR /build
-        COPY requirements.txt .
-        RUN pip install --no-cache-dir --prefix=/install -r requirements.txt
-
-        # Stage 2 — Runtime
-        FROM python:3.12-slim
-        WORKDIR /app
-
-        # Security: run as non-root
-        RUN addgroup --system app && adduser --system --group app
-        COPY --from=builder /install /usr/local
-        COPY . .
-
-        # Expose FastAPI default port
-        EXPOSE 8000
-
-        # Health check
-        HEALTHCHECK --interval=30s --timeout=5s --retries=3 \\
-            CMD python -c "import urllib.request; urllib.request.urlopen('http://localhost:8000/health')"
-
-        USER app
-        CMD ["uvicorn", "main:app", "--host", "0.0.0.0", "--port", "8000"]
-    """)
-
+from functools import lru_cache
+from typing import Any, Mapping, NamedTuple
 
-def _generate_deployment_script() -> str:
-    """Produce a shell deployment script."""
-    return textwrap.dedent("""\
-        #!/usr/bin/env bash
-        # ── SYNAPSE-X Deployment Script ─────────────────────────────────────
-        set -euo pipefail
 
-        IMAGE_NAME="synapse-x-service"
-        TAG="${TAG:-latest}"
-        PORT="${PORT:-8000}"
+class InfraParams(NamedTuple):
+    """Infrastructure knobs the DevOps artifacts are rendered from."""
 
-        echo "🔨 Building Docker image..."
-        docker build -t "$IMAGE_NAME:$TAG" .
+    python_version: str = os.getenv("SYNAPSE_DEVOPS_PYTHON_VERSION", "3.12")
+    port: int = int(os.getenv("SYNAPSE_DEVOPS_PORT", "8000"))
+    ci_provider: str = os.getenv("SYNAPSE_DEVOPS_CI_PROVIDER", "github")
+    health_endpoint: str = "/health"
+    image_name: str = "synapse-x-service"
 
-        echo "🛑 Stopping existing container (if any)..."
-        docker stop "$IMAGE_NAME" 2>/dev/null || true
-        docker rm "$IMAGE_NAME" 2>/dev/null || true
 
-        echo "🚀 Starting container..."
-        docker run -d \\
-            --name "$IMAGE_NAME" \\
-            -p "$PORT:8000" \\
-            --restart unless-stopped \\
-            "$IMAGE_NAME:$TAG"
+# CI provider → (display name, path of the config file in the repository)
+_CI_PROVIDERS: dict[str, tuple[str, str]] = {
+    "github": ("GitHub Actions", ".github/workflows/ci.yml"),
+    "gitlab": ("GitLab CI", ".gitlab-ci.yml"),
+}
 
-        echo "✅ Service running at http://localhost:$PORT"
-        echo "📋 Logs: docker logs -f $IMAGE_NAME"
-    """)
+_PYTHON_VERSION = re.compile(r"^3\.\d{1,2}$")
+_HEALTH_ENDPOINT = re.compile(r"^/[\w\-/.]*$")
+_IMAGE_NAME = re.compile(r"^[a-z0-9][a-z0-9._\-]*$")
 
 
-def _generate_ci_config() -> str:
-    """Produce a GitHub Actions CI/CD workflow YAML."""
-    return textwrap.dedent("""\
+def _infra_params(overrides: Mapping[str, Any] | None) -> InfraParams:
+    """
+    Defaults merged with ``overrides``, validated before any of it is
+    interpolated into shell or YAML.
+    """
+    params = InfraParams()._replace(**dict(overrides or {}))
+    params = params._replace(port=int(params.port))
+    if not _PYTHON_VERSION.match(params.python_version):
+        raise ValueError(f"Unsupported python_version {params.python_version!r}")
+    if not 1 <= params.port <= 65535:
+        raise ValueError(f"Invalid port {params.port}")
+    if params.ci_provider not in _CI_PROVIDERS:
+        raise ValueError(f"Unknown ci_provider {params.ci_provider!r} (expected one of {sorted(_CI_PROVIDERS)})")
+    if not _HEALTH_ENDPOINT.match(params.health_endpoint):
+        raise ValueError(f"Invalid health_endpoint {params.health_endpoint!r}")
+    if not _IMAGE_NAME.match(params.image_name):
+        raise ValueError(f"Invalid image_name {params.image_name!r}")
+    return params
+
+
+# ── Templates (dedented once, at import) ─────────────────────────────────────
+
+_DOCKERFILE = textwrap.dedent("""\
+    # ── SYNAPSE-X Auto-Generated Dockerfile ──────────────────────────────
+    # Multi-stage build for Python FastAPI service
+
+    # Stage 1 — Builder
+    FROM python:{python_version}-slim AS builder
+    WORKDIR /build
+    COPY requirements.txt .
+    RUN pip install --no-cache-dir --prefix=/install -r requirements.txt
+
+    # Stage 2 — Runtime
+    FROM python:{python_version}-slim
+    WORKDIR /app
+
+    # Security: run as non-root
+    RUN addgroup --system app && adduser --system --group app
+    COPY --from=builder /install /usr/local
+    COPY . .
+
+    # Expose FastAPI port
+    EXPOSE {port}
+
+    # Health check
+    HEALTHCHECK --interval=30s --timeout=5s --retries=3 \\
+        CMD python -c "import urllib.request; urllib.request.urlopen('http://localhost:{port}{health_endpoint}')"
+
+    USER app
+    CMD ["uvicorn", "main:app", "--host", "0.0.0.0", "--port", "{port}"]
+""")
+
+_DEPLOYMENT_SCRIPT = textwrap.dedent("""\
+    #!/usr/bin/env bash
+    # ── SYNAPSE-X Deployment Script ─────────────────────────────────────
+    set -euo pipefail
+
+    IMAGE_NAME="{image_name}"
+    TAG="${{TAG:-latest}}"
+    PORT="${{PORT:-{port}}}"
+
+    echo "🔨 Building Docker image..."
+    docker build -t "$IMAGE_NAME:$TAG" .
+
+    echo "🛑 Stopping existing container (if any)..."
+    docker stop "$IMAGE_NAME" 2>/dev/null || true
+    docker rm "$IMAGE_NAME" 2>/dev/null || true
+
+    echo "🚀 Starting container..."
+    docker run -d \\
+        --name "$IMAGE_NAME" \\
+        -p "$PORT:{port}" \\
+        --restart unless-stopped \\
+        "$IMAGE_NAME:$TAG"
+
+    echo "✅ Service running at http://localhost:$PORT"
+    echo "📋 Logs: docker logs -f $IMAGE_NAME"
+""")
+
+_CI_TEMPLATES: dict[str, str] = {
+    "github": textwrap.dedent("""\
         # ── SYNAPSE-X CI/CD Pipeline ────────────────────────────────────────
         name: Build & Deploy
 
@@ -94,7 +138,7 @@ def _generate_ci_config() -> str:
               - name: Set up Python
                 uses: actions/setup-python@v5
                 with:
-                  python-version: "3.12"
+                  python-version: "{python_version}"
 
               - name: Install dependencies
                 run: pip install -r requirements.txt
@@ -115,36 +159,102 @@ def _generate_ci_config() -> str:
               - uses: actions/checkout@v4
 
               - name: Build Docker image
-                run: docker build -t synapse-x-service .
+                run: docker build -t {image_name} .
 
               - name: Smoke test
                 run: |
-                  docker run -d -p 8000:8000 --name test synapse-x-service
+                  docker run -d -p {port}:{port} --name test {image_name}
                   sleep 5
-                  curl -f http://localhost:8000/health
+                  curl -f http://localhost:{port}{health_endpoint}
                   docker stop test
-    """)
+    """),
+    "gitlab": textwrap.dedent("""\
+        # ── SYNAPSE-X CI/CD Pipeline ────────────────────────────────────────
+        stages:
+          - build
+          - docker
+
+        build:
+          stage: build
+          image: python:{python_version}-slim
+          script:
+            - pip install -r requirements.txt
+            - pip install ruff && ruff check .
+            - pip install httpx pytest
+            - pytest tests/ -v || echo "No tests yet"
+
+        docker:
+          stage: docker
+          image: docker:24
+          services:
+            - docker:24-dind
+          rules:
+            - if: $CI_COMMIT_BRANCH == "main"
+          script:
+            - docker build -t {image_name} .
+            - docker run -d -p {port}:{port} --name test {image_name}
+            - sleep 5
+            - apk add --no-cache curl
+            - curl -f http://docker:{port}{health_endpoint}
+            - docker stop test
+    """),
+}
+
+
+# ── Memoised renderers (keyed only by the parameters each file uses) ─────────
+
+@lru_cache(maxsize=64)
+def _generate_dockerfile(python_version: str, port: int, health_endpoint: str) -> str:
+    """Produce a production-ready multi-stage Dockerfile."""
+    return _DOCKERFILE.format(python_version=python_version, port=port, health_endpoint=health_endpoint)
+
+
+@lru_cache(maxsize=64)
+def _generate_deployment_script(port: int, image_name: str) -> str:
+    """Produce a shell deployment script."""
+    return _DEPLOYMENT_SCRIPT.format(port=port, image_name=image_name)
+
+
+@lru_cache(maxsize=64)
+def _generate_ci_config(params: InfraParams) -> str:
+    """Produce the CI/CD pipeline config for ``params.ci_provider``."""
+    return _CI_TEMPLATES[params.ci_provider].format(**params._asdict())
 
 
 # ── Public API ───────────────────────────────────────────────────────────────
 
-def generate(prompt: str, task_graph: list[dict[str, Any]]) -> dict[str, Any]:
+def generate(
+    prompt: str,
+    task_graph: list[dict[str, Any]],
+    infra: Mapping[str, Any] | None = None,
+) -> dict[str, Any]:
     """
     Generate deployment artifacts from the parent agent's task graph.
 
+    Args:
+        prompt:      The user's build request.
+        task_graph:  The Parent agent's task graph.
+        infra:       Optional :class:`InfraParams` overrides, e.g.
+                     ``{"port": 8080, "ci_provider": "gitlab"}``.
+
     Returns:
-        dict with: dockerfile, deployment_script, ci_config, status
+        dict with: dockerfile, deployment_script, ci_config, ci_config_path,
+        infra_metadata, status
     """
+    params = _infra_params(infra)
+    ci_name, ci_path = _CI_PROVIDERS[params.ci_provider]
     return {
         "agent": "devops_agent",
-        "dockerfile": _generate_dockerfile(prompt),
-        "deployment_script": _generate_deployment_script(),
-        "ci_config": _generate_ci_config(),
+        "dockerfile": _generate_dockerfile(params.python_version, params.port, params.health_endpoint),
+        "deployment_script": _generate_deployment_script(params.port, params.image_name),
+        "ci_config": _generate_ci_config(params),
+        "ci_config_path": ci_path,
         "infra_metadata": {
             "container_runtime": "Docker",
-            "ci_provider": "GitHub Actions",
-            "exposed_port": 8000,
-            "health_endpoint": "/health",
+            "ci_provider": ci_name,
+            "exposed_port": params.port,
+            "health_endpoint": params.health_endpoint,
+            "python_version": params.python_version,
         },
         "status": {
             "success": True,
@@ -6,11 +6,27 @@ security gaps), and applies healing patches to the generated code.
 
 from __future__ import annotations
 
+import asyncio
+import copy
+import difflib
+import hashlib
+import json
 import os
 import re
 import textwrap
+import time
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime, timezone
-from typing import Any
+from typing import Any, Mapping
+
+from agents import llm_client
+from agents.ast_audit import AstAudit
+from agents.cache import TTLCache
+from agents.rule_engine import RuleSet, line_of
+
+
+# "regex" scans raw text; "ast" parses once and audits the syntax tree
+_AUDIT_MODE = os.getenv("SYNAPSE_DOCTOR_MODE", "regex")
 
 
 # ── Issue detection rules ────────────────────────────────────────────────────
@@ -61,110 +77,231 @@ _ISSUE_RULES: list[dict[str, Any]] = [
 ]
 
 
-def _detect_issues(code: str) -> list[dict[str, str]]:
-    """Scan code string against issue rules and return findings."""
-    issues: list[dict[str, str]] = []
-    for rule in _ISSUE_RULES:
-        found = bool(re.search(rule["pattern"], code))
-        if rule["must_match"] and not found:
+# ── Artifact rule sets ───────────────────────────────────────────────────────
+# DevOps artifacts are audited with file-type-specific rules. These findings
+# are advisory: only the Python rules above have healers.
+
+_DOCKERFILE_RULES: list[dict[str, Any]] = [
+    {
+        "id": "DOCKER_ROOT_USER",
+        "severity": "warning",
+        "description": "No USER instruction — container runs as root",
+        "pattern": r"(?m)^[ \t]*USER[ \t]+\S+",
+        "must_match": True,
+    },
+    {
+        "id": "DOCKER_NO_HEALTHCHECK",
+        "severity": "info",
+        "description": "No HEALTHCHECK instruction — orchestrator cannot detect a hung service",
+        "pattern": r"(?m)^[ \t]*HEALTHCHECK\b",
+        "must_match": True,
+    },
+    {
+        "id": "DOCKER_LATEST_TAG",
+        "severity": "warning",
+        "description": "Base image pinned to the moving :latest tag",
+        "pattern": r"(?im)^[ \t]*FROM[ \t]+\S+:latest\b",
+        "must_match": False,
+    },
+    {
+        "id": "DOCKER_SECRET_IN_IMAGE",
+        "severity": "critical",
+        "description": "Secret-looking value baked into the image via ENV/ARG",
+        "pattern": r"(?im)^[ \t]*(?:ENV|ARG)[ \t]+\w*(?:PASSWORD|SECRET|API_KEY|TOKEN)\w*[ \t=]+\S+",
+        "must_match": False,
+    },
+]
+
+_SHELL_RULES: list[dict[str, Any]] = [
+    {
+        "id": "SHELL_NO_STRICT_MODE",
+        "severity": "warning",
+        "description": "Script does not enable 'set -e' — failed steps are ignored",
+        "pattern": r"(?m)^[ \t]*set[ \t]+-\w*e",
+        "must_match": True,
+    },
+    {
+        "id": "SHELL_PIPE_TO_SHELL",
+        "severity": "critical",
+        "description": "Remote script piped straight into a shell",
+        "pattern": r"\b(?:curl|wget)\b[^|\n]*\|[ \t]*(?:sudo[ \t]+)?(?:ba|z)?sh\b",
+        "must_match": False,
+    },
+    {
+        "id": "SHELL_HARDCODED_SECRETS",
+        "severity": "critical",
+        "description": "Potential hardcoded secret assigned in the script",
+        "pattern": r"""(?i)\b\w*(?:password|secret|api_key|token)\w*=["']?[^\s"'$]+""",
+        "must_match": False,
+    },
+]
+
+_YAML_RULES: list[dict[str, Any]] = [
+    {
+        "id": "CI_UNPINNED_ACTION",
+        "severity": "warning",
+        "description": "Action referenced by a moving branch instead of a tag or SHA",
+        "pattern": r"uses:[ \t]*[\w.-]+/[\w./-]+@(?:main|master|latest)\b",
+        "must_match": False,
+    },
+    {
+        "id": "CI_NO_PERMISSIONS",
+        "severity": "info",
+        "description": "Workflow does not restrict GITHUB_TOKEN permissions",
+        "pattern": r"(?m)^[ \t]*permissions[ \t]*:",
+        "must_match": True,
+    },
+    {
+        "id": "CI_HARDCODED_SECRETS",
+        "severity": "critical",
+        "description": "Potential hardcoded secret in workflow (use ${{ secrets.* }})",
+        "pattern": r"""(?im)^[ \t]*[\w-]*(?:password|secret|api_key|token)[\w-]*[ \t]*:[ \t]*["']?(?!\$\{\{)[^\s"'#]+""",
+        "must_match": False,
+    },
+]
+
+_ARTIFACT_RULES: dict[str, list[dict[str, Any]]] = {
+    "python": _ISSUE_RULES,
+    "dockerfile": _DOCKERFILE_RULES,
+    "shell": _SHELL_RULES,
+    "yaml": _YAML_RULES,
+}
+
+_RULESETS: dict[str, RuleSet] = {ft: RuleSet(rules) for ft, rules in _ARTIFACT_RULES.items()}
+
+# Changes whenever a rule is edited, so cached audits never outlive their rules
+_RULES_VERSION = hashlib.sha256(json.dumps(_ARTIFACT_RULES, sort_keys=True).encode("utf-8")).hexdigest()[:16]
+
+_EXTENSION_TYPES = {".py": "python", ".sh": "shell", ".bash": "shell", ".yml": "yaml", ".yaml": "yaml"}
+
+
+def _file_type(name: str) -> str | None:
+    """Rule-set key for an artifact path, or None if no rules apply."""
+    base = name.rsplit("/", 1)[-1].lower()
+    if base == "dockerfile" or base.startswith("dockerfile.") or base.endswith(".dockerfile"):
+        return "dockerfile"
+    _, dot, ext = base.rpartition(".")
+    return _EXTENSION_TYPES.get("." + ext) if dot else None
+
+
+def _detect_issues(code: str, file_type: str = "python") -> list[dict[str, Any]]:
+    """
+    Scan code against all issue rules (literal-prefiltered) and return findings.
+
+    Findings for forbidden patterns carry the ``locations`` that matched.
+    """
+    spans = _RULESETS[file_type].scan(code)
+    issues: list[dict[str, Any]] = []
+    for rule in _ARTIFACT_RULES[file_type]:
+        hits = spans[rule["id"]]
+        if rule["must_match"] and not hits:
             issues.append({
                 "id": rule["id"],
                 "severity": rule["severity"],
                 "description": rule["description"],
             })
-        elif not rule["must_match"] and found:
+        elif not rule["must_match"] and hits:
             issues.append({
                 "id": rule["id"],
                 "severity": rule["severity"],
                 "description": rule["description"],
+                "locations": [
+                    {"line": line_of(code, start), "start": start, "end": end}
+                    for start, end in hits
+                ],
             })
     return issues
 
 
 # ── Healing patches ──────────────────────────────────────────────────────────
 
-def _heal_missing_logging(code: str) -> str:
+_LOGGING_BLOCK = textwrap.dedent("""\
+    import logging
+
+    logging.basicConfig(
+        level=logging.INFO,
+        format="%(asctime)s | %(name)s | %(levelname)s | %(message)s",
+    )
+    logger = logging.getLogger(__name__)
+
+""")
+
+_ERROR_HANDLER_BLOCK = textwrap.dedent("""
+
+    # ── Doctor Agent: Global Error Handler ──────────────────────────
+    from fastapi.responses import JSONResponse
+
+    @app.exception_handler(Exception)
+    async def global_exception_handler(request, exc):
+        logger.error(f"Unhandled error: {exc}", exc_info=True)
+        return JSONResponse(
+            status_code=500,
+            content={"error": "Internal server error", "detail": str(exc)},
+        )
+""")
+
+_CORS_BLOCK = textwrap.dedent("""
+    # ── Doctor Agent: CORS Middleware ────────────────────────────────
+    from fastapi.middleware.cors import CORSMiddleware
+
+    app.add_middleware(
+        CORSMiddleware,
+        allow_origins=["*"],
+        allow_credentials=True,
+        allow_methods=["*"],
+        allow_headers=["*"],
+    )
+""")
+
+
+# A healer inspects the *original* code and returns the edits that fix its
+# issue as ``(start, end, replacement)`` offsets; no healer copies the code.
+# All edits are applied together by :func:`_splice`.
+_Edit = tuple[int, int, str]
+
+_SECRET_ASSIGNMENT = re.compile(r'(?i)(password|secret|api_key)\s*=\s*["\'][^"\']+["\']')
+_APP_ASSIGNMENT = re.compile(r"(app\s*=\s*FastAPI\(.*?\))", re.DOTALL)
+
+
+def _heal_missing_logging(code: str) -> list[_Edit]:
     """Inject logging if absent."""
-    if "import logging" not in code:
-        injection = textwrap.dedent("""\
-            import logging
-
-            logging.basicConfig(
-                level=logging.INFO,
-                format="%(asctime)s | %(name)s | %(levelname)s | %(message)s",
-            )
-            logger = logging.getLogger(__name__)
-
-        """)
-        # Insert after the first docstring or at the top
-        if '"""' in code:
-            end_doc = code.index('"""', code.index('"""') + 3) + 3
-            code = code[: end_doc] + "\n" + injection + code[end_doc:]
-        else:
-            code = injection + code
-    return code
+    if "import logging" in code:
+        return []
+    # Insert after the first docstring or at the top
+    if '"""' in code:
+        end_doc = code.index('"""', code.index('"""') + 3) + 3
+        return [(end_doc, end_doc, "\n" + _LOGGING_BLOCK)]
+    return [(0, 0, _LOGGING_BLOCK)]
 
 
-def _heal_missing_error_handling(code: str) -> str:
+def _heal_missing_error_handling(code: str) -> list[_Edit]:
     """Wrap endpoint bodies in try/except where missing."""
-    if "try:" not in code:
-        # Add a global exception handler for FastAPI
-        handler = textwrap.dedent("""
-
-            # ── Doctor Agent: Global Error Handler ──────────────────────────
-            from fastapi.responses import JSONResponse
-
-            @app.exception_handler(Exception)
-            async def global_exception_handler(request, exc):
-                logger.error(f"Unhandled error: {exc}", exc_info=True)
-                return JSONResponse(
-                    status_code=500,
-                    content={"error": "Internal server error", "detail": str(exc)},
-                )
-        """)
-        code += handler
-    return code
-
-
-def _heal_missing_cors(code: str) -> str:
+    if "try:" in code:
+        return []
+    # Add a global exception handler for FastAPI
+    return [(len(code), len(code), _ERROR_HANDLER_BLOCK)]
+
+
+def _heal_missing_cors(code: str) -> list[_Edit]:
     """Add CORS middleware if absent."""
-    if "CORSMiddleware" not in code:
-        cors_block = textwrap.dedent("""
-            # ── Doctor Agent: CORS Middleware ────────────────────────────────
-            from fastapi.middleware.cors import CORSMiddleware
-
-            app.add_middleware(
-                CORSMiddleware,
-                allow_origins=["*"],
-                allow_credentials=True,
-                allow_methods=["*"],
-                allow_headers=["*"],
-            )
-        """)
-        # Insert after the app = FastAPI(...) block
-        match = re.search(r"(app\s*=\s*FastAPI\(.*?\))", code, re.DOTALL)
-        if match:
-            insert_pos = match.end()
-            code = code[:insert_pos] + "\n" + cors_block + code[insert_pos:]
-        else:
-            code += cors_block
-    return code
+    if "CORSMiddleware" in code:
+        return []
+    # Insert after the app = FastAPI(...) block
+    match = _APP_ASSIGNMENT.search(code)
+    if match:
+        return [(match.end(), match.end(), "\n" + _CORS_BLOCK)]
+    return [(len(code), len(code), _CORS_BLOCK)]
 
 
-def _heal_hardcoded_secrets(code: str) -> str:
+def _heal_hardcoded_secrets(code: str) -> list[_Edit]:
     """Replace hardcoded secrets with env-var lookups."""
-    def _replacer(m: re.Match) -> str:  # type: ignore[type-arg]
-        key_name = m.group(1).upper()
-        return f'{m.group(1)} = os.getenv("{key_name}", "")'
-
-    code = re.sub(
-        r'(?i)(password|secret|api_key)\s*=\s*["\'][^"\']+["\']',
-        _replacer,
-        code,
-    )
+    edits: list[_Edit] = [
+        (m.start(), m.end(), f'{m.group(1)} = os.getenv("{m.group(1).upper()}", "")')
+        for m in _SECRET_ASSIGNMENT.finditer(code)
+    ]
     if "import os" not in code:
-        code = "import os\n" + code
-    return code
+        edits.append((0, 0, "import os\n"))
+    return edits
 
 
 _HEALERS: dict[str, Any] = {
@@ -175,77 +312,181 @@ _HEALERS: dict[str, Any] = {
 }
 
 
-def _apply_healing(code: str, issues: list[dict[str, str]]) -> tuple[str, list[str]]:
+def _splice(code: str, edits: list[_Edit]) -> str:
+    """
+    Apply non-overlapping edits in one pass over ``code``.
+
+    Edits at the same offset keep the order they were collected in. The
+    result is built from a list of chunks and joined once, so the cost is
+    proportional to the code size regardless of how many fixes apply.
+    """
+    chunks: list[str] = []
+    pos = 0
+    for start, end, text in sorted(edits, key=lambda e: (e[0], e[1])):
+        chunks.append(code[pos:start])
+        chunks.append(text)
+        pos = end
+    chunks.append(code[pos:])
+    return "".join(chunks)
+
+
+def _summarise(issues: list[dict[str, Any]]) -> list[str]:
+    """One improvement line per issue: fixed, or advisory when no healer exists."""
+    return [
+        f"✅ Fixed {issue['id']}: {issue['description']}" if issue["id"] in _HEALERS
+        else f"⚠️  Advisory {issue['id']}: {issue['description']} (no auto-fix)"
+        for issue in issues
+    ]
+
+
+def _apply_healing(code: str, issues: list[dict[str, Any]]) -> tuple[str, list[str]]:
     """Apply all available healing patches and return healed code + summary."""
-    improvements: list[str] = []
+    edits: list[_Edit] = []
     for issue in issues:
         healer = _HEALERS.get(issue["id"])
         if healer:
-            code = healer(code)
-            improvements.append(f"✅ Fixed {issue['id']}: {issue['description']}")
+            edits.extend(healer(code))
+    return _splice(code, edits), _summarise(issues)
+
+
+def _healing_diff(original: str, healed: str, filename: str = "main.py") -> str:
+    """Unified diff from the generated code to the healed code."""
+    if original == healed:
+        return ""
+    return "".join(difflib.unified_diff(
+        original.splitlines(keepends=True),
+        healed.splitlines(keepends=True),
+        fromfile=f"a/{filename}",
+        tofile=f"b/{filename}",
+    ))
+
+
+# ── AST-mode healing ─────────────────────────────────────────────────────────
+
+def _ast_edits(code: str, audit: AstAudit) -> list[_Edit]:
+    """Translate AST findings into ``(start, end, replacement)`` edits."""
+    edits: list[_Edit] = []
+    for issue in audit.issues:
+        if issue["id"] == "MISSING_LOGGING":
+            pos = audit.docstring_end
+            edits.append((pos, pos, "\n" + _LOGGING_BLOCK) if pos is not None else (0, 0, _LOGGING_BLOCK))
+        elif issue["id"] == "NO_ERROR_HANDLING":
+            edits.append((len(code), len(code), _ERROR_HANDLER_BLOCK))
+        elif issue["id"] == "NO_CORS":
+            pos = audit.app_end
+            edits.append((pos, pos, "\n" + _CORS_BLOCK) if pos is not None else (len(code), len(code), _CORS_BLOCK))
+        elif issue["id"] == "HARDCODED_SECRETS":
+            for name, start, end in audit.secrets:
+                edits.append((start, end, f'os.getenv("{name.upper()}", "")'))
+            if not audit.imports_os:
+                edits.insert(0, (0, 0, "import os\n"))
+    return edits
+
+
+def _apply_healing_ast(code: str, audit: AstAudit) -> tuple[str, list[str]]:
+    """Heal using positional edits anchored on the parsed tree."""
+    return _splice(code, _ast_edits(code, audit)), _summarise(audit.issues)
+
+
+def _audit(
+    code: str,
+    mode: str,
+    file_type: str = "python",
+) -> tuple[list[dict[str, Any]], str, list[str], str]:
+    """
+    Detect and heal with the requested engine.
+
+    Returns:
+        (issues, healed_code, improvements, engine_used). ``"ast"`` mode
+        falls back to the regex engine when the code does not parse, and
+        only applies to Python; other artifacts are scanned, not healed.
+    """
+    if mode not in ("regex", "ast"):
+        raise ValueError(f"Unknown audit mode {mode!r} (expected 'regex' or 'ast')")
+    if file_type != "python":
+        issues = _detect_issues(code, file_type)
+        return issues, code, _summarise(issues), "regex"
+    if mode == "ast":
+        try:
+            audit = AstAudit(code, _ISSUE_RULES)
+        except SyntaxError:
+            pass
         else:
-            improvements.append(f"⚠️  Advisory {issue['id']}: {issue['description']} (no auto-fix)")
-    return code, improvements
+            healed_code, improvements = _apply_healing_ast(code, audit)
+            return audit.issues, healed_code, improvements, "ast"
+    issues = _detect_issues(code)
+    healed_code, improvements = _apply_healing(code, issues)
+    return issues, healed_code, improvements, "regex"
 
 
 # ── Optional LLM critique ───────────────────────────────────────────────────
 
-def _llm_critique(code: str) -> list[str]:
-    """If Gemini API key is available, perform LLM-based code critique."""
-    api_key = os.getenv("GEMINI_API_KEY")
-    if not api_key:
-        return []
-    try:
-        import requests
-        url = (
-            "https://generativelanguage.googleapis.com/v1beta/models/"
-            f"gemini-pro:generateContent?key={api_key}"
-        )
-        payload = {
-            "contents": [{
-                "parts": [{
-                    "text": (
-                        "Review the following Python FastAPI code for bugs, "
-                        "security issues, and improvements. Return a bullet list "
-                        "of findings only.\n\n" + code[:3000]
-                    ),
-                }],
+def _critique_request(code: str, api_key: str) -> tuple[str, dict[str, Any]]:
+    """Build the Gemini endpoint URL and review payload for a code sample."""
+    url = llm_client.gemini_url(api_key)
+    payload = {
+        "contents": [{
+            "parts": [{
+                "text": (
+                    "Review the following Python FastAPI code for bugs, "
+                    "security issues, and improvements. Return a bullet list "
+                    "of findings only.\n\n" + code[:3000]
+                ),
             }],
-        }
-        resp = requests.post(url, json=payload, timeout=30)
-        resp.raise_for_status()
-        text = resp.json()["candidates"][0]["content"]["parts"][0]["text"]
-        return [f"🤖 Gemini: {line.strip()}" for line in text.strip().split("\n") if line.strip()]
-    except Exception:
-        return []
+        }],
+    }
+    return url, payload
 
 
-# ── Public API ───────────────────────────────────────────────────────────────
+def _parse_critique(body: Any) -> list[str]:
+    """Split a Gemini review response into one finding per bullet line."""
+    text = body["candidates"][0]["content"]["parts"][0]["text"]
+    return [f"🤖 Gemini: {line.strip()}" for line in text.strip().split("\n") if line.strip()]
+
 
-def audit_and_heal(dev_output: dict[str, Any]) -> dict[str, Any]:
+def _llm_critique(code: str) -> list[str] | None:
     """
-    Audit the developer agent's output and apply healing patches.
+    If Gemini API key is available, perform LLM-based code critique.
 
-    Returns:
-        dict with: issues_detected, healed_code, improvement_summary, status
+    Returns None when the critique was attempted and failed (timeout, open
+    circuit, malformed response), so the caller does not cache its absence.
     """
-    original_code: str = dev_output.get("service_code", "")
+    api_key = os.getenv("GEMINI_API_KEY")
+    if not api_key:
+        return []
+    try:
+        url, payload = _critique_request(code, api_key)
+        return _parse_critique(llm_client.post_json(url, payload))
+    except Exception:
+        return None
 
-    # 1. Detect issues
-    issues = _detect_issues(original_code)
 
-    # 2. Apply healing
-    healed_code, improvements = _apply_healing(original_code, issues)
+async def _llm_critique_async(code: str) -> list[str] | None:
+    """Non-blocking variant of :func:`_llm_critique`."""
+    api_key = os.getenv("GEMINI_API_KEY")
+    if not api_key:
+        return []
+    try:
+        url, payload = _critique_request(code, api_key)
+        return _parse_critique(await llm_client.post_json_async(url, payload))
+    except Exception:
+        return None
 
-    # 3. Optional LLM critique
-    llm_findings = _llm_critique(original_code)
-    if llm_findings:
-        improvements.extend(llm_findings)
 
+def _build_report(
+    issues: list[dict[str, Any]],
+    healed_code: str,
+    improvements: list[str],
+    engine: str,
+    diff: str,
+) -> dict[str, Any]:
+    """Assemble the Doctor agent's response payload."""
     return {
         "agent": "doctor_agent",
+        "audit_engine": engine,
         "issues_detected": issues,
         "healed_code": healed_code,
+        "healing_diff": diff,
         "improvement_summary": improvements,
         "stats": {
             "issues_found": len(issues),
@@ -257,3 +498,206 @@ def audit_and_heal(dev_output: dict[str, Any]) -> dict[str, Any]:
             "timestamp": datetime.now(timezone.utc).isoformat(),
         },
     }
+
+
+# ── Result cache ─────────────────────────────────────────────────────────────
+# Byte-identical service code (common: the rule-based Dev agent emits the same
+# scaffold for similar prompts) reuses the previous detection, healing and
+# LLM critique instead of redoing them.
+
+_CACHE = TTLCache(
+    maxsize=int(os.getenv("SYNAPSE_DOCTOR_CACHE_SIZE", "256")),
+    ttl_seconds=float(os.getenv("SYNAPSE_DOCTOR_CACHE_TTL", "3600")),
+)
+
+
+def _cache_key(code: str, mode: str, file_type: str = "python", critique: bool = True) -> str:
+    """Hash of the input code, audit engine, rule-set version and LLM availability."""
+    critique = critique and bool(os.getenv("GEMINI_API_KEY"))
+    h = hashlib.sha256(code.encode("utf-8"))
+    h.update(f"\0{mode}\0{file_type}\0{_RULES_VERSION}\0{critique}".encode("utf-8"))
+    return h.hexdigest()
+
+
+def _from_cache(key: str) -> dict[str, Any] | None:
+    """Rebuild a fresh report from a cached audit, or None on a miss."""
+    cached = _CACHE.get(key)
+    if cached is None:
+        return None
+    issues, healed_code, improvements, engine, diff = cached
+    report = _build_report(copy.deepcopy(issues), healed_code, list(improvements), engine, diff)
+    report["cache_hit"] = True
+    return report
+
+
+def _store(
+    key: str,
+    original_code: str,
+    issues: list[dict[str, Any]],
+    healed_code: str,
+    improvements: list[str],
+    engine: str,
+    filename: str = "main.py",
+    cacheable: bool = True,
+) -> dict[str, Any]:
+    """
+    Cache an audit result and return its report. An audit whose LLM
+    critique failed is not cached, so the next build retries the critique.
+    """
+    diff = _healing_diff(original_code, healed_code, filename)
+    if cacheable:
+        _CACHE.set(key, (copy.deepcopy(issues), healed_code, tuple(improvements), engine, diff))
+    report = _build_report(issues, healed_code, improvements, engine, diff)
+    report["cache_hit"] = False
+    return report
+
+
+# ── Artifact audits ──────────────────────────────────────────────────────────
+
+_POOL = ThreadPoolExecutor(
+    max_workers=int(os.getenv("SYNAPSE_DOCTOR_WORKERS", "4")),
+    thread_name_prefix="synapse-doctor",
+)
+
+
+def _audit_artifact(name: str, content: str, mode: str) -> dict[str, Any]:
+    """Audit one artifact with its file type's rules (no LLM critique)."""
+    started = time.perf_counter()
+    file_type = _file_type(name)
+    if file_type is None:
+        return {"file_type": None, "skipped": True, "duration_seconds": 0.0}
+    key = _cache_key(content, mode, file_type, critique=False)
+    report = _from_cache(key)
+    if report is None:
+        issues, healed, improvements, engine = _audit(content, mode, file_type)
+        report = _store(key, content, issues, healed, improvements, engine, filename=name)
+    del report["agent"]
+    report["file_type"] = file_type
+    report["duration_seconds"] = round(time.perf_counter() - started, 6)
+    return report
+
+
+def _artifact_report(results: dict[str, dict[str, Any]], started: float) -> dict[str, Any]:
+    """Combine per-artifact audits into the ``artifacts`` section of a report."""
+    audited = [r for r in results.values() if not r.get("skipped")]
+    return {
+        "artifacts": results,
+        "stats": {
+            "artifacts_audited": len(audited),
+            "issues_found": sum(r["stats"]["issues_found"] for r in audited),
+            "critical": sum(
+                1 for r in audited for i in r["issues_detected"] if i["severity"] == "critical"
+            ),
+        },
+        "duration_seconds": round(time.perf_counter() - started, 6),
+    }
+
+
+def cache_stats() -> dict[str, Any]:
+    """Hit/miss counters and occupancy of the audit result cache."""
+    return {**_CACHE.stats(), "rules_version": _RULES_VERSION}
+
+
+def clear_cache() -> int:
+    """Drop every cached audit; returns the number of entries removed."""
+    return _CACHE.clear()
+
+
+# ── Public API ───────────────────────────────────────────────────────────────
+
+def audit_artifacts(artifacts: Mapping[str, str], mode: str | None = None) -> dict[str, Any]:
+    """
+    Audit several generated files concurrently on the Doctor's worker pool.
+
+    Args:
+        artifacts:  Mapping of artifact path (``"Dockerfile"``, ``"deploy.sh"``,
+                    ``".github/workflows/ci.yml"``, ``"main.py"``…) to content.
+                    The rule set is chosen from the file name.
+        mode:       Audit engine for Python artifacts; defaults to ``SYNAPSE_DOCTOR_MODE``.
+
+    Returns:
+        dict with: artifacts (per-file findings, healed content, diff and
+        duration_seconds), stats, duration_seconds
+    """
+    started = time.perf_counter()
+    mode = mode or _AUDIT_MODE
+    names = list(artifacts)
+    if len(names) > 1:
+        reports = list(_POOL.map(lambda n: _audit_artifact(n, artifacts[n], mode), names))
+    else:
+        reports = [_audit_artifact(n, artifacts[n], mode) for n in names]
+    return _artifact_report(dict(zip(names, reports)), started)
+
+
+async def audit_artifacts_async(artifacts: Mapping[str, str], mode: str | None = None) -> dict[str, Any]:
+    """Awaitable :func:`audit_artifacts`; artifacts are audited on the worker pool."""
+    started = time.perf_counter()
+    mode = mode or _AUDIT_MODE
+    loop = asyncio.get_running_loop()
+    names = list(artifacts)
+    reports = await asyncio.gather(*(
+        loop.run_in_executor(_POOL, _audit_artifact, n, artifacts[n], mode) for n in names
+    ))
+    return _artifact_report(dict(zip(names, reports)), started)
+
+
+def audit_and_heal(dev_output: dict[str, Any], mode: str | None = None) -> dict[str, Any]:
+    """
+    Audit the developer agent's output and apply healing patches.
+
+    Args:
+        dev_output:  The Dev agent's result (``service_code`` is audited).
+        mode:        ``"regex"`` or ``"ast"``; defaults to ``SYNAPSE_DOCTOR_MODE``.
+
+    Returns:
+        dict with: issues_detected, healed_code, healing_diff,
+        improvement_summary, status, cache_hit
+    """
+    original_code: str = dev_output.get("service_code", "")
+    mode = mode or _AUDIT_MODE
+
+    # 0. Identical code was audited recently
+    key = _cache_key(original_code, mode)
+    cached = _from_cache(key)
+    if cached is not None:
+        return cached
+
+    # 1 + 2. Detect issues and apply healing
+    issues, healed_code, improvements, engine = _audit(original_code, mode)
+
+    # 3. Optional LLM critique
+    llm_findings = _llm_critique(original_code)
+    if llm_findings:
+        improvements.extend(llm_findings)
+
+    return _store(
+        key, original_code, issues, healed_code, improvements, engine,
+        cacheable=llm_findings is not None,
+    )
+
+
+async def audit_and_heal_async(dev_output: dict[str, Any], mode: str | None = None) -> dict[str, Any]:
+    """
+    Async entry point for the Doctor agent.
+
+    Same contract as :func:`audit_and_heal`; the optional Gemini critique is
+    awaited so the event loop stays free while the LLM responds.
+    """
+    original_code: str = dev_output.get("service_code", "")
+    mode = mode or _AUDIT_MODE
+
+    key = _cache_key(original_code, mode)
+    cached = _from_cache(key)
+    if cached is not None:
+        return cached
+
+    issues, healed_code, improvements, engine = _audit(original_code, mode)
+
+    llm_findings = await _llm_critique_async(original_code)
+    if llm_findings:
+        improvements.extend(llm_findings)
+
+    return _store(
+        key, original_code, issues, healed_code, improvements, engine,
+        cacheable=llm_findings is not None,
+    )
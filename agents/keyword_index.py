@@ -0,0 +1,78 @@
+"""
+SYNAPSE-X — Keyword Index
+Aho–Corasick automaton over a ``category → keywords`` table, used by the
+Parent agent's rule-based classifier. The table is compiled once; each
+classification is a single pass over the text that reports how many
+keyword occurrences (overlapping, substring semantics) fall in every
+category, independent of the number of keywords.
+"""
+
+from __future__ import annotations
+
+from collections import deque
+from typing import Iterable, Mapping
+
+
+class KeywordAutomaton:
+    """
+    Multi-pattern matcher for a keyword table.
+
+    Keywords are matched case-insensitively as substrings, exactly like
+    ``kw in text.lower()``, so ``"scalab"`` matches ``"scalable"``.
+
+    Args:
+        table:  Mapping of category name to its keywords; category order is
+                preserved in results.
+    """
+
+    def __init__(self, table: Mapping[str, Iterable[str]]) -> None:
+        self.categories: list[str] = list(table)
+        goto: list[dict[str, int]] = [{}]
+        out: list[list[int]] = [[]]
+        for ci, category in enumerate(self.categories):
+            for keyword in table[category]:
+                state = 0
+                for ch in keyword.lower():
+                    nxt = goto[state].get(ch)
+                    if nxt is None:
+                        nxt = len(goto)
+                        goto[state][ch] = nxt
+                        goto.append({})
+                        out.append([])
+                    state = nxt
+                if state:
+                    out[state].append(ci)
+
+        # Breadth-first failure links; each state inherits its suffix's outputs
+        fail = [0] * len(goto)
+        queue = deque(goto[0].values())
+        while queue:
+            state = queue.popleft()
+            for ch, nxt in goto[state].items():
+                queue.append(nxt)
+                f = fail[state]
+                while f and ch not in goto[f]:
+                    f = fail[f]
+                fail[nxt] = goto[f].get(ch, 0)
+                out[nxt] = out[nxt] + out[fail[nxt]]
+
+        self._goto = goto
+        self._fail = fail
+        self._out: list[tuple[int, ...]] = [tuple(o) for o in out]
+
+    def __len__(self) -> int:
+        """Number of automaton states."""
+        return len(self._goto)
+
+    def counts(self, text: str) -> dict[str, int]:
+        """Keyword occurrences per category, in table order."""
+        goto, fail, out = self._goto, self._fail, self._out
+        hits = [0] * len(self.categories)
+        state = 0
+        for ch in text.lower():
+            while state and ch not in goto[state]:
+                state = fail[state]
+            state = goto[state].get(ch, 0)
+            for ci in out[state]:
+                hits[ci] += 1
+        return dict(zip(self.categories, hits))
@@ -0,0 +1,294 @@
+"""
+SYNAPSE-X — LLM Client
+Shared HTTP plumbing for the agents' optional Gemini calls. Connections are
+pooled and kept alive across calls (a ``requests.Session`` for blocking
+callers, one ``httpx.AsyncClient`` per event loop for async ones), transient
+failures are retried with jittered exponential backoff, and a circuit
+breaker fails fast after repeated errors so agents drop straight to their
+rule-based path instead of waiting out a timeout on every build.
+
+Configuration (environment):
+    SYNAPSE_LLM_BASE_URL           API root (point at a local stub for testing)
+    SYNAPSE_LLM_MODEL              Model name used by :func:`gemini_url`
+    SYNAPSE_LLM_CONNECT_TIMEOUT    Seconds to establish a connection
+    SYNAPSE_LLM_READ_TIMEOUT       Seconds to wait for a response
+    SYNAPSE_LLM_RETRIES            Extra attempts after a transient failure
+    SYNAPSE_LLM_BACKOFF            Base backoff in seconds (doubles per attempt)
+    SYNAPSE_LLM_BREAKER_THRESHOLD  Consecutive failed calls that open the breaker
+    SYNAPSE_LLM_BREAKER_COOLDOWN   Seconds the breaker stays open before a probe
+"""
+
+from __future__ import annotations
+
+import asyncio
+import os
+import random
+import threading
+import time
+import weakref
+from contextlib import contextmanager
+from typing import Any, Iterator
+
+try:
+    import httpx as _httpx
+except ImportError:
+    _httpx = None  # type: ignore[assignment]
+
+try:
+    import requests as _req
+    from requests.adapters import HTTPAdapter as _HTTPAdapter
+except ImportError:
+    _req = None  # type: ignore[assignment]
+
+_BASE_URL = os.getenv("SYNAPSE_LLM_BASE_URL", "https://generativelanguage.googleapis.com/v1beta").rstrip("/")
+_MODEL = os.getenv("SYNAPSE_LLM_MODEL", "gemini-pro")
+_CONNECT_TIMEOUT = float(os.getenv("SYNAPSE_LLM_CONNECT_TIMEOUT", "5"))
+_READ_TIMEOUT = float(os.getenv("SYNAPSE_LLM_READ_TIMEOUT", "30"))
+_RETRIES = int(os.getenv("SYNAPSE_LLM_RETRIES", "2"))
+_BACKOFF_BASE = float(os.getenv("SYNAPSE_LLM_BACKOFF", "0.5"))
+_BACKOFF_CAP = 8.0
+_POOL_SIZE = 16
+
+# Responses worth another attempt; other 4xx are the caller's fault
+_RETRY_STATUS = frozenset({408, 425, 429, 500, 502, 503, 504})
+
+
+class CircuitOpenError(RuntimeError):
+    """Raised without touching the network while the circuit breaker is open."""
+
+
+# ── Circuit breaker ──────────────────────────────────────────────────────────
+
+class CircuitBreaker:
+    """
+    Consecutive-failure circuit breaker.
+
+    ``closed`` → ``open`` after ``threshold`` failed calls in a row; once
+    ``cooldown_seconds`` have passed a single probe is let through
+    (``half_open``) and its outcome closes or re-opens the circuit. A probe
+    that ends without an outcome (cancelled) hands the slot back.
+    """
+
+    def __init__(self, threshold: int = 5, cooldown_seconds: float = 30.0) -> None:
+        self.threshold = threshold
+        self.cooldown_seconds = cooldown_seconds
+        self._lock = threading.Lock()
+        self._state = "closed"
+        self._failures = 0
+        self._opened_at = 0.0
+
+    @property
+    def state(self) -> str:
+        return self._state
+
+    def before_call(self) -> None:
+        """Raise :class:`CircuitOpenError` unless a call may proceed."""
+        with self._lock:
+            if self._state == "closed":
+                return
+            if self._state == "open" and time.monotonic() - self._opened_at >= self.cooldown_seconds:
+                self._state = "half_open"
+                return
+            raise CircuitOpenError(f"LLM circuit {self._state}; using rule-based fallback")
+
+    def record_success(self) -> None:
+        with self._lock:
+            self._state = "closed"
+            self._failures = 0
+
+    def record_failure(self) -> None:
+        with self._lock:
+            self._failures += 1
+            if self._state == "half_open" or self._failures >= self.threshold:
+                self._state = "open"
+                self._opened_at = time.monotonic()
+
+    def release_probe(self) -> None:
+        """
+        A call ended without an outcome. If it was the half-open probe, go
+        back to ``open`` with the cooldown already elapsed so the next call
+        probes again.
+        """
+        with self._lock:
+            if self._state == "half_open":
+                self._state = "open"
+
+
+_BREAKER = CircuitBreaker(
+    threshold=int(os.getenv("SYNAPSE_LLM_BREAKER_THRESHOLD", "5")),
+    cooldown_seconds=float(os.getenv("SYNAPSE_LLM_BREAKER_COOLDOWN", "30")),
+)
+
+_stats_lock = threading.Lock()
+_stats = {"calls": 0, "successes": 0, "failures": 0, "retries": 0, "short_circuits": 0}
+
+
+def _count(key: str) -> None:
+    with _stats_lock:
+        _stats[key] += 1
+
+
+# ── Connection pools ─────────────────────────────────────────────────────────
+
+_session_lock = threading.Lock()
+_session = None
+_async_clients: weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, Any] = weakref.WeakKeyDictionary()
+
+
+def _get_session() -> Any:
+    """Process-wide keep-alive ``requests.Session``."""
+    global _session
+    if _req is None:
+        raise RuntimeError("requests is not installed")
+    if _session is None:
+        with _session_lock:
+            if _session is None:
+                session = _req.Session()
+                adapter = _HTTPAdapter(pool_connections=_POOL_SIZE, pool_maxsize=_POOL_SIZE)
+                session.mount("https://", adapter)
+                session.mount("http://", adapter)
+                _session = session
+    return _session
+
+
+def _get_async_client() -> Any:
+    """The ``httpx.AsyncClient`` bound to the running event loop."""
+    loop = asyncio.get_running_loop()
+    client = _async_clients.get(loop)
+    if client is None:
+        client = _httpx.AsyncClient(  # type: ignore[union-attr]
+            timeout=_httpx.Timeout(_READ_TIMEOUT, connect=_CONNECT_TIMEOUT),  # type: ignore[union-attr]
+            limits=_httpx.Limits(max_connections=_POOL_SIZE, max_keepalive_connections=_POOL_SIZE),  # type: ignore[union-attr]
+        )
+        _async_clients[loop] = client
+    return client
+
+
+# ── Retry policy ─────────────────────────────────────────────────────────────
+
+def _retryable(exc: BaseException) -> bool:
+    """Connection errors, timeouts and throttling/5xx responses are transient."""
+    status = getattr(getattr(exc, "response", None), "status_code", None)
+    if status is not None:
+        return status in _RETRY_STATUS
+    if _req is not None and isinstance(exc, (_req.ConnectionError, _req.Timeout)):
+        return True
+    return _httpx is not None and isinstance(exc, _httpx.TransportError)
+
+
+def _backoff(attempt: int, exc: BaseException) -> float:
+    """Full-jitter exponential delay; a numeric ``Retry-After`` header wins (capped)."""
+    response = getattr(exc, "response", None)
+    retry_after = getattr(response, "headers", {}).get("Retry-After") if response is not None else None
+    if retry_after is not None:
+        try:
+            return min(float(retry_after), _BACKOFF_CAP)
+        except ValueError:
+            pass
+    return random.uniform(0, min(_BACKOFF_CAP, _BACKOFF_BASE * 2 ** attempt))
+
+
+def _give_up(exc: BaseException, attempt: int) -> bool:
+    if attempt < _RETRIES and _retryable(exc):
+        _count("retries")
+        return False
+    _count("failures")
+    return True
+
+
+@contextmanager
+def _guarded() -> Iterator[None]:
+    """
+    Admit a call through the breaker and report how it ended: success,
+    failure, or — when cancelled or interrupted — no outcome at all.
+    """
+    _count("calls")
+    try:
+        _BREAKER.before_call()
+    except CircuitOpenError:
+        _count("short_circuits")
+        raise
+    try:
+        yield
+    except Exception:
+        _BREAKER.record_failure()
+        raise
+    except BaseException:
+        _BREAKER.release_probe()
+        raise
+    _count("successes")
+    _BREAKER.record_success()
+
+
+# ── Public API ───────────────────────────────────────────────────────────────
+
+def gemini_url(api_key: str, model: str | None = None) -> str:
+    """``generateContent`` endpoint for ``model`` under the configured base URL."""
+    return f"{_BASE_URL}/models/{model or _MODEL}:generateContent?key={api_key}"
+
+
+def post_json(url: str, payload: dict[str, Any], timeout: float | None = None) -> Any:
+    """
+    POST a JSON payload and return the decoded JSON response (blocking).
+
+    ``timeout`` overrides the configured read timeout. Raises the last
+    error once retries are exhausted, or :class:`CircuitOpenError`.
+    """
+    session = _get_session()
+    with _guarded():
+        attempt = 0
+        while True:
+            try:
+                resp = session.post(url, json=payload, timeout=(_CONNECT_TIMEOUT, timeout or _READ_TIMEOUT))
+                resp.raise_for_status()
+                return resp.json()
+            except Exception as exc:
+                if _give_up(exc, attempt):
+                    raise
+                time.sleep(_backoff(attempt, exc))
+                attempt += 1
+
+
+async def post_json_async(url: str, payload: dict[str, Any], timeout: float | None = None) -> Any:
+    """
+    POST a JSON payload without blocking the running event loop.
+
+    Uses the loop's pooled ``httpx.AsyncClient`` when httpx is available;
+    otherwise the blocking call is moved onto a worker thread.
+    """
+    if _httpx is None:
+        return await asyncio.to_thread(post_json, url, payload, timeout)
+    client = _get_async_client()
+    kwargs = {"timeout": _httpx.Timeout(timeout, connect=_CONNECT_TIMEOUT)} if timeout else {}
+    with _guarded():
+        attempt = 0
+        while True:
+            try:
+                resp = await client.post(url, json=payload, **kwargs)
+                resp.raise_for_status()
+                return resp.json()
+            except Exception as exc:
+                if _give_up(exc, attempt):
+                    raise
+                await asyncio.sleep(_backoff(attempt, exc))
+                attempt += 1
+
+
+async def aclose() -> None:
+    """Close the running loop's pooled async client (call on shutdown)."""
+    client = _async_clients.pop(asyncio.get_running_loop(), None)
+    if client is not None:
+        await client.aclose()
+
+
+def stats() -> dict[str, Any]:
+    """Call counters plus circuit-breaker state."""
+    with _stats_lock:
+        counters = dict(_stats)
+    return {
+        **counters,
+        "circuit": _BREAKER.state,
+        "base_url": _BASE_URL,
+        "timeouts": {"connect": _CONNECT_TIMEOUT, "read": _READ_TIMEOUT},
+        "max_retries": _RETRIES,
+    }
@@ -6,12 +6,17 @@ generates a task graph, and produces a child-agent spawning plan.
 
 from __future__ import annotations
 
+import copy
 import json
 import os
 import re
 from datetime import datetime, timezone
 from typing import Any
 
+from agents import llm_client
+from agents.cache import PersistentTTLCache, TTLCache
+from agents.keyword_index import KeywordAutomaton
+
 # ── Optional Gemini integration ──────────────────────────────────────────────
 _GEMINI_AVAILABLE = False
 try:
@@ -43,20 +48,29 @@ _CATEGORY_KEYWORDS: dict[str, list[str]] = {
 }
 
 
-def _classify_keywords(text: str) -> list[str]:
+# Compiled once: classification is one pass over the prompt however many
+# categories and keywords the table grows to
+_KEYWORD_INDEX = KeywordAutomaton(_CATEGORY_KEYWORDS)
+
+
+def _keyword_counts(text: str) -> dict[str, int]:
+    """Keyword occurrences per category, for weighting."""
+    return _KEYWORD_INDEX.counts(text)
+
+
+def _classify_keywords(text: str, counts: dict[str, int] | None = None) -> list[str]:
     """Return matching categories based on keyword scanning."""
-    text_lower = text.lower()
-    found: list[str] = []
-    for category, keywords in _CATEGORY_KEYWORDS.items():
-        if any(kw in text_lower for kw in keywords):
-            found.append(category)
+    if counts is None:
+        counts = _keyword_counts(text)
+    found = [category for category, n in counts.items() if n]
     # If nothing matched, assume full-stack
     return found or ["architecture", "backend", "deployment"]
 
 
 def _rule_based_decomposition(prompt: str) -> dict[str, Any]:
     """Deterministic fallback when no LLM API key is available."""
-    categories = _classify_keywords(prompt)
+    counts = _keyword_counts(prompt)
+    categories = _classify_keywords(prompt, counts)
 
     tasks: list[dict[str, Any]] = []
     task_id = 1
@@ -116,6 +130,7 @@ def _rule_based_decomposition(prompt: str) -> dict[str, Any]:
         "prompt": prompt,
         "intent": f"Build a software system: {prompt[:80]}",
         "categories": categories,
+        "category_scores": counts,
         "task_graph": tasks,
         "spawning_plan": {
             "dev_agent": "backend" in categories,
@@ -125,12 +140,9 @@ def _rule_based_decomposition(prompt: str) -> dict[str, Any]:
     }
 
 
-def _gemini_decomposition(prompt: str) -> dict[str, Any]:
-    """Call Google Gemini API for intelligent prompt analysis."""
-    url = (
-        "https://generativelanguage.googleapis.com/v1beta/models/"
-        f"gemini-pro:generateContent?key={_GEMINI_KEY}"
-    )
+def _gemini_request(prompt: str) -> tuple[str, dict[str, Any]]:
+    """Build the Gemini endpoint URL and request payload for a prompt."""
+    url = llm_client.gemini_url(_GEMINI_KEY)  # type: ignore[arg-type]
     system_instruction = (
         "You are an AI engineering architect. Given a user prompt, return ONLY "
         "valid JSON with keys: intent (string), categories (list of strings from "
@@ -140,28 +152,105 @@ def _gemini_decomposition(prompt: str) -> dict[str, Any]:
     payload = {
         "contents": [{"parts": [{"text": f"{system_instruction}\n\nUser prompt: {prompt}"}]}],
     }
+    return url, payload
+
+
+def _parse_gemini_decomposition(prompt: str, body: Any) -> dict[str, Any]:
+    """Turn a raw Gemini response body into a decomposition dict."""
+    text = body["candidates"][0]["content"]["parts"][0]["text"]
+    # Strip markdown fences if present
+    text = re.sub(r"```json\s*", "", text)
+    text = re.sub(r"```\s*$", "", text)
+    data = json.loads(text)
+    data["prompt"] = prompt
+    data.setdefault("spawning_plan", {
+        "dev_agent": True,
+        "devops_agent": True,
+        "doctor_agent": True,
+    })
+    return data
+
+
+def _gemini_decomposition(prompt: str) -> dict[str, Any] | None:
+    """
+    Call Google Gemini API for intelligent prompt analysis.
+
+    Returns None on any failure, including an open LLM circuit breaker.
+    """
+    url, payload = _gemini_request(prompt)
     try:
-        resp = _req.post(url, json=payload, timeout=30)  # type: ignore[union-attr]
-        resp.raise_for_status()
-        text = resp.json()["candidates"][0]["content"]["parts"][0]["text"]
-        # Strip markdown fences if present
-        text = re.sub(r"```json\s*", "", text)
-        text = re.sub(r"```\s*$", "", text)
-        data = json.loads(text)
-        data["prompt"] = prompt
-        data.setdefault("spawning_plan", {
-            "dev_agent": True,
-            "devops_agent": True,
-            "doctor_agent": True,
-        })
-        return data
+        return _parse_gemini_decomposition(prompt, llm_client.post_json(url, payload))
     except Exception:
-        # Graceful fallback
-        return _rule_based_decomposition(prompt)
+        return None
+
+
+async def _gemini_decomposition_async(prompt: str) -> dict[str, Any] | None:
+    """Non-blocking variant of :func:`_gemini_decomposition`."""
+    url, payload = _gemini_request(prompt)
+    try:
+        body = await llm_client.post_json_async(url, payload)
+        return _parse_gemini_decomposition(prompt, body)
+    except Exception:
+        return None
+
+
+def _stamp_metadata(result: dict[str, Any], engine: str, cache_hit: bool = False) -> dict[str, Any]:
+    """Attach the agent/engine/timestamp metadata block to a decomposition."""
+    result["metadata"] = {
+        "agent": "parent_agent",
+        "engine": engine,
+        "cache_hit": cache_hit,
+        "timestamp": datetime.now(timezone.utc).isoformat(),
+    }
+    return result
+
+
+# ── Analysis cache ───────────────────────────────────────────────────────────
+# Users resubmit the same prompts constantly; a decomposition is reused for
+# any prompt that normalises to the same key, skipping the Gemini round-trip.
+# Set SYNAPSE_PARENT_CACHE_FILE to keep the cache across restarts.
+
+def _make_cache() -> TTLCache:
+    size = int(os.getenv("SYNAPSE_PARENT_CACHE_SIZE", "1024"))
+    ttl = float(os.getenv("SYNAPSE_PARENT_CACHE_TTL", "3600"))
+    path = os.getenv("SYNAPSE_PARENT_CACHE_FILE")
+    if path:
+        return PersistentTTLCache(path, maxsize=size, ttl_seconds=ttl)
+    return TTLCache(maxsize=size, ttl_seconds=ttl)
+
+
+_CACHE = _make_cache()
+
+
+def _cache_key(prompt: str) -> str:
+    # Gemini and rule-based analyses of the same prompt are cached separately
+    engine = "gemini" if _GEMINI_AVAILABLE else "rule-based"
+    return f"{engine}:{normalize_prompt(prompt)}"
+
+
+def _cached(prompt: str, key: str) -> dict[str, Any] | None:
+    """A private copy of the cached analysis for ``key``, or None."""
+    entry = _CACHE.get(key)
+    if entry is None:
+        return None
+    result = copy.deepcopy(entry["result"])
+    result["prompt"] = prompt
+    return _stamp_metadata(result, entry["engine"], cache_hit=True)
+
+
+def _remember(key: str, result: dict[str, Any], engine: str) -> dict[str, Any]:
+    """Cache ``result`` (before metadata is attached) and stamp it."""
+    _CACHE.set(key, {"engine": engine, "result": copy.deepcopy(result)})
+    return _stamp_metadata(result, engine)
 
 
 # ── Public API ───────────────────────────────────────────────────────────────
 
+def normalize_prompt(prompt: str) -> str:
+    """Case- and whitespace-folded form of a prompt, used as its cache key."""
+    return " ".join(prompt.casefold().split())
+
+
 def analyze(prompt: str) -> dict[str, Any]:
     """
     Main entry point for the Parent Agent.
@@ -170,18 +259,45 @@ def analyze(prompt: str) -> dict[str, Any]:
       - prompt, intent, categories
       - task_graph (list of task dicts)
       - spawning_plan
-      - metadata (timestamp, engine used)
+      - metadata (timestamp, engine used, cache_hit)
     """
+    key = _cache_key(prompt)
+    cached = _cached(prompt, key)
+    if cached is not None:
+        return cached
     if _GEMINI_AVAILABLE:
         result = _gemini_decomposition(prompt)
-        engine = "gemini"
-    else:
-        result = _rule_based_decomposition(prompt)
-        engine = "rule-based"
+        if result is not None:
+            return _remember(key, result, "gemini")
+        # Graceful fallback; not cached so the next request retries Gemini
+        return _stamp_metadata(_rule_based_decomposition(prompt), "gemini")
+    return _remember(key, _rule_based_decomposition(prompt), "rule-based")
 
-    result["metadata"] = {
-        "agent": "parent_agent",
-        "engine": engine,
-        "timestamp": datetime.now(timezone.utc).isoformat(),
-    }
-    return result
+
+async def analyze_async(prompt: str) -> dict[str, Any]:
+    """
+    Async entry point for the Parent Agent.
+
+    Same contract as :func:`analyze`, but the Gemini round-trip is awaited
+    instead of blocking the caller's event loop.
+    """
+    key = _cache_key(prompt)
+    cached = _cached(prompt, key)
+    if cached is not None:
+        return cached
+    if _GEMINI_AVAILABLE:
+        result = await _gemini_decomposition_async(prompt)
+        if result is not None:
+            return _remember(key, result, "gemini")
+        return _stamp_metadata(_rule_based_decomposition(prompt), "gemini")
+    return _remember(key, _rule_based_decomposition(prompt), "rule-based")
+
+
+def cache_stats() -> dict[str, Any]:
+    """Hit/miss counters and occupancy of the analysis cache."""
+    return _CACHE.stats()
+
+
+def clear_cache() -> int:
+    """Drop every cached analysis; returns the number of entries removed."""
+    return _CACHE.clear()
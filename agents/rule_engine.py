@@ -0,0 +1,181 @@
+"""
+SYNAPSE-X — Rule Engine
+Precompiled multi-rule scanner used by the Doctor agent. Each rule's regex
+is analysed once for the literals any match must contain; a scan first
+checks those literals with plain substring searches, skips rules whose
+literals are absent, and runs a rule's regex only at the literal hits
+when every match must begin with one of them. Remaining rules fall back
+to their own ``finditer``.
+"""
+
+from __future__ import annotations
+
+import re
+from typing import Any, Sequence
+
+try:
+    from re import _parser as _sre_parse  # Python 3.11+
+except ImportError:  # pragma: no cover
+    import sre_parse as _sre_parse  # type: ignore[no-redef]
+
+_c = _sre_parse  # opcode constants live alongside the parser
+_ZERO_WIDTH = {_c.AT, _c.ASSERT, _c.ASSERT_NOT}
+_REPEATS = tuple(getattr(_c, name) for name in ("MAX_REPEAT", "MIN_REPEAT", "POSSESSIVE_REPEAT") if hasattr(_c, name))
+# Literal-led rules with shorter literals hit too often to beat ``finditer``
+_MIN_ANCHOR_LEN = 3
+
+
+# ── Literal analysis ─────────────────────────────────────────────────────────
+
+def _runs(items: list) -> list[tuple[int, str]]:
+    """Maximal runs of consecutive LITERAL ops as ``(start_index, text)``."""
+    runs, start, chars = [], 0, []
+    for k, (op, av) in enumerate(items):
+        if op is _c.LITERAL:
+            if not chars:
+                start = k
+            chars.append(chr(av))
+        elif chars:
+            runs.append((start, "".join(chars)))
+            chars = []
+    if chars:
+        runs.append((start, "".join(chars)))
+    return runs
+
+
+def _required(items: list) -> frozenset[str] | None:
+    """
+    Literals of which every match of ``items`` contains at least one, or
+    None if no such set is known. The set with the longest shortest
+    member is kept, as it is the most selective.
+    """
+    options = [frozenset({run}) for _, run in _runs(items)]
+    for op, av in items:
+        if op is _c.SUBPATTERN:
+            options.append(_required(av[-1]))
+        elif op is _c.BRANCH:
+            branches = [_required(b) for b in av[1]]
+            if all(b is not None for b in branches):
+                options.append(frozenset().union(*branches))
+        elif op in _REPEATS and av[0] >= 1:
+            options.append(_required(av[2]))
+    options = [o for o in options if o]
+    return max(options, key=lambda o: min(map(len, o))) if options else None
+
+
+def _leading(items: list) -> frozenset[str] | None:
+    """Literals of which every match of ``items`` starts with one, or None."""
+    k = 0
+    while k < len(items) and items[k][0] in _ZERO_WIDTH:
+        k += 1
+    if k == len(items):
+        return None
+    op, av = items[k]
+    if op is _c.LITERAL:
+        return frozenset({_runs(items[k:])[0][1]})
+    if op is _c.SUBPATTERN:
+        return _leading(av[-1])
+    if op is _c.BRANCH:
+        branches = [_leading(b) for b in av[1]]
+        if all(b is not None for b in branches):
+            return frozenset().union(*branches)
+    return None
+
+
+def _ignores_case(items: list, flags: int) -> bool:
+    """Whether any part of the pattern matches case-insensitively."""
+    if flags & re.IGNORECASE:
+        return True
+    for op, av in items:
+        if op is _c.SUBPATTERN and (av[1] & re.IGNORECASE or _ignores_case(av[-1], 0)):
+            return True
+        if op is _c.BRANCH and any(_ignores_case(b, 0) for b in av[1]):
+            return True
+        if op in _REPEATS and _ignores_case(av[2], 0):
+            return True
+        if op in (_c.ASSERT, _c.ASSERT_NOT) and _ignores_case(av[1], 0):
+            return True
+    return False
+
+
+class RuleSet:
+    """
+    A compiled set of regex rules.
+
+    Each rule is a dict with at least ``id`` and ``pattern`` (the Doctor's
+    ``_ISSUE_RULES`` format). Case-insensitive rules compare their literals
+    against lower-cased text, which is only done for ASCII input where
+    lower-casing keeps offsets and agrees with the regex engine.
+    """
+
+    def __init__(self, rules: Sequence[dict[str, Any]]) -> None:
+        self.rules = list(rules)
+        self._compiled = [re.compile(r["pattern"]) for r in self.rules]
+        self._literals: list[frozenset[str] | None] = []
+        self._anchors: list[frozenset[str] | None] = []
+        self._folded: list[bool] = []
+        for compiled in self._compiled:
+            parsed = _sre_parse.parse(compiled.pattern, compiled.flags)
+            items = list(parsed)
+            fold = _ignores_case(items, parsed.state.flags)
+            literals = _required(items)
+            anchors = _leading(items)
+            if anchors is not None and min(map(len, anchors)) < _MIN_ANCHOR_LEN:
+                anchors = None
+            if fold:
+                literals = literals and frozenset(s.lower() for s in literals)
+                anchors = anchors and frozenset(s.lower() for s in anchors)
+            self._literals.append(literals)
+            self._anchors.append(anchors)
+            self._folded.append(fold)
+
+    def scan(self, text: str) -> dict[str, list[tuple[int, int]]]:
+        """
+        Return non-overlapping ``(start, end)`` spans per rule ID, exactly
+        as each rule's own ``finditer`` would.
+
+        Every rule ID is present in the result; rules that never match map
+        to an empty list.
+        """
+        lowered = text.lower() if text.isascii() else None
+        result: dict[str, list[tuple[int, int]]] = {}
+        for i, rule in enumerate(self.rules):
+            haystack = lowered if self._folded[i] else text
+            literals, anchors = self._literals[i], self._anchors[i]
+            if haystack is None:
+                spans = [m.span() for m in self._compiled[i].finditer(text)]
+            elif literals is not None and not any(s in haystack for s in literals):
+                spans = []
+            elif anchors is not None:
+                spans = self._scan_anchored(i, text, haystack, anchors)
+            else:
+                spans = [m.span() for m in self._compiled[i].finditer(text)]
+            result[rule["id"]] = spans
+        return result
+
+    def _scan_anchored(
+        self, i: int, text: str, haystack: str, anchors: frozenset[str]
+    ) -> list[tuple[int, int]]:
+        """Try rule ``i`` only where one of its leading literals occurs."""
+        starts: set[int] = set()
+        for anchor in anchors:
+            pos = haystack.find(anchor)
+            while pos != -1:
+                starts.add(pos)
+                pos = haystack.find(anchor, pos + 1)
+        match = self._compiled[i].match
+        spans: list[tuple[int, int]] = []
+        end = 0
+        for pos in sorted(starts):
+            if pos < end:
+                continue
+            m = match(text, pos)
+            if m:
+                spans.append(m.span())
+                end = m.end()
+        return spans
+
+
+def line_of(text: str, offset: int) -> int:
+    """1-based line number of ``offset`` in ``text``."""
+    return text.count("\n", 0, offset) + 1
@@ -7,8 +7,9 @@ sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 from fastapi import FastAPI
 from main import app as synapse_app
 
-# Create a root app to handle the /api prefix
-app = FastAPI()
+# Create a root app to handle the /api prefix. Mounted apps never run their
+# own lifespan, so the root app runs Synapse's (queue and HTTP client shutdown)
+app = FastAPI(lifespan=synapse_app.router.lifespan_context)
 
 # Mount the main Synapse app under /api
 # This ensures that requests to /api/build are routed to synapse_app /build
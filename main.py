@@ -6,8 +6,11 @@ and MCP visibility endpoints.
 
 from __future__ import annotations
 
+import asyncio
+import json
 import sys
 import os
+import time
 from pathlib import Path
 
 # Ensure project root is importable
@@ -17,17 +20,41 @@ sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
 from dotenv import load_dotenv
 load_dotenv(Path(__file__).resolve().parent / ".env")
 
+from contextlib import aclosing, asynccontextmanager
+
 from fastapi import FastAPI, HTTPException
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.responses import HTMLResponse
+from fastapi.responses import HTMLResponse, JSONResponse, StreamingResponse
 from fastapi.staticfiles import StaticFiles
 from pydantic import BaseModel, Field
-from typing import Any
+from typing import Annotated, Any
 
-from orchestration.agent_router import run_pipeline
-from mcp_servers.logs_mcp import get_logs
+from agents import doctor_agent, llm_client, parent_agent
+from orchestration.agent_router import coalescing_stats, run_pipeline_async, stage_stats
+from orchestration.batch import iter_batch, run_batch, summarize
+from orchestration.job_queue import BuildJobQueue, QueueFullError
+from mcp_servers.logs_mcp import get_logs, subscribe as subscribe_logs, unsubscribe as unsubscribe_logs
 from mcp_servers.registry import get_registry_snapshot, simulate_mcp_activity
 
+# ── Build job queue ──────────────────────────────────────────────────────────
+build_queue = BuildJobQueue(
+    workers=int(os.getenv("SYNAPSE_BUILD_WORKERS", "4")),
+    max_queue=int(os.getenv("SYNAPSE_BUILD_QUEUE_SIZE", "64")),
+)
+
+# Batch builds: prompts per request, and the server-side cap on pipelines
+# one batch may run at once
+BATCH_MAX_PROMPTS = int(os.getenv("SYNAPSE_BATCH_MAX_PROMPTS", "100"))
+BATCH_MAX_CONCURRENCY = int(os.getenv("SYNAPSE_BATCH_CONCURRENCY", str(os.cpu_count() or 4)))
+
+
+@asynccontextmanager
+async def lifespan(_: FastAPI):
+    yield
+    await build_queue.stop()
+    await llm_client.aclose()
+
+
 # ── App ──────────────────────────────────────────────────────────────────────
 app = FastAPI(
     title="SYNAPSE-X",
@@ -40,6 +67,7 @@ app = FastAPI(
     version="0.1.0",
     docs_url="/docs",
     redoc_url="/redoc",
+    lifespan=lifespan,
 )
 
 app.add_middleware(
@@ -65,6 +93,25 @@ class BuildRequest(BaseModel):
     )
 
 
+class BatchBuildRequest(BaseModel):
+    prompts: list[Annotated[str, Field(min_length=3)]] = Field(
+        ...,
+        min_length=1,
+        max_length=BATCH_MAX_PROMPTS,
+        description="Natural-language descriptions of the systems to build.",
+        json_schema_extra={"example": ["Build a todo API", "Build a blog with comments"]},
+    )
+    concurrency: int | None = Field(
+        None,
+        ge=1,
+        description="Pipelines to run at once; capped by SYNAPSE_BATCH_CONCURRENCY.",
+    )
+    stream: bool = Field(
+        False,
+        description="Stream one NDJSON line per prompt as it finishes, then a summary line.",
+    )
+
+
 class HealthResponse(BaseModel):
     status: str = "healthy"
     service: str = "SYNAPSE-X"
@@ -91,8 +138,8 @@ async def get_mcp_status() -> dict[str, dict[str, Any]]:
     """
     📡 **Live MCP Server Registry**
 
-    Returns current status, capabilities, and invocation counts
-    for all registered MCP tool-servers.
+    Returns current status, capabilities, invocation and error counts,
+    and latency histograms for all registered MCP tool-servers.
     """
     return get_registry_snapshot()
 
@@ -108,21 +155,143 @@ async def get_mcp_simulation() -> list[str]:
     return simulate_mcp_activity()
 
 
-@app.post("/build", tags=["Pipeline"])
+@app.post("/build", status_code=202, tags=["Pipeline"])
 async def build(request: BuildRequest) -> dict[str, Any]:
     """
-    🚀 **Execute the full SYNAPSE-X orchestration pipeline.**
+    🚀 **Queue a run of the full SYNAPSE-X orchestration pipeline.**
+
+    Flow: Parent Agent → {Dev Agent, DevOps Agent} → Doctor Agent → GitHub Push → Logs
 
-    Flow: Parent Agent → Dev Agent → DevOps Agent → Doctor Agent → GitHub Push → Logs
+    Returns immediately with a `job_id`; poll `GET /build/{job_id}` for the
+    status and, once finished, the unified pipeline response. Responds with
+    **429** when the build queue is full.
 
-    Returns a unified JSON response containing outputs from every pipeline stage,
-    plus `mcp_activity` showing all MCP tool invocations.
+    Jobs live in this process and run after the response is sent, so this
+    needs a long-lived server; on serverless hosts use `POST /build/stream`,
+    which finishes the build within the one request.
     """
     try:
-        result = run_pipeline(request.prompt)
-        return result
-    except Exception as exc:
-        raise HTTPException(status_code=500, detail=str(exc))
+        job = build_queue.submit(request.prompt)
+    except QueueFullError as exc:
+        return JSONResponse(status_code=429, content={"detail": str(exc)}, headers={"Retry-After": "5"})
+    job["status_url"] = f"/build/{job['job_id']}"
+    return job
+
+
+@app.post("/build/batch", tags=["Pipeline"], response_model=None)
+async def build_batch(request: BatchBuildRequest) -> dict[str, Any] | StreamingResponse:
+    """
+    📦 **Build many prompts in one request.**
+
+    Runs the pipeline for every prompt concurrently (at most `concurrency`
+    at once) and returns compact per-prompt results — run ID, status,
+    timings, Doctor stats and commit — in prompt order, plus a summary.
+    Identical prompts in a batch share one run.
+
+    With `stream: true` the response is NDJSON: one result line per prompt
+    in completion order (each carries its `index`), then a
+    `{"summary": …}` line.
+    """
+    concurrency = min(request.concurrency or BATCH_MAX_CONCURRENCY, BATCH_MAX_CONCURRENCY)
+    if not request.stream:
+        return await run_batch(request.prompts, concurrency)
+
+    async def stream():
+        started = time.perf_counter()
+        results: list[dict[str, Any]] = []
+        # aclosing: a client disconnect closes the batch at once, cancelling
+        # unfinished builds that no other request is waiting on
+        async with aclosing(iter_batch(request.prompts, concurrency)) as batch:
+            async for result in batch:
+                results.append(result)
+                yield json.dumps(result, default=str) + "\n"
+        yield json.dumps({"summary": summarize(results, concurrency, started)}) + "\n"
+
+    return StreamingResponse(stream(), media_type="application/x-ndjson")
+
+
+@app.get("/build/{job_id}", tags=["Pipeline"])
+async def build_status(job_id: str) -> dict[str, Any]:
+    """
+    Return the status of a queued build job.
+
+    `status` is one of queued / running / succeeded / failed. `result` holds
+    the unified response with outputs from every pipeline stage, plus
+    `stage_timings` and `mcp_activity`, once the job has succeeded.
+    """
+    job = build_queue.get(job_id)
+    if job is None:
+        raise HTTPException(status_code=404, detail=f"Unknown build job {job_id}")
+    return job
+
+
+def _sse(event: str, payload: Any) -> str:
+    """Format one Server-Sent Event frame."""
+    return f"event: {event}\ndata: {json.dumps(payload, default=str)}\n\n"
+
+
+@app.post("/build/stream", tags=["Pipeline"])
+async def build_stream(request: BuildRequest) -> StreamingResponse:
+    """
+    📡 **Run the pipeline and stream its progress as Server-Sent Events.**
+
+    Emits a `stage` event (`1_parent_analysis`, `2_dev_agent`, …) the moment
+    each stage finishes, an `mcp_activity` event per MCP activity line, then a
+    final `complete` event with the response minus the already-streamed
+    stages (or an `error` event).
+    """
+    events: asyncio.Queue[tuple[str, Any] | None] = asyncio.Queue()
+
+    def on_event(kind: str, payload: dict[str, Any]) -> None:
+        events.put_nowait((kind, payload))
+
+    async def produce() -> None:
+        try:
+            result = await run_pipeline_async(request.prompt, on_event=on_event)
+            events.put_nowait(("complete", {k: v for k, v in result.items() if k != "stages"}))
+        except Exception as exc:
+            events.put_nowait(("error", {"detail": str(exc)}))
+        finally:
+            events.put_nowait(None)
+
+    async def stream():
+        producer = asyncio.create_task(produce())
+        try:
+            while (item := await events.get()) is not None:
+                yield _sse(*item)
+        finally:
+            # Client went away mid-build — stop the pipeline
+            producer.cancel()
+
+    return StreamingResponse(
+        stream(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
+
+
+@app.get("/builds/stats", tags=["Pipeline"])
+async def build_queue_stats() -> dict[str, Any]:
+    """
+    Build queue depth, worker count, job counts by status, coalescing
+    counters and per-stage latency histograms.
+    """
+    return {**build_queue.stats(), **coalescing_stats(), "stage_latency": stage_stats()}
+
+
+@app.get("/cache/stats", tags=["Observability"])
+async def cache_stats() -> dict[str, Any]:
+    """Hit/miss counters for the Parent analysis and Doctor audit caches."""
+    return {
+        "parent_analysis": parent_agent.cache_stats(),
+        "doctor_audit": doctor_agent.cache_stats(),
+    }
+
+
+@app.get("/llm/stats", tags=["Observability"])
+async def llm_stats() -> dict[str, Any]:
+    """LLM client call/retry counters and circuit-breaker state."""
+    return llm_client.stats()
 
 
 @app.get("/logs", tags=["Observability"])
@@ -130,6 +299,54 @@ async def fetch_logs(
     agent: str | None = None,
     level: str | None = None,
     limit: int = 50,
+    run_id: str | None = None,
 ) -> list[dict[str, Any]]:
-    """Retrieve pipeline execution logs with optional filtering."""
-    return get_logs(agent=agent, level=level, limit=limit)
+    """
+    Retrieve pipeline execution logs with optional filtering.
+
+    Pass `run_id` (returned by every build) to fetch a single run's trace.
+    """
+    return get_logs(agent=agent, level=level, limit=limit, run_id=run_id)
+
+
+@app.get("/logs/stream", tags=["Observability"])
+async def stream_logs(
+    agent: str | None = None,
+    level: str | None = None,
+    run_id: str | None = None,
+    buffer: int = 256,
+) -> StreamingResponse:
+    """
+    📡 **Live log tail as Server-Sent Events.**
+
+    Pushes a `log` event for every newly stored entry matching the filters,
+    which are evaluated server-side. Each subscriber buffers at most `buffer`
+    undelivered entries; when a slow client falls behind the oldest are
+    dropped and a `dropped` event reports the running total.
+    """
+    subscription = subscribe_logs(
+        agent=agent, level=level, run_id=run_id, maxsize=max(1, min(buffer, 10_000)),
+    )
+
+    async def stream():
+        reported_drops = 0
+        try:
+            while True:
+                try:
+                    batch = await asyncio.wait_for(subscription.next_batch(), timeout=15)
+                except asyncio.TimeoutError:
+                    yield ": keep-alive\n\n"
+                    continue
+                if subscription.dropped != reported_drops:
+                    reported_drops = subscription.dropped
+                    yield _sse("dropped", {"dropped": reported_drops})
+                for entry in batch:
+                    yield _sse("log", entry)
+        finally:
+            unsubscribe_logs(subscription)
+
+    return StreamingResponse(
+        stream(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
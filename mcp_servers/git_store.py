@@ -0,0 +1,326 @@
+"""
+SYNAPSE-X — Content-Addressed Git Store
+Git-like object model behind the GitHub MCP mock. File contents are hashed
+into blobs that are stored once no matter how many repositories or commits
+contain them; a tree maps paths to blob hashes and a commit points at a
+tree and its parent. Additions/deletions are real line diffs against the
+parent commit, and only files whose blob changed are diffed at all.
+
+Memory is bounded: blob bytes and repository count are capped, and the
+least recently used repositories are evicted first. Blobs and trees are
+reference-counted so an evicted repository releases everything only it
+was holding.
+
+Repositories are create-or-get, and pushes are incremental: files are
+compared by hash with HEAD, unchanged files are neither stored nor
+diffed, and a push that changes nothing records no commit.
+"""
+
+from __future__ import annotations
+
+import difflib
+import hashlib
+import threading
+from collections import OrderedDict
+from typing import Any, Mapping
+
+
+def _object_id(kind: str, data: bytes) -> str:
+    """Git-style object hash: ``sha1("<kind> <len>\\0" + data)``."""
+    return hashlib.sha1(f"{kind} {len(data)}\0".encode("ascii") + data).hexdigest()
+
+
+def _tree_id(entries: Mapping[str, str]) -> str:
+    return _object_id("tree", "".join(f"{p}\0{b}\n" for p, b in sorted(entries.items())).encode("utf-8"))
+
+
+class _Blob:
+    __slots__ = ("content", "size", "lines", "refs")
+
+    def __init__(self, content: str, size: int) -> None:
+        self.content = content
+        self.size = size
+        self.lines = len(content.splitlines())
+        self.refs = 0
+
+
+class _Tree:
+    __slots__ = ("entries", "refs")
+
+    def __init__(self, entries: dict[str, str]) -> None:
+        self.entries = entries
+        self.refs = 0
+
+
+class GitObjectStore:
+    """
+    Thread-safe in-memory object store for mock repositories.
+
+    Args:
+        max_bytes:  Cap on the total size of unique blob contents.
+        max_repos:  Cap on the number of repositories kept.
+    """
+
+    _DIFF_CACHE_SIZE = 1024
+
+    def __init__(self, max_bytes: int = 64 * 1024 * 1024, max_repos: int = 1000) -> None:
+        self.max_bytes = max_bytes
+        self.max_repos = max_repos
+        # Re-entrant so :meth:`push` can compose the public operations atomically
+        self._lock = threading.RLock()
+        self._blobs: dict[str, _Blob] = {}
+        self._trees: dict[str, _Tree] = {}
+        # name → {"meta": dict, "commits": list[dict]}; most recently used last
+        self._repos: OrderedDict[str, dict[str, Any]] = OrderedDict()
+        self._diffs: OrderedDict[tuple[str, str], tuple[int, int]] = OrderedDict()
+        self._blob_bytes = 0
+        self._blob_writes = 0
+        self._blob_dedup_hits = 0
+        self._evicted_repos = 0
+
+    # ── Repositories ─────────────────────────────────────────────────────
+    def create_repo(self, name: str, meta: dict[str, Any]) -> tuple[dict[str, Any], bool]:
+        """
+        Create ``name`` unless it already exists.
+
+        Returns ``(meta, created)``; an existing repository keeps its
+        metadata and history, and ``meta`` is ignored.
+        """
+        with self._lock:
+            entry = self._repos.get(name)
+            if entry is not None:
+                self._repos.move_to_end(name)
+                return dict(entry["meta"]), False
+            self._repos[name] = {"meta": meta, "commits": []}
+            self._enforce_limits(keep=name)
+            return dict(meta), True
+
+    def delete_repo(self, name: str) -> bool:
+        """Remove ``name`` and its history; False if it did not exist."""
+        with self._lock:
+            if name not in self._repos:
+                return False
+            self._drop_repo(name)
+            return True
+
+    def repo(self, name: str) -> dict[str, Any] | None:
+        with self._lock:
+            entry = self._repos.get(name)
+            if entry is None:
+                return None
+            self._repos.move_to_end(name)
+            return dict(entry["meta"])
+
+    def _drop_repo(self, name: str) -> None:
+        """Remove a repository and release its trees (caller holds the lock)."""
+        for commit in self._repos.pop(name)["commits"]:
+            self._release_tree(commit["tree"])
+
+    def _enforce_limits(self, keep: str) -> None:
+        """Evict cold repositories until under both caps; never evicts ``keep``."""
+        while len(self._repos) > 1 and (len(self._repos) > self.max_repos or self._blob_bytes > self.max_bytes):
+            coldest = next(iter(self._repos))
+            if coldest == keep:
+                self._repos.move_to_end(keep)
+                coldest = next(iter(self._repos))
+            self._drop_repo(coldest)
+            self._evicted_repos += 1
+
+    # ── Objects ──────────────────────────────────────────────────────────
+    def _retain_tree(self, entries: dict[str, str]) -> str:
+        tree_id = _tree_id(entries)
+        tree = self._trees.get(tree_id)
+        if tree is None:
+            tree = self._trees[tree_id] = _Tree(entries)
+            for blob_id in entries.values():
+                blob = self._blobs[blob_id]
+                if blob.refs == 0:
+                    self._blob_bytes += blob.size
+                blob.refs += 1
+        tree.refs += 1
+        return tree_id
+
+    def _release_tree(self, tree_id: str) -> None:
+        tree = self._trees[tree_id]
+        tree.refs -= 1
+        if tree.refs:
+            return
+        del self._trees[tree_id]
+        for blob_id in tree.entries.values():
+            blob = self._blobs[blob_id]
+            blob.refs -= 1
+            if blob.refs == 0:
+                del self._blobs[blob_id]
+                self._blob_bytes -= blob.size
+
+    def _line_diff(self, old_id: str, new_id: str) -> tuple[int, int]:
+        """``(additions, deletions)`` between two blobs, memoised by blob pair."""
+        key = (old_id, new_id)
+        cached = self._diffs.get(key)
+        if cached is not None:
+            self._diffs.move_to_end(key)
+            return cached
+        old = self._blobs[old_id].content.splitlines()
+        new = self._blobs[new_id].content.splitlines()
+        additions = deletions = 0
+        for tag, i1, i2, j1, j2 in difflib.SequenceMatcher(None, old, new, autojunk=False).get_opcodes():
+            if tag != "equal":
+                deletions += i2 - i1
+                additions += j2 - j1
+        self._diffs[key] = (additions, deletions)
+        if len(self._diffs) > self._DIFF_CACHE_SIZE:
+            self._diffs.popitem(last=False)
+        return additions, deletions
+
+    # ── Commits ──────────────────────────────────────────────────────────
+    def commit(
+        self,
+        name: str,
+        files: Mapping[str, str],
+        message: str,
+        author: str,
+        timestamp: str,
+        replace: bool = False,
+    ) -> dict[str, Any] | None:
+        """
+        Record ``files`` on top of the repository's HEAD.
+
+        Each file is hashed and compared with HEAD first; only added or
+        modified files are stored, and only blobs the store did not already
+        hold count as ``transferred_bytes``. Paths not in ``files`` keep
+        their HEAD content, unless ``replace`` is set: then ``files`` is the
+        whole new tree and those paths are deleted. Returns None, recording
+        nothing, when no file changed; otherwise the commit with
+        ``files_changed``, ``files_deleted``, ``files_unchanged`` and
+        line-level ``additions``/``deletions`` against the parent.
+        """
+        with self._lock:
+            entry = self._repos[name]
+            self._repos.move_to_end(name)
+            parent = entry["commits"][-1] if entry["commits"] else None
+            base = self._trees[parent["tree"]].entries if parent else {}
+
+            entries = {} if replace else dict(base)
+            changed: list[str] = []
+            unchanged: list[str] = []
+            additions = deletions = transferred = 0
+            for path, content in files.items():
+                data = content.encode("utf-8")
+                blob_id = _object_id("blob", data)
+                old_id = base.get(path)
+                if old_id == blob_id:
+                    unchanged.append(path)
+                    entries[path] = blob_id
+                    continue
+                self._blob_writes += 1
+                if blob_id in self._blobs:
+                    self._blob_dedup_hits += 1
+                else:
+                    self._blobs[blob_id] = _Blob(content, len(data))
+                    transferred += len(data)
+                changed.append(path)
+                entries[path] = blob_id
+                if old_id is None:
+                    additions += self._blobs[blob_id].lines
+                else:
+                    added, deleted = self._line_diff(old_id, blob_id)
+                    additions += added
+                    deletions += deleted
+            deleted = [path for path in base if path not in entries]
+            for path in deleted:
+                deletions += self._blobs[base[path]].lines
+            if not changed and not deleted:
+                return None
+
+            tree_id = self._retain_tree(entries)
+            commit_id = _object_id("commit", "\n".join((
+                f"tree {tree_id}",
+                f"parent {parent['commit_id'] if parent else ''}",
+                f"author {author} {timestamp}",
+                "",
+                message,
+            )).encode("utf-8"))
+            commit = {
+                "sha": commit_id[:7],
+                "commit_id": commit_id,
+                "tree": tree_id,
+                "parent": parent["commit_id"] if parent else None,
+                "message": message,
+                "files_changed": changed,
+                "files_deleted": deleted,
+                "files_unchanged": unchanged,
+                "additions": additions,
+                "deletions": deletions,
+                "transferred_bytes": transferred,
+                "author": author,
+                "timestamp": timestamp,
+            }
+            entry["commits"].append(commit)
+            self._enforce_limits(keep=name)
+            return dict(commit)
+
+    def push(
+        self,
+        name: str,
+        files: Mapping[str, str],
+        message: str,
+        author: str,
+        timestamp: str,
+        meta: dict[str, Any],
+        replace: bool = False,
+    ) -> tuple[dict[str, Any] | None, bool]:
+        """
+        Create ``name`` (with ``meta``) if needed and :meth:`commit` to it
+        under one lock, so a concurrent eviction cannot remove the repository
+        in between. Returns ``(commit, True)``, or ``(HEAD, False)`` when
+        nothing changed.
+        """
+        with self._lock:
+            self.create_repo(name, meta)
+            commit = self.commit(name, files, message, author, timestamp, replace)
+            return (commit, True) if commit is not None else (self.head(name), False)
+
+    def head(self, name: str) -> dict[str, Any] | None:
+        """Latest commit of ``name``, or None if it has none."""
+        with self._lock:
+            entry = self._repos.get(name)
+            return dict(entry["commits"][-1]) if entry and entry["commits"] else None
+
+    def log(self, name: str) -> list[dict[str, Any]]:
+        """Commits of ``name``, oldest first (empty if unknown)."""
+        with self._lock:
+            entry = self._repos.get(name)
+            return [dict(c) for c in entry["commits"]] if entry else []
+
+    def read(self, name: str, path: str, ref: str | None = None) -> str | None:
+        """
+        Content of ``path`` at ``ref`` (a commit id or its prefix; HEAD if
+        omitted), or None if the repository, commit or path is unknown.
+        """
+        with self._lock:
+            entry = self._repos.get(name)
+            if entry is None or not entry["commits"]:
+                return None
+            if ref is None:
+                commit = entry["commits"][-1]
+            else:
+                commit = next((c for c in reversed(entry["commits"]) if c["commit_id"].startswith(ref)), None)
+                if commit is None:
+                    return None
+            blob_id = self._trees[commit["tree"]].entries.get(path)
+            return self._blobs[blob_id].content if blob_id else None
+
+    def stats(self) -> dict[str, Any]:
+        with self._lock:
+            return {
+                "repos": len(self._repos),
+                "commits": sum(len(r["commits"]) for r in self._repos.values()),
+                "trees": len(self._trees),
+                "blobs": len(self._blobs),
+                "blob_bytes": self._blob_bytes,
+                "max_bytes": self.max_bytes,
+                "max_repos": self.max_repos,
+                "blob_writes": self._blob_writes,
+                "blob_dedup_hits": self._blob_dedup_hits,
+                "evicted_repos": self._evicted_repos,
+            }
@@ -1,25 +1,33 @@
 """
 SYNAPSE-X — GitHub MCP Server (Mock)
 Simulates GitHub repository operations for the orchestration pipeline.
+Pushed files are kept in a content-addressed object store
+(:mod:`mcp_servers.git_store`), so identical scaffolds cost one blob each
+and commit stats are real diffs against the previous commit. Repositories
+are create-or-get and pushes only record files that changed.
 """
 
 from __future__ import annotations
 
+import os
 from datetime import datetime, timezone
 from typing import Any
 import uuid
 
+from mcp_servers.git_store import GitObjectStore
+from mcp_servers.registry import register_stats_provider
 
-# ── In-memory mock store ─────────────────────────────────────────────────────
-_repos: dict[str, dict[str, Any]] = {}
-_commits: dict[str, list[dict[str, Any]]] = {}
 
+# ── Object store ─────────────────────────────────────────────────────────────
+_store = GitObjectStore(
+    max_bytes=int(os.getenv("SYNAPSE_GIT_MAX_BYTES", str(64 * 1024 * 1024))),
+    max_repos=int(os.getenv("SYNAPSE_GIT_MAX_REPOS", "1000")),
+)
 
-def create_repo(name: str, description: str = "") -> dict[str, Any]:
-    """Simulate creating a GitHub repository."""
-    repo_id = str(uuid.uuid4())[:8]
-    repo = {
-        "id": repo_id,
+
+def _repo_meta(name: str, description: str) -> dict[str, Any]:
+    return {
+        "id": str(uuid.uuid4())[:8],
         "name": name,
         "full_name": f"synapse-x-org/{name}",
         "description": description,
@@ -29,34 +37,78 @@ def create_repo(name: str, description: str = "") -> dict[str, Any]:
         "created_at": datetime.now(timezone.utc).isoformat(),
         "status": "created",
     }
-    _repos[name] = repo
-    _commits[name] = []
+
+
+def create_repo(name: str, description: str = "") -> dict[str, Any]:
+    """
+    Simulate creating a GitHub repository (create-or-get).
+
+    An existing repository is returned unchanged, history included, with
+    ``status: "exists"``.
+    """
+    repo, created = _store.create_repo(name, _repo_meta(name, description))
+    if not created:
+        repo["status"] = "exists"
     return repo
 
 
-def push_code(repo_name: str, files: dict[str, str], message: str = "Initial commit") -> dict[str, Any]:
-    """Simulate pushing code to a repository."""
-    if repo_name not in _repos:
-        create_repo(repo_name, "Auto-created by SYNAPSE-X")
-
-    commit_sha = uuid.uuid4().hex[:7]
-    commit = {
-        "sha": commit_sha,
-        "message": message,
-        "files_changed": list(files.keys()),
-        "additions": sum(len(v.split("\n")) for v in files.values()),
-        "deletions": 0,
-        "author": "synapse-x-bot",
-        "timestamp": datetime.now(timezone.utc).isoformat(),
-    }
-    _commits[repo_name].append(commit)
+def delete_repo(name: str) -> bool:
+    """Simulate deleting a repository and its history."""
+    return _store.delete_repo(name)
+
+
+def push_code(
+    repo_name: str,
+    files: dict[str, str],
+    message: str = "Initial commit",
+    replace: bool = False,
+) -> dict[str, Any]:
+    """
+    Simulate pushing code to a repository (auto-created if missing).
+
+    Only files whose content differs from HEAD are recorded; with
+    ``replace``, ``files`` is a full snapshot and paths missing from it are
+    deleted. When nothing changed no commit is made: ``status`` is
+    ``"up_to_date"`` and ``commit`` is the existing HEAD.
+    """
+    meta = _repo_meta(repo_name, "Auto-created by SYNAPSE-X")
+    commit, changed = _store.push(
+        repo_name,
+        files,
+        message,
+        author="synapse-x-bot",
+        timestamp=datetime.now(timezone.utc).isoformat(),
+        meta=meta,
+        replace=replace,
+    )
+    if not changed:
+        return {
+            "status": "up_to_date",
+            "commit": commit,
+            "files_unchanged": list(files),
+            "repo_url": meta["html_url"],
+        }
     return {
         "status": "pushed",
         "commit": commit,
-        "repo_url": _repos[repo_name]["html_url"],
+        "files_unchanged": commit["files_unchanged"],
+        "repo_url": meta["html_url"],
     }
 
 
 def list_commits(repo_name: str) -> list[dict[str, Any]]:
     """Simulate listing commits for a repository."""
-    return _commits.get(repo_name, [])
+    return _store.log(repo_name)
+
+
+def get_file(repo_name: str, path: str, ref: str | None = None) -> str | None:
+    """Content of ``path`` at ``ref`` (HEAD if omitted), or None if absent."""
+    return _store.read(repo_name, path, ref)
+
+
+def get_stats() -> dict[str, Any]:
+    """Object-store occupancy, deduplication and eviction counters."""
+    return _store.stats()
+
+
+register_stats_provider("git_mcp", get_stats)
@@ -0,0 +1,274 @@
+"""
+SYNAPSE-X — Persistent Log Segments
+Optional on-disk backend for the Logs MCP server. Entries are appended to
+length-prefixed segment files that rotate at a size threshold; old segments
+are deleted by total-size and age retention. Reads memory-map one segment
+at a time and walk it newest-first, decoding only the records that pass
+the agent/level filters.
+
+Record layout (little-endian)::
+
+    u32 body_len | body | u32 body_len
+
+    body = u64 seq | f64 created | u16 agent_len | u8 level_len
+           | agent | level | JSON {"run_id"?, "id", "event", "data"}
+
+The trailing length lets readers walk a segment backwards from its end.
+``run_id`` is written first in the JSON so run-scoped reads can reject
+records by prefix without decoding them.
+"""
+
+from __future__ import annotations
+
+import json
+import mmap
+import os
+import struct
+import threading
+import time
+from pathlib import Path
+from typing import Any, Iterable, Iterator
+
+from mcp_servers.log_store import LogRecord
+
+_LEN = struct.Struct("<I")
+_HEAD = struct.Struct("<QdHB")
+_SEGMENT_GLOB = "segment-*.log"
+
+
+def _segment_name(first_seq: int) -> str:
+    return f"segment-{first_seq:020d}.log"
+
+
+def _encode(seq: int, record: LogRecord) -> bytes:
+    agent = record.agent.encode("utf-8")
+    level = record.level.encode("utf-8")
+    fields: dict[str, Any] = {"run_id": record.run_id} if record.run_id is not None else {}
+    fields.update(id=record.id, event=record.event, data=record.data)
+    payload = json.dumps(fields, default=str, separators=(",", ":")).encode("utf-8")
+    body = _HEAD.pack(seq, record.created, len(agent), len(level)) + agent + level + payload
+    frame = _LEN.pack(len(body))
+    return frame + body + frame
+
+
+def _valid_length(buf: bytes | mmap.mmap) -> tuple[int, int]:
+    """
+    Walk a segment forwards and return ``(bytes_of_valid_records, last_seq)``.
+
+    A torn final record (crash mid-write) ends the walk; ``last_seq`` is -1
+    for an empty segment.
+    """
+    pos, last_seq, size = 0, -1, len(buf)
+    while pos + _LEN.size <= size:
+        (n,) = _LEN.unpack_from(buf, pos)
+        end = pos + _LEN.size + n + _LEN.size
+        if n < _HEAD.size or end > size or _LEN.unpack_from(buf, end - _LEN.size)[0] != n:
+            break
+        last_seq = _HEAD.unpack_from(buf, pos + _LEN.size)[0]
+        pos = end
+    return pos, last_seq
+
+
+class SegmentLog:
+    """
+    Append-only, segmented, on-disk log.
+
+    Args:
+        directory:          Where segment files live (created if missing).
+        segment_bytes:      Active segment is rotated once it reaches this size.
+        max_bytes:          Oldest segments are deleted while the total exceeds this.
+        max_age_seconds:    Segments whose last write is older than this are deleted.
+    """
+
+    def __init__(
+        self,
+        directory: str | os.PathLike[str],
+        segment_bytes: int = 4 * 1024 * 1024,
+        max_bytes: int = 256 * 1024 * 1024,
+        max_age_seconds: float | None = None,
+    ) -> None:
+        self.directory = Path(directory)
+        self.directory.mkdir(parents=True, exist_ok=True)
+        self.segment_bytes = segment_bytes
+        self.max_bytes = max_bytes
+        self.max_age_seconds = max_age_seconds
+        self._lock = threading.Lock()
+        self._segments: list[Path] = sorted(self.directory.glob(_SEGMENT_GLOB))
+        self._next_seq = 0
+        self._active = None
+        self._active_size = 0
+        self._recover()
+
+    # ── Lifecycle ────────────────────────────────────────────────────────
+    def _recover(self) -> None:
+        """Truncate a torn tail on the newest segment and resume its sequence."""
+        if not self._segments:
+            self._open_segment()
+            return
+        newest = self._segments[-1]
+        with open(newest, "r+b") as fh:
+            data = fh.read()
+            valid, last_seq = _valid_length(data)
+            if valid != len(data):
+                fh.truncate(valid)
+        if last_seq < 0:
+            last_seq = int(newest.stem.split("-")[1]) - 1
+        self._next_seq = last_seq + 1
+        self._active = open(newest, "ab")
+        self._active_size = valid
+
+    def _open_segment(self) -> None:
+        path = self.directory / _segment_name(self._next_seq)
+        self._segments.append(path)
+        self._active = open(path, "ab")
+        self._active_size = 0
+
+    def _rotate(self) -> None:
+        """Close the active segment, start a new one and apply retention."""
+        assert self._active is not None
+        self._active.close()
+        self._open_segment()
+        self._apply_retention()
+
+    def _apply_retention(self) -> None:
+        """Delete sealed segments beyond the size or age budget."""
+        sealed = self._segments[:-1]
+        sizes = {p: p.stat().st_size for p in sealed}
+        total = sum(sizes.values()) + self._active_size
+        cutoff = time.time() - self.max_age_seconds if self.max_age_seconds else None
+        for path in sealed:
+            expired = cutoff is not None and path.stat().st_mtime < cutoff
+            if total <= self.max_bytes and not expired:
+                break
+            path.unlink(missing_ok=True)
+            self._segments.remove(path)
+            total -= sizes[path]
+
+    def close(self) -> None:
+        with self._lock:
+            if self._active is not None:
+                self._active.close()
+                self._active = None
+
+    # ── Writes ───────────────────────────────────────────────────────────
+    def append(self, record: LogRecord) -> None:
+        """Persist a single record."""
+        self.append_many((record,))
+
+    def append_many(self, records: Iterable[LogRecord]) -> None:
+        """Persist several records with one write and one flush."""
+        with self._lock:
+            assert self._active is not None, "segment log is closed"
+            chunks: list[bytes] = []
+            for record in records:
+                chunks.append(_encode(self._next_seq, record))
+                self._next_seq += 1
+            if not chunks:
+                return
+            blob = b"".join(chunks)
+            self._active.write(blob)
+            self._active.flush()
+            self._active_size += len(blob)
+            if self._active_size >= self.segment_bytes:
+                self._rotate()
+
+    def clear(self) -> int:
+        """Delete every segment; returns the number of files removed."""
+        with self._lock:
+            if self._active is not None:
+                self._active.close()
+            removed = 0
+            for path in self._segments:
+                path.unlink(missing_ok=True)
+                removed += 1
+            self._segments = []
+            self._open_segment()
+            return removed
+
+    # ── Reads ────────────────────────────────────────────────────────────
+    def _visible(self) -> list[tuple[Path, int]]:
+        """Segments newest-first with the byte length readers may map."""
+        with self._lock:
+            segments = list(self._segments)
+            active_size = self._active_size
+        sizes = [(p, p.stat().st_size if p.exists() else 0) for p in segments[:-1]]
+        sizes.append((segments[-1], active_size))
+        return list(reversed(sizes))
+
+    def iter_newest_first(
+        self,
+        agent: str | None = None,
+        level: str | None = None,
+        run_id: str | None = None,
+    ) -> Iterator[LogRecord]:
+        """
+        Yield persisted entries newest-first, filtered on agent, level and run.
+
+        Filters are applied to the fixed record header and the payload's
+        leading ``run_id`` key, so non-matching records are skipped without
+        JSON decoding.
+        """
+        agent_b = agent.encode("utf-8") if agent else None
+        level_b = level.encode("utf-8") if level else None
+        run_b = f'{{"run_id":{json.dumps(run_id)},'.encode("utf-8") if run_id else None
+        for path, size in self._visible():
+            if size == 0:
+                continue
+            try:
+                fh = open(path, "rb")
+            except FileNotFoundError:
+                continue  # removed by retention while we were reading
+            with fh, mmap.mmap(fh.fileno(), size, access=mmap.ACCESS_READ) as buf:
+                pos = size
+                while pos > 0:
+                    (n,) = _LEN.unpack_from(buf, pos - _LEN.size)
+                    start = pos - _LEN.size - n
+                    _seq, created, agent_len, level_len = _HEAD.unpack_from(buf, start)
+                    a0 = start + _HEAD.size
+                    l0 = a0 + agent_len
+                    p0 = l0 + level_len
+                    pos = start - _LEN.size
+                    if agent_b is not None and buf[a0:l0] != agent_b:
+                        continue
+                    if level_b is not None and buf[l0:p0] != level_b:
+                        continue
+                    if run_b is not None and buf[p0:p0 + len(run_b)] != run_b:
+                        continue
+                    fields = json.loads(buf[p0:start + n])
+                    yield LogRecord(
+                        fields["id"], created, bytes(buf[a0:l0]).decode("utf-8"),
+                        bytes(buf[l0:p0]).decode("utf-8"), fields["event"], fields["data"],
+                        fields.get("run_id"),
+                    )
+
+    def query(
+        self,
+        limit: int,
+        agent: str | None = None,
+        level: str | None = None,
+        run_id: str | None = None,
+    ) -> list[LogRecord]:
+        """Return up to ``limit`` persisted entries, newest first."""
+        results: list[LogRecord] = []
+        if limit <= 0:
+            return results
+        for entry in self.iter_newest_first(agent=agent, level=level, run_id=run_id):
+            results.append(entry)
+            if len(results) >= limit:
+                break
+        return results
+
+    def stats(self) -> dict[str, Any]:
+        with self._lock:
+            segments = list(self._segments)
+            active_size = self._active_size
+        sealed = sum(p.stat().st_size for p in segments[:-1] if p.exists())
+        return {
+            "directory": str(self.directory),
+            "segments": len(segments),
+            "bytes": sealed + active_size,
+            "next_seq": self._next_seq,
+            "segment_bytes": self.segment_bytes,
+            "max_bytes": self.max_bytes,
+            "max_age_seconds": self.max_age_seconds,
+        }
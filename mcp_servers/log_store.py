@@ -0,0 +1,283 @@
+"""
+SYNAPSE-X — Bounded Log Store
+Capacity-bounded ring buffer backing the Logs MCP server. Appends and
+evictions are O(1); the oldest entries are dropped once the store is full,
+and optional per-agent quotas stop one noisy agent from evicting everyone
+else's history. Secondary indexes by agent, level and pipeline run ID let
+newest-first queries touch only the entries they return.
+
+Entries are stored as compact :class:`LogRecord` objects; the public dict
+form, including the ISO-8601 timestamp, is only built when an entry is read.
+"""
+
+from __future__ import annotations
+
+import threading
+from collections import deque
+from datetime import datetime, timezone
+from typing import Any, Iterable, Iterator
+
+# Entry fields that get a secondary index
+_INDEXED_FIELDS: tuple[str, ...] = ("agent", "level", "run_id")
+
+
+class LogRecord:
+    """A stored log entry; ``created`` is a Unix timestamp formatted on read."""
+
+    __slots__ = ("id", "created", "agent", "level", "event", "data", "run_id", "_iso")
+
+    def __init__(
+        self,
+        id: str,
+        created: float,
+        agent: str,
+        level: str,
+        event: str,
+        data: Any,
+        run_id: str | None = None,
+    ) -> None:
+        self.id = id
+        self.created = created
+        self.agent = agent
+        self.level = level
+        self.event = event
+        self.data = data
+        self.run_id = run_id
+        self._iso: str | None = None
+
+    @property
+    def timestamp(self) -> str:
+        if self._iso is None:
+            self._iso = datetime.fromtimestamp(self.created, timezone.utc).isoformat()
+        return self._iso
+
+    def to_dict(self) -> dict[str, Any]:
+        return {
+            "id": self.id,
+            "timestamp": self.timestamp,
+            "agent": self.agent,
+            "level": self.level,
+            "event": self.event,
+            "data": self.data,
+            "run_id": self.run_id,
+        }
+
+
+class LogStore:
+    """
+    Thread-safe ring buffer of log entries.
+
+    Entries are keyed by an internal, monotonically increasing sequence
+    number. ``_order`` holds sequence numbers oldest-first, and each
+    ``(field, value)`` index holds the sequence numbers of matching entries,
+    also oldest-first (``None`` values, e.g. logs outside any pipeline run,
+    are not indexed). An entry evicted by its agent's quota leaves stale
+    numbers behind in the other sequences; readers skip them and an
+    amortised compaction sweeps them out.
+
+    Index keys that have lost entries to eviction are remembered, so
+    :meth:`is_complete` can tell a caller with a slower, fuller source
+    (the on-disk segments) whether the ring already holds every match.
+
+    Args:
+        capacity:      Maximum number of entries kept across all agents.
+        agent_quotas:  Optional per-agent caps, e.g. ``{"logs_mcp": 1000}``.
+    """
+
+    def __init__(self, capacity: int = 10_000, agent_quotas: dict[str, int] | None = None) -> None:
+        if capacity < 1:
+            raise ValueError("capacity must be >= 1")
+        self.capacity = capacity
+        self.agent_quotas: dict[str, int] = dict(agent_quotas or {})
+        self._lock = threading.Lock()
+        self._next_seq = 0
+        self._entries: dict[int, LogRecord] = {}
+        self._order: deque[int] = deque()
+        self._index: dict[tuple[str, Any], deque[int]] = {}
+        # Index keys with evicted entries; ``_lossy`` once anything was evicted
+        self._partial: set[tuple[str, Any]] = set()
+        self._lossy = False
+        self._appended = 0
+        self._dropped_capacity = 0
+        self._dropped_by_agent: dict[str, int] = {}
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    # ── Writes ───────────────────────────────────────────────────────────
+    def append(self, record: LogRecord) -> None:
+        """Store ``record``, evicting the oldest entries if over capacity."""
+        with self._lock:
+            self._insert(record)
+
+    def extend(self, records: Iterable[LogRecord]) -> None:
+        """Store several records under a single lock acquisition."""
+        with self._lock:
+            for record in records:
+                self._insert(record)
+
+    def _insert(self, record: LogRecord) -> None:
+        """Append one record and enforce quota/capacity (caller holds the lock)."""
+        seq = self._next_seq
+        self._next_seq += 1
+        self._entries[seq] = record
+        self._order.append(seq)
+        for field in _INDEXED_FIELDS:
+            value = getattr(record, field)
+            if value is not None:
+                self._index.setdefault((field, value), deque()).append(seq)
+        self._appended += 1
+
+        # The agent index never holds stale numbers: quota and capacity
+        # evictions both remove that agent's oldest entry.
+        agent = record.agent
+        agent_seqs = self._index[("agent", agent)]
+        quota = self.agent_quotas.get(agent)
+        if quota is not None and len(agent_seqs) > quota:
+            self._mark_evicted(self._entries.pop(agent_seqs.popleft()))
+            self._dropped_by_agent[agent] = self._dropped_by_agent.get(agent, 0) + 1
+            if len(self._order) > 2 * self.capacity:
+                self._compact()
+
+        while len(self._entries) > self.capacity:
+            self._evict_oldest()
+
+    def _evict_oldest(self) -> None:
+        """Drop the oldest live entry (caller holds the lock)."""
+        while True:
+            seq = self._order.popleft()
+            entry = self._entries.pop(seq, None)
+            if entry is not None:
+                break
+        self._mark_evicted(entry)
+        for field in _INDEXED_FIELDS:
+            value = getattr(entry, field)
+            if value is not None:
+                self._trim_index((field, value))
+        self._dropped_capacity += 1
+
+    def _mark_evicted(self, entry: LogRecord) -> None:
+        self._lossy = True
+        for field in _INDEXED_FIELDS:
+            value = getattr(entry, field)
+            if value is not None:
+                self._partial.add((field, value))
+
+    def _drop_index(self, key: tuple[str, Any]) -> None:
+        del self._index[key]
+        # Run IDs are never reused, so a fully evicted run needs no memory;
+        # agents and levels stay partial for good
+        if key[0] == "run_id":
+            self._partial.discard(key)
+
+    def _trim_index(self, key: tuple[str, Any]) -> None:
+        """Pop evicted numbers off the front of an index; drop it when empty."""
+        seqs = self._index[key]
+        while seqs and seqs[0] not in self._entries:
+            seqs.popleft()
+        if not seqs:
+            self._drop_index(key)
+
+    def _compact(self) -> None:
+        """Sweep sequence numbers of quota-evicted entries out of every sequence."""
+        live = self._entries
+        self._order = deque(seq for seq in self._order if seq in live)
+        for key, seqs in list(self._index.items()):
+            kept = deque(seq for seq in seqs if seq in live)
+            if kept:
+                self._index[key] = kept
+            else:
+                self._drop_index(key)
+
+    def clear(self) -> int:
+        """Remove every entry and return how many were dropped."""
+        with self._lock:
+            count = len(self._entries)
+            self._entries.clear()
+            self._order.clear()
+            self._index.clear()
+            self._partial.clear()
+            self._lossy = False
+        return count
+
+    def inherit_gaps(self, other: LogStore) -> None:
+        """Carry ``other``'s eviction history over (used when resizing)."""
+        with other._lock:
+            partial, lossy = set(other._partial), other._lossy
+        with self._lock:
+            self._partial |= partial
+            self._lossy = self._lossy or lossy
+
+    # ── Reads ────────────────────────────────────────────────────────────
+    def snapshot(self) -> list[LogRecord]:
+        """Return all live entries, oldest first."""
+        with self._lock:
+            return list(self._entries.values())
+
+    def _newest_first(self, seqs: deque[int]) -> Iterator[LogRecord]:
+        """Yield live entries for ``seqs`` from newest to oldest."""
+        entries = self._entries
+        for seq in reversed(seqs):
+            entry = entries.get(seq)
+            if entry is not None:
+                yield entry
+
+    def query(self, limit: int, **filters: Any) -> list[LogRecord]:
+        """
+        Return up to ``limit`` entries, newest first, matching ``filters``.
+
+        Each filter is an indexed field (``agent=``, ``level=``, ``run_id=``); ``None``
+        values are ignored. The smallest matching index is walked backwards
+        and the remaining filters are checked per entry, so the cost is
+        bounded by the result size rather than the store size.
+        """
+        active = {f: v for f, v in filters.items() if v is not None}
+        unknown = set(active) - set(_INDEXED_FIELDS)
+        if unknown:
+            raise ValueError(f"Cannot filter on unindexed fields {sorted(unknown)}")
+        if limit <= 0:
+            return []
+
+        results: list[LogRecord] = []
+        with self._lock:
+            if active:
+                candidates = [self._index.get((f, v)) for f, v in active.items()]
+                if any(seqs is None for seqs in candidates):
+                    return []
+                seqs = min(candidates, key=len)  # type: ignore[arg-type]
+            else:
+                seqs = self._order
+            for entry in self._newest_first(seqs):  # type: ignore[arg-type]
+                if all(getattr(entry, f) == v for f, v in active.items()):
+                    results.append(entry)
+                    if len(results) >= limit:
+                        break
+        return results
+
+    def is_complete(self, **filters: Any) -> bool:
+        """
+        True if no entry matching ``filters`` has ever been evicted, i.e.
+        :meth:`query` sees every match this store was given.
+
+        With filters, one live index key that never lost an entry is
+        enough: every evicted match would have marked all of its keys.
+        """
+        active = [(f, v) for f, v in filters.items() if v is not None]
+        with self._lock:
+            if not active:
+                return not self._lossy
+            return any(key in self._index and key not in self._partial for key in active)
+
+    def stats(self) -> dict[str, Any]:
+        """Occupancy and eviction counters."""
+        with self._lock:
+            dropped_quota = sum(self._dropped_by_agent.values())
+            return {
+                "capacity": self.capacity,
+                "size": len(self._entries),
+                "appended": self._appended,
+                "dropped": self._dropped_capacity + dropped_quota,
+                "dropped_capacity": self._dropped_capacity,
+                "dropped_quota": dict(self._dropped_by_agent),
+                "agent_quotas": dict(self.agent_quotas),
+            }
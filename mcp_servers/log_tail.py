@@ -0,0 +1,97 @@
+"""
+SYNAPSE-X — Live Log Tail
+Fan-out of newly stored Logs MCP entries to streaming subscribers.
+Filters are fixed at subscription time and evaluated server-side; every
+subscriber owns a bounded buffer that drops its oldest entries when the
+consumer falls behind, so a slow client can never stall log writers.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import threading
+from collections import deque
+from typing import Any, Iterable
+
+from mcp_servers.log_store import LogRecord
+
+
+class LogSubscription:
+    """
+    One live-tail consumer bound to the event loop that created it.
+
+    Writers on any thread call :meth:`push`; the consumer awaits
+    :meth:`next_batch` on its own loop.
+    """
+
+    def __init__(
+        self,
+        agent: str | None = None,
+        level: str | None = None,
+        run_id: str | None = None,
+        maxsize: int = 256,
+    ) -> None:
+        self.filters = {"agent": agent, "level": level, "run_id": run_id}
+        self.dropped = 0
+        self._active = {f: v for f, v in self.filters.items() if v is not None}
+        self._buffer: deque[dict[str, Any]] = deque(maxlen=maxsize)
+        self._lock = threading.Lock()
+        self._loop = asyncio.get_running_loop()
+        self._ready = asyncio.Event()
+
+    def matches(self, record: LogRecord) -> bool:
+        return all(getattr(record, f) == v for f, v in self._active.items())
+
+    def push(self, entries: list[dict[str, Any]]) -> None:
+        """Queue entries, evicting the oldest ones if the buffer is full."""
+        with self._lock:
+            overflow = len(self._buffer) + len(entries) - self._buffer.maxlen  # type: ignore[operator]
+            if overflow > 0:
+                self.dropped += overflow
+            self._buffer.extend(entries)
+        try:
+            self._loop.call_soon_threadsafe(self._ready.set)
+        except RuntimeError:
+            pass  # consumer's loop already closed
+
+    async def next_batch(self) -> list[dict[str, Any]]:
+        """Wait for and return everything queued since the last call."""
+        await self._ready.wait()
+        self._ready.clear()
+        with self._lock:
+            batch = list(self._buffer)
+            self._buffer.clear()
+        return batch
+
+
+class LogBroadcaster:
+    """Registry of live subscriptions; :meth:`publish` is called per write."""
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self._subscriptions: set[LogSubscription] = set()
+
+    def subscribe(self, **kwargs: Any) -> LogSubscription:
+        subscription = LogSubscription(**kwargs)
+        with self._lock:
+            self._subscriptions.add(subscription)
+        return subscription
+
+    def unsubscribe(self, subscription: LogSubscription) -> None:
+        with self._lock:
+            self._subscriptions.discard(subscription)
+
+    def __len__(self) -> int:
+        return len(self._subscriptions)
+
+    def publish(self, records: Iterable[LogRecord]) -> None:
+        """Deliver ``records`` to every subscription whose filters match."""
+        if not self._subscriptions:
+            return
+        with self._lock:
+            subscriptions = list(self._subscriptions)
+        records = list(records)
+        for subscription in subscriptions:
+            matched = [r.to_dict() for r in records if subscription.matches(r)]
+            if matched:
+                subscription.push(matched)
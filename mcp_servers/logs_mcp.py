@@ -1,19 +1,159 @@
 """
 SYNAPSE-X — Logs MCP Server
 Stores and retrieves all agent outputs for observability and audit trails.
+
+Entries live in a bounded in-memory ring. Setting ``SYNAPSE_LOG_DIR`` (or
+calling :func:`enable_persistence`) also appends them to on-disk segment
+files, so history survives restarts and can outgrow RAM.
 """
 
 from __future__ import annotations
 
-from datetime import datetime, timezone
-from typing import Any
-import threading
+from typing import Any, Iterable
+import itertools
+import os
+import time
 import uuid
 
+from mcp_servers.log_segments import SegmentLog
+from mcp_servers.log_store import LogRecord, LogStore
+from mcp_servers.log_tail import LogBroadcaster, LogSubscription
+from mcp_servers.registry import register_stats_provider
+
+
+def _parse_quotas(spec: str) -> dict[str, int]:
+    """Parse ``"agent=limit,agent=limit"`` into a quota mapping."""
+    quotas: dict[str, int] = {}
+    for item in filter(None, (part.strip() for part in spec.split(","))):
+        agent, _, limit = item.partition("=")
+        quotas[agent.strip()] = int(limit)
+    return quotas
+
 
-# ── Thread-safe in-memory log store ──────────────────────────────────────────
-_lock = threading.Lock()
-_logs: list[dict[str, Any]] = []
+# ── Thread-safe, capacity-bounded in-memory log store ────────────────────────
+_store = LogStore(
+    capacity=int(os.getenv("SYNAPSE_LOG_CAPACITY", "10000")),
+    agent_quotas=_parse_quotas(os.getenv("SYNAPSE_LOG_AGENT_QUOTAS", "")),
+)
+
+
+def configure(capacity: int | None = None, agent_quotas: dict[str, int] | None = None) -> dict[str, Any]:
+    """
+    Resize the log store and/or replace its per-agent quotas.
+
+    The newest entries that still fit are carried over.
+
+    Returns:
+        The store's stats after reconfiguration.
+    """
+    global _store
+    new_store = LogStore(
+        capacity=capacity if capacity is not None else _store.capacity,
+        agent_quotas=agent_quotas if agent_quotas is not None else _store.agent_quotas,
+    )
+    new_store.extend(_store.snapshot())
+    new_store.inherit_gaps(_store)
+    _store = new_store
+    return _store.stats()
+
+
+# ── Optional persistent backend ──────────────────────────────────────────────
+_segments: SegmentLog | None = None
+# Segments hold entries from before this process (or before persistence was
+# enabled) that the ring never saw; only run IDs are then known to be new
+_disk_history = False
+
+
+def enable_persistence(
+    directory: str,
+    segment_bytes: int = 4 * 1024 * 1024,
+    max_bytes: int = 256 * 1024 * 1024,
+    max_age_seconds: float | None = None,
+) -> dict[str, Any]:
+    """
+    Start mirroring logs into append-only segment files under ``directory``.
+
+    Existing segments are reopened, so logs from previous runs stay
+    queryable. Retention deletes the oldest segments beyond ``max_bytes``
+    or older than ``max_age_seconds``.
+
+    Returns:
+        The segment log's stats.
+    """
+    global _segments, _disk_history
+    disable_persistence()
+    _segments = SegmentLog(directory, segment_bytes, max_bytes, max_age_seconds)
+    stats = _segments.stats()
+    _disk_history = stats["next_seq"] > 0
+    return stats
+
+
+def disable_persistence() -> None:
+    """Stop writing to disk; segment files are left in place."""
+    global _segments
+    if _segments is not None:
+        _segments.close()
+        _segments = None
+
+
+if os.getenv("SYNAPSE_LOG_DIR"):
+    enable_persistence(
+        os.environ["SYNAPSE_LOG_DIR"],
+        segment_bytes=int(os.getenv("SYNAPSE_LOG_SEGMENT_BYTES", str(4 * 1024 * 1024))),
+        max_bytes=int(os.getenv("SYNAPSE_LOG_RETENTION_BYTES", str(256 * 1024 * 1024))),
+        max_age_seconds=float(os.getenv("SYNAPSE_LOG_RETENTION_SECONDS", "0")) or None,
+    )
+
+
+# ── Live tail subscribers ────────────────────────────────────────────────────
+_tail = LogBroadcaster()
+
+
+def subscribe(
+    agent: str | None = None,
+    level: str | None = None,
+    run_id: str | None = None,
+    maxsize: int = 256,
+) -> LogSubscription:
+    """
+    Start receiving newly stored entries that match the given filters.
+
+    Must be called from the event loop that will consume the subscription.
+    Up to ``maxsize`` undelivered entries are buffered; older ones are
+    dropped (and counted in ``subscription.dropped``) for slow consumers.
+    """
+    return _tail.subscribe(agent=agent, level=level, run_id=run_id, maxsize=maxsize)
+
+
+def unsubscribe(subscription: LogSubscription) -> None:
+    """Stop delivering entries to ``subscription``."""
+    _tail.unsubscribe(subscription)
+
+
+# ── Entry IDs ────────────────────────────────────────────────────────────────
+# Per-process prefix + monotonic counter: unique across restarts (for
+# persisted segments) without paying for a uuid4 per entry.
+_ID_PREFIX = uuid.uuid4().hex[:8]
+_id_counter = itertools.count(1)
+
+
+def _make_record(
+    agent: str,
+    event: str,
+    data: Any = None,
+    level: str = "info",
+    created: float | None = None,
+    run_id: str | None = None,
+) -> LogRecord:
+    return LogRecord(
+        f"{_ID_PREFIX}-{next(_id_counter):x}",
+        time.time() if created is None else created,
+        agent,
+        level,
+        event,
+        data,
+        run_id,
+    )
 
 
 def store_log(
@@ -21,64 +161,107 @@ def store_log(
     event: str,
     data: Any = None,
     level: str = "info",
+    run_id: str | None = None,
 ) -> dict[str, Any]:
     """
     Store a structured log entry.
 
     Args:
-        agent:  Name of the agent that produced the log.
-        event:  Short event description.
-        data:   Arbitrary payload (will be stored as-is).
-        level:  Log severity — info / warning / error / debug.
+        agent:   Name of the agent that produced the log.
+        event:   Short event description.
+        data:    Arbitrary payload (will be stored as-is).
+        level:   Log severity — info / warning / error / debug.
+        run_id:  Pipeline run the entry belongs to, if any.
 
     Returns:
         The stored log entry including its generated ID.
     """
-    entry = {
-        "id": str(uuid.uuid4()),
-        "timestamp": datetime.now(timezone.utc).isoformat(),
-        "agent": agent,
-        "level": level,
-        "event": event,
-        "data": data,
-    }
-    with _lock:
-        _logs.append(entry)
-    return entry
+    record = _make_record(agent, event, data, level, run_id=run_id)
+    _store.append(record)
+    if _segments is not None:
+        _segments.append(record)
+    _tail.publish((record,))
+    return record.to_dict()
+
+
+def store_logs_batch(entries: Iterable[dict[str, Any]]) -> list[str]:
+    """
+    Store several log entries with one lock acquisition (and one disk write).
+
+    Args:
+        entries:  Dicts with the keyword arguments of :func:`store_log`
+                  (``agent``, ``event``, optional ``data``, ``level`` and
+                  ``run_id``),
+                  plus an optional ``created`` Unix timestamp for entries
+                  buffered before the call.
+
+    Returns:
+        The generated IDs, in input order.
+    """
+    records = [_make_record(**entry) for entry in entries]
+    _store.extend(records)
+    if _segments is not None:
+        _segments.append_many(records)
+    _tail.publish(records)
+    return [r.id for r in records]
 
 
 def get_logs(
     agent: str | None = None,
     level: str | None = None,
     limit: int = 100,
+    run_id: str | None = None,
 ) -> list[dict[str, Any]]:
     """
     Retrieve stored logs with optional filtering.
 
     Args:
-        agent:  Filter by agent name.
-        level:  Filter by log level.
-        limit:  Max number of entries to return (newest first).
+        agent:   Filter by agent name.
+        level:   Filter by log level.
+        limit:   Max number of entries to return (newest first).
+        run_id:  Only entries from this pipeline run; answered from the
+                 run index in time proportional to the run's entries.
 
     Returns:
         List of matching log entries.
+
+    The in-memory ring answers whenever it can fill ``limit`` or holds
+    every match (nothing matching was evicted); only then, with persistence
+    enabled, are the segment files scanned.
     """
-    with _lock:
-        results = list(_logs)
+    filters = {"agent": agent or None, "level": level or None, "run_id": run_id or None}
+    results = _store.query(limit, **filters)
+    if len(results) < limit and _segments is not None and not _ring_complete(filters):
+        results = _segments.query(limit, **filters)
+    return [r.to_dict() for r in results]
 
-    if agent:
-        results = [r for r in results if r["agent"] == agent]
-    if level:
-        results = [r for r in results if r["level"] == level]
 
-    # Newest first
-    results.sort(key=lambda x: x["timestamp"], reverse=True)
-    return results[:limit]
+def _ring_complete(filters: dict[str, Any]) -> bool:
+    """Whether the ring holds every persisted entry matching ``filters``."""
+    if _disk_history:
+        # Segments from an earlier process never passed through this ring, so
+        # only an entry-bearing run key proves it saw everything: an agent or
+        # level key can be live here while older matches exist only on disk
+        return filters["run_id"] is not None and _store.is_complete(run_id=filters["run_id"])
+    return _store.is_complete(**filters)
 
 
 def clear_logs() -> dict[str, Any]:
-    """Clear all stored logs (useful for testing)."""
-    with _lock:
-        count = len(_logs)
-        _logs.clear()
-    return {"cleared": count}
+    """Clear all stored logs (useful for testing), including segment files."""
+    global _disk_history
+    result: dict[str, Any] = {"cleared": _store.clear()}
+    if _segments is not None:
+        result["segments_removed"] = _segments.clear()
+        _disk_history = False
+    return result
+
+
+def get_stats() -> dict[str, Any]:
+    """Return log store occupancy, dropped-entry counters and disk usage."""
+    stats = _store.stats()
+    stats["subscribers"] = len(_tail)
+    stats["persistence"] = _segments.stats() if _segments is not None else None
+    return stats
+
+
+register_stats_provider("logs_mcp", get_stats)
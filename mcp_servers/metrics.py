@@ -0,0 +1,154 @@
+"""
+SYNAPSE-X — MCP Invocation Metrics
+Per-server invocation counts, error counts and latency histograms for the
+MCP registry.
+
+Recording is sharded per thread: each thread only ever mutates its own
+counters, so concurrent builds neither lose increments nor contend on a
+lock, and the hot path is a few integer updates plus a bisect. Shards are
+merged when a snapshot is read, which is also the only place timestamps
+are formatted. A finished thread's counters are folded into a retired
+total so nothing recorded is lost and shard count tracks live threads.
+"""
+
+from __future__ import annotations
+
+import threading
+import time
+import weakref
+from bisect import bisect_left
+from datetime import datetime, timezone
+from typing import Any, Iterable
+
+
+# Upper bounds (seconds) of the latency buckets; a final bucket catches the rest
+_LATENCY_BOUNDS: tuple[float, ...] = (
+    0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0,
+)
+_QUANTILES: tuple[tuple[str, float], ...] = (("p50_ms", 0.50), ("p95_ms", 0.95), ("p99_ms", 0.99))
+
+
+class _Counters:
+    __slots__ = ("invocations", "errors", "last_used", "timed", "latency_sum", "latency_max", "buckets")
+
+    def __init__(self) -> None:
+        self.invocations = 0
+        self.errors = 0
+        self.last_used = 0.0
+        self.timed = 0
+        self.latency_sum = 0.0
+        self.latency_max = 0.0
+        self.buckets = [0] * (len(_LATENCY_BOUNDS) + 1)
+
+    def merge(self, other: _Counters) -> None:
+        self.invocations += other.invocations
+        self.errors += other.errors
+        self.last_used = max(self.last_used, other.last_used)
+        self.timed += other.timed
+        self.latency_sum += other.latency_sum
+        self.latency_max = max(self.latency_max, other.latency_max)
+        for i, n in enumerate(other.buckets):
+            self.buckets[i] += n
+
+
+class _ShardOwner:
+    """Thread-local handle whose collection marks the owning thread as finished."""
+
+    __slots__ = ("shard", "__weakref__")
+
+    def __init__(self, shard: dict[str, _Counters]) -> None:
+        self.shard = shard
+
+
+def _latency_summary(c: _Counters) -> dict[str, Any]:
+    summary: dict[str, Any] = {
+        "count": c.timed,
+        "mean_ms": round(c.latency_sum / c.timed * 1000, 3) if c.timed else None,
+        "max_ms": round(c.latency_max * 1000, 3) if c.timed else None,
+    }
+    # Quantiles are estimated as the upper bound of the bucket they fall in
+    # (the observed maximum for the overflow bucket)
+    for name, q in _QUANTILES:
+        value = None
+        if c.timed:
+            target, seen = q * c.timed, 0
+            for i, n in enumerate(c.buckets):
+                seen += n
+                if seen >= target:
+                    bound = _LATENCY_BOUNDS[i] if i < len(_LATENCY_BOUNDS) else c.latency_max
+                    value = round(min(bound, c.latency_max) * 1000, 3)
+                    break
+        summary[name] = value
+    labels = [f"le_{b * 1000:g}ms" for b in _LATENCY_BOUNDS] + ["overflow"]
+    summary["buckets"] = dict(zip(labels, c.buckets))
+    return summary
+
+
+class InvocationMetrics:
+    """Thread-sharded invocation, error and latency metrics keyed by server id."""
+
+    def __init__(self) -> None:
+        self._local = threading.local()
+        self._lock = threading.Lock()
+        self._shards: list[dict[str, _Counters]] = []
+        self._retired: dict[str, _Counters] = {}
+
+    def _shard(self) -> dict[str, _Counters]:
+        owner = getattr(self._local, "owner", None)
+        if owner is None:
+            shard: dict[str, _Counters] = {}
+            owner = self._local.owner = _ShardOwner(shard)
+            with self._lock:
+                self._shards.append(shard)
+            weakref.finalize(owner, self._retire, shard)
+        return owner.shard
+
+    def _retire(self, shard: dict[str, _Counters]) -> None:
+        """Fold a finished thread's shard into the retired totals."""
+        with self._lock:
+            self._shards.remove(shard)
+            for server_id, counters in shard.items():
+                self._retired.setdefault(server_id, _Counters()).merge(counters)
+
+    def record(self, server_id: str, seconds: float | None = None, error: bool = False) -> None:
+        """Count one invocation, optionally with its latency and outcome."""
+        shard = self._shard()
+        c = shard.get(server_id)
+        if c is None:
+            c = shard[server_id] = _Counters()
+        c.invocations += 1
+        c.last_used = time.time()
+        if error:
+            c.errors += 1
+        if seconds is not None:
+            c.timed += 1
+            c.latency_sum += seconds
+            if seconds > c.latency_max:
+                c.latency_max = seconds
+            c.buckets[bisect_left(_LATENCY_BOUNDS, seconds)] += 1
+
+    def snapshot(self, server_ids: Iterable[str] = ()) -> dict[str, dict[str, Any]]:
+        """
+        Merged counters per server (``server_ids`` are included even if never
+        recorded); timestamps are ISO-8601 (UTC).
+        """
+        merged: dict[str, _Counters] = {server_id: _Counters() for server_id in server_ids}
+        with self._lock:
+            for server_id, counters in self._retired.items():
+                merged.setdefault(server_id, _Counters()).merge(counters)
+            # ``list(dict.items())`` copies without running Python code, so a
+            # shard's owner inserting a new server concurrently cannot break it
+            for shard in self._shards:
+                for server_id, counters in list(shard.items()):
+                    merged.setdefault(server_id, _Counters()).merge(counters)
+        return {
+            server_id: {
+                "invocations": c.invocations,
+                "errors": c.errors,
+                "last_used": (
+                    datetime.fromtimestamp(c.last_used, timezone.utc).isoformat() if c.last_used else None
+                ),
+                "latency": _latency_summary(c),
+            }
+            for server_id, c in merged.items()
+        }
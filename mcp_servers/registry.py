@@ -2,12 +2,19 @@
 SYNAPSE-X — MCP Server Registry
 Central registry of all MCP tool-servers, their connection status,
 capabilities, and activity simulation for demo mode.
+
+Invocation counts, error counts and latency histograms are kept by
+:class:`mcp_servers.metrics.InvocationMetrics` and merged into each
+server's entry when a snapshot is taken.
 """
 
 from __future__ import annotations
 
-from datetime import datetime, timezone
-from typing import Any
+import time
+from contextlib import contextmanager
+from typing import Any, Callable, Iterator
+
+from mcp_servers.metrics import InvocationMetrics
 
 
 # ── Live Registry ────────────────────────────────────────────────────────────
@@ -18,8 +25,6 @@ MCP_SERVERS: dict[str, dict[str, Any]] = {
         "description": "Repository management",
         "capabilities": ["create_repo", "push_code", "list_commits"],
         "icon": "🐙",
-        "invocations": 0,
-        "last_used": None,
     },
     "logs_mcp": {
         "name": "Logs MCP",
@@ -27,8 +32,6 @@ MCP_SERVERS: dict[str, dict[str, Any]] = {
         "description": "Execution observability",
         "capabilities": ["store_log", "get_logs", "clear_logs"],
         "icon": "📊",
-        "invocations": 0,
-        "last_used": None,
     },
     "deployment_mcp": {
         "name": "Deployment MCP",
@@ -36,8 +39,6 @@ MCP_SERVERS: dict[str, dict[str, Any]] = {
         "description": "Infrastructure orchestration",
         "capabilities": ["provision_container", "deploy_service", "health_check"],
         "icon": "🚀",
-        "invocations": 0,
-        "last_used": None,
     },
     "healing_mcp": {
         "name": "Healing MCP",
@@ -45,22 +46,54 @@ MCP_SERVERS: dict[str, dict[str, Any]] = {
         "description": "Code audit & vulnerability patching",
         "capabilities": ["audit_code", "apply_patch", "report_vulnerabilities"],
         "icon": "🩺",
-        "invocations": 0,
-        "last_used": None,
     },
 }
 
 
+# Servers that expose live internal stats (e.g. log store occupancy)
+_STATS_PROVIDERS: dict[str, Callable[[], dict[str, Any]]] = {}
+
+
+def register_stats_provider(server_id: str, provider: Callable[[], dict[str, Any]]) -> None:
+    """Attach a callable whose result is reported under ``stats`` for a server."""
+    _STATS_PROVIDERS[server_id] = provider
+
+
+_METRICS = InvocationMetrics()
+
+
 def record_invocation(server_id: str) -> None:
-    """Increment invocation count and update timestamp for an MCP server."""
+    """Count an (untimed) invocation of an MCP server."""
     if server_id in MCP_SERVERS:
-        MCP_SERVERS[server_id]["invocations"] += 1
-        MCP_SERVERS[server_id]["last_used"] = datetime.now(timezone.utc).isoformat()
+        _METRICS.record(server_id)
+
+
+@contextmanager
+def timed_invocation(server_id: str) -> Iterator[None]:
+    """
+    Count an invocation of an MCP server and record how long the ``with``
+    body took. An exception is counted as an error and re-raised.
+    """
+    if server_id not in MCP_SERVERS:
+        yield
+        return
+    start = time.perf_counter()
+    try:
+        yield
+    except BaseException:
+        _METRICS.record(server_id, time.perf_counter() - start, error=True)
+        raise
+    _METRICS.record(server_id, time.perf_counter() - start)
 
 
 def get_registry_snapshot() -> dict[str, dict[str, Any]]:
     """Return a point-in-time snapshot of all MCP server statuses."""
-    return {k: dict(v) for k, v in MCP_SERVERS.items()}
+    metrics = _METRICS.snapshot(MCP_SERVERS)
+    snapshot = {k: {**v, **metrics[k]} for k, v in MCP_SERVERS.items()}
+    for server_id, provider in _STATS_PROVIDERS.items():
+        if server_id in snapshot:
+            snapshot[server_id]["stats"] = provider()
+    return snapshot
 
 
 # ── Demo / Simulation Mode ──────────────────────────────────────────────────
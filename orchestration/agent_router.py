@@ -1,178 +1,517 @@
 """
 SYNAPSE-X — Orchestration Router
 Central pipeline that coordinates the full agent execution flow:
-  Parent → Dev → DevOps → Doctor → Logs → Unified JSON Response
+  Parent → {Dev, DevOps} → Doctor → GitHub Push → Unified JSON Response
   With full MCP tool-call visibility at every stage.
+
+The pipeline is async-native: LLM-backed agents are awaited so a slow Gemini
+call never stalls the control plane's event loop. Stages are scheduled as a
+DAG, so the Dev and DevOps agents run concurrently on the worker pool.
+Concurrent requests for the same (normalised) prompt share one run.
 """
 
 from __future__ import annotations
 
+import asyncio
+import concurrent.futures
+import copy
+import hashlib
+import threading
+import time
+import uuid
 from datetime import datetime, timezone
-from typing import Any
+from typing import Any, Callable
 
-from agents import parent_agent, dev_agent, devops_agent, doctor_agent
+from agents import parent_agent, dev_agent, devops_agent, doctor_agent, llm_client
 from mcp_servers import github_mcp, logs_mcp
-from mcp_servers.registry import record_invocation, simulate_mcp_activity
+from mcp_servers.metrics import InvocationMetrics
+from mcp_servers.registry import record_invocation, simulate_mcp_activity, timed_invocation
+from orchestration.scheduler import Stage, run_stages
 
 
-def run_pipeline(prompt: str) -> dict[str, Any]:
-    """
-    Execute the full SYNAPSE-X orchestration pipeline.
+# Pipeline stage name → key in the unified response's ``stages`` block
+STAGE_KEYS: dict[str, str] = {
+    "parent": "1_parent_analysis",
+    "dev": "2_dev_agent",
+    "devops": "3_devops_agent",
+    "doctor": "4_doctor_healing",
+    "github": "5_github_push",
+}
 
-    Flow:
-        1. Parent agent analyses the prompt
-        2. Dev agent generates backend code
-        3. DevOps agent generates deployment artifacts
-        4. Doctor agent audits and heals
-        5. Results pushed to mock GitHub
-        6. Everything logged via Logs MCP
-        7. MCP activity tracked across all stages
+PipelineEventHandler = Callable[[str, dict[str, Any]], None]
 
-    Args:
-        prompt: The user's natural-language build request.
+# Wall-clock time of each completed stage (agent work plus the MCP calls it
+# makes), kept apart from the per-MCP-server latencies in the registry
+_STAGE_METRICS = InvocationMetrics()
 
-    Returns:
-        Unified JSON response with all pipeline stage outputs + mcp_activity.
+
+def stage_stats() -> dict[str, dict[str, Any]]:
+    """Completed-stage counts and latency histograms, per pipeline stage."""
+    return _STAGE_METRICS.snapshot(STAGE_KEYS)
+
+
+def _devops_files(devops_result: dict[str, Any]) -> dict[str, str]:
+    """Repository paths of the DevOps agent's artifacts (empty if skipped)."""
+    if devops_result.get("skipped"):
+        return {}
+    return {
+        "Dockerfile": devops_result.get("dockerfile", ""),
+        "deploy.sh": devops_result.get("deployment_script", ""),
+        devops_result.get("ci_config_path", ".github/workflows/ci.yml"): devops_result.get("ci_config", ""),
+    }
+
+
+def _artifacts_only_report() -> dict[str, Any]:
+    """Doctor result for a build without service code (only artifacts audited)."""
+    return {
+        "agent": "doctor_agent",
+        "service_code_skipped": True,
+        "issues_detected": [],
+        "healed_code": "",
+        "healing_diff": "",
+        "improvement_summary": [],
+        "stats": {"issues_found": 0, "issues_healed": 0, "advisory_only": 0},
+        "status": {"success": True, "timestamp": datetime.now(timezone.utc).isoformat()},
+    }
+
+
+def _repo_name(prompt: str) -> str:
     """
-    pipeline_start = datetime.now(timezone.utc)
-    mcp_activity: list[str] = []
+    Repository for ``prompt``: a readable slug from its second word plus a
+    hash of the normalised prompt, so re-running a prompt reuses its
+    repository's history while unrelated prompts never share one.
+    """
+    words = prompt.split()
+    slug = "".join(c for c in words[1] if c.isalnum() or c == "-").lower() if len(words) > 1 else ""
+    digest = hashlib.sha1(parent_agent.normalize_prompt(prompt).encode("utf-8")).hexdigest()[:8]
+    return f"{slug or 'synapse-project'}-{digest}"
 
-    # ── Stage 1: Parent Agent ────────────────────────────────────────────
-    record_invocation("logs_mcp")
-    logs_mcp.store_log("parent_agent", "pipeline_start", {"prompt": prompt})
-    logs_mcp.store_log("logs_mcp", "mcp_tool_call", {
-        "mcp_tool": "Logs MCP", "action": "Pipeline telemetry initialized",
-    })
-    mcp_activity.append("📊 Logs MCP: Pipeline telemetry initialized")
 
-    parent_result = parent_agent.analyze(prompt)
+class _PipelineRun:
+    """Per-build state shared by the pipeline stages."""
 
-    record_invocation("logs_mcp")
-    logs_mcp.store_log("parent_agent", "analysis_complete", {
-        "categories": parent_result.get("categories"),
-        "task_count": len(parent_result.get("task_graph", [])),
-    })
-    logs_mcp.store_log("logs_mcp", "mcp_tool_call", {
-        "mcp_tool": "Logs MCP", "action": "Parent Agent analysis stored",
-    })
-    mcp_activity.append("📊 Logs MCP: Parent Agent analysis stored")
+    def __init__(self, prompt: str, on_event: PipelineEventHandler | None = None) -> None:
+        self.prompt = prompt
+        self.run_id = uuid.uuid4().hex[:12]
+        self.mcp_activity: list[str] = []
+        self._on_event = on_event
+        self._loop = asyncio.get_running_loop()
+        self._loop_thread = threading.get_ident()
+        self._log_lock = threading.Lock()
+        self._pending_logs: list[dict[str, Any]] = []
+        self._logs_closed = False
+
+    def log(self, agent: str, event: str, data: Any = None, level: str = "info") -> None:
+        """
+        Buffer a Logs MCP entry, tagged with this run's ID, for :meth:`flush_logs`.
+
+        After :meth:`close_logs` (e.g. a stage thread still finishing after
+        the run failed) entries are written straight away.
+        """
+        entry = {
+            "agent": agent,
+            "event": event,
+            "data": data,
+            "level": level,
+            "created": time.time(),
+            "run_id": self.run_id,
+        }
+        with self._log_lock:
+            self._pending_logs.append(entry)
+            closed = self._logs_closed
+        if closed:
+            self.flush_logs()
+
+    def flush_logs(self) -> None:
+        """Write buffered log entries with a single ``store_logs_batch`` call."""
+        with self._log_lock:
+            pending, self._pending_logs = self._pending_logs, []
+        if pending:
+            with timed_invocation("logs_mcp"):
+                logs_mcp.store_logs_batch(pending)
+
+    def close_logs(self) -> None:
+        """Flush what is buffered and stop buffering."""
+        with self._log_lock:
+            self._logs_closed = True
+        self.flush_logs()
+
+    def emit(self, kind: str, payload: dict[str, Any]) -> None:
+        """
+        Deliver a pipeline event to the subscriber on the pipeline's loop.
+
+        Events raised on stage worker threads are marshalled back with
+        ``call_soon_threadsafe``, which keeps them ordered ahead of the
+        stage's own completion.
+        """
+        if self._on_event is None:
+            return
+        if threading.get_ident() == self._loop_thread:
+            self._on_event(kind, payload)
+        else:
+            self._loop.call_soon_threadsafe(self._on_event, kind, payload)
+
+    def activity(self, message: str) -> None:
+        """Record an MCP activity line and publish it as an event."""
+        self.mcp_activity.append(message)
+        self.emit("mcp_activity", {"message": message})
+
+    def stage_complete(self, name: str, result: Any, timing: dict[str, float]) -> None:
+        """Scheduler hook — record its latency, flush the stage's logs and publish its output."""
+        _STAGE_METRICS.record(name, timing["duration_seconds"])
+        self.flush_logs()
+        self.emit("stage", {"stage": STAGE_KEYS[name], "result": result, "timing": timing})
+
+    def stages(self) -> list[Stage]:
+        """The pipeline DAG: Parent → {Dev, DevOps} → Doctor → Git push."""
+        return [
+            Stage("parent", self.parent),
+            Stage("dev", self.dev, after=("parent",)),
+            Stage("devops", self.devops, after=("parent",)),
+            Stage("doctor", self.doctor, after=("dev", "devops")),
+            Stage("github", self.github, after=("doctor",)),
+        ]
 
-    task_graph = parent_result.get("task_graph", [])
-    spawning_plan = parent_result.get("spawning_plan", {})
+    # ── Stage 1: Parent Agent ────────────────────────────────────────────
+    async def parent(self, results: dict[str, Any]) -> dict[str, Any]:
+        self.log("parent_agent", "pipeline_start", {"prompt": self.prompt})
+        self.log("logs_mcp", "mcp_tool_call", {
+            "mcp_tool": "Logs MCP", "action": "Pipeline telemetry initialized",
+        })
+        self.activity("📊 Logs MCP: Pipeline telemetry initialized")
+
+        parent_result = await parent_agent.analyze_async(self.prompt)
+
+        self.log("parent_agent", "analysis_complete", {
+            "categories": parent_result.get("categories"),
+            "task_count": len(parent_result.get("task_graph", [])),
+        })
+        self.log("logs_mcp", "mcp_tool_call", {
+            "mcp_tool": "Logs MCP", "action": "Parent Agent analysis stored",
+        })
+        self.activity("📊 Logs MCP: Parent Agent analysis stored")
+        return parent_result
 
     # ── Stage 2: Developer Agent ─────────────────────────────────────────
-    dev_result: dict[str, Any] = {"agent": "dev_agent", "skipped": True}
-    if spawning_plan.get("dev_agent", True):
-        record_invocation("logs_mcp")
-        logs_mcp.store_log("dev_agent", "spawned")
-        dev_result = dev_agent.generate(prompt, task_graph)
-        logs_mcp.store_log("dev_agent", "generation_complete", {
+    def dev(self, results: dict[str, Any]) -> dict[str, Any]:
+        parent_result = results["parent"]
+        if not parent_result.get("spawning_plan", {}).get("dev_agent", True):
+            return {"agent": "dev_agent", "skipped": True}
+
+        self.log("dev_agent", "spawned")
+        dev_result = dev_agent.generate(self.prompt, parent_result.get("task_graph", []))
+        self.log("dev_agent", "generation_complete", {
             "endpoints": dev_result["status"]["endpoints_created"],
         })
-        logs_mcp.store_log("logs_mcp", "mcp_tool_call", {
+        self.log("logs_mcp", "mcp_tool_call", {
             "mcp_tool": "Logs MCP", "action": "Dev Agent execution trace stored",
         })
-        mcp_activity.append("📊 Logs MCP: Dev Agent execution trace stored")
+        self.activity("📊 Logs MCP: Dev Agent execution trace stored")
+        return dev_result
 
     # ── Stage 3: DevOps Agent ────────────────────────────────────────────
-    devops_result: dict[str, Any] = {"agent": "devops_agent", "skipped": True}
-    if spawning_plan.get("devops_agent", True):
-        record_invocation("logs_mcp")
-        logs_mcp.store_log("devops_agent", "spawned")
-        devops_result = devops_agent.generate(prompt, task_graph)
-        logs_mcp.store_log("devops_agent", "generation_complete", {
+    def devops(self, results: dict[str, Any]) -> dict[str, Any]:
+        parent_result = results["parent"]
+        if not parent_result.get("spawning_plan", {}).get("devops_agent", True):
+            return {"agent": "devops_agent", "skipped": True}
+
+        self.log("devops_agent", "spawned")
+        devops_result = devops_agent.generate(self.prompt, parent_result.get("task_graph", []))
+        self.log("devops_agent", "generation_complete", {
             "files": devops_result["status"]["files_generated"],
         })
 
-        # Deployment MCP invocation
+        # Deployment MCP invocation (simulated: counted, nothing to time)
         record_invocation("deployment_mcp")
-        logs_mcp.store_log("deployment_mcp", "mcp_tool_call", {
+        self.log("deployment_mcp", "mcp_tool_call", {
             "mcp_tool": "Deployment MCP",
             "action": "Infrastructure provisioned (Dockerfile + CI/CD)",
         })
-        mcp_activity.append("🚀 Deployment MCP: Infrastructure provisioned")
-        mcp_activity.append("📊 Logs MCP: DevOps Agent execution trace stored")
+        self.activity("🚀 Deployment MCP: Infrastructure provisioned")
+        self.activity("📊 Logs MCP: DevOps Agent execution trace stored")
+        return devops_result
 
     # ── Stage 4: Doctor Agent ────────────────────────────────────────────
-    doctor_result: dict[str, Any] = {"agent": "doctor_agent", "skipped": True}
-    if spawning_plan.get("doctor_agent", True) and not dev_result.get("skipped"):
-        record_invocation("logs_mcp")
-        record_invocation("healing_mcp")
-        logs_mcp.store_log("doctor_agent", "audit_start")
-        doctor_result = doctor_agent.audit_and_heal(dev_result)
-        logs_mcp.store_log("doctor_agent", "healing_complete", {
+    async def doctor(self, results: dict[str, Any]) -> dict[str, Any]:
+        dev_result = results["dev"]
+        spawning_plan = results["parent"].get("spawning_plan", {})
+        artifacts = _devops_files(results["devops"])
+        audit_service = not dev_result.get("skipped")
+        if not spawning_plan.get("doctor_agent", True) or not (audit_service or artifacts):
+            return {"agent": "doctor_agent", "skipped": True}
+
+        self.log("doctor_agent", "audit_start", {"service_code": audit_service, "artifacts": list(artifacts)})
+        # DevOps artifacts are scanned on the Doctor's pool while the service
+        # code is audited (and optionally LLM-critiqued); a deployment-only
+        # build still has its artifacts audited before they are pushed
+        audits = []
+        if audit_service:
+            audits.append(doctor_agent.audit_and_heal_async(dev_result))
+        if artifacts:
+            audits.append(doctor_agent.audit_artifacts_async(artifacts))
+        with timed_invocation("healing_mcp"):
+            outcomes = await asyncio.gather(*audits)
+        doctor_result = outcomes[0] if audit_service else _artifacts_only_report()
+        if artifacts:
+            doctor_result["artifact_audit"] = outcomes[-1]
+        self.log("doctor_agent", "healing_complete", {
             "issues_found": doctor_result["stats"]["issues_found"],
             "issues_healed": doctor_result["stats"]["issues_healed"],
+            "artifact_issues": {
+                name: audit.get("stats", {}).get("issues_found", 0)
+                for name, audit in doctor_result.get("artifact_audit", {}).get("artifacts", {}).items()
+            },
         })
 
         # Healing MCP tool call log
-        logs_mcp.store_log("healing_mcp", "mcp_tool_call", {
+        self.log("healing_mcp", "mcp_tool_call", {
             "mcp_tool": "Healing MCP",
             "action": "Code vulnerabilities patched",
             "issues_healed": doctor_result["stats"]["issues_healed"],
         })
-        mcp_activity.append(
+        self.activity(
             f"🩺 Healing MCP: {doctor_result['stats']['issues_healed']} vulnerabilities patched"
         )
-        mcp_activity.append("📊 Logs MCP: Doctor Agent healing trace stored")
+        self.activity("📊 Logs MCP: Doctor Agent healing trace stored")
+        return doctor_result
 
     # ── Stage 5: Mock GitHub Push ────────────────────────────────────────
-    repo_name = prompt.split()[1] if len(prompt.split()) > 1 else "synapse-project"
-    repo_name = "".join(c for c in repo_name if c.isalnum() or c == "-").lower() or "synapse-project"
+    def github(self, results: dict[str, Any]) -> dict[str, Any]:
+        prompt = self.prompt
+        dev_result, devops_result = results["dev"], results["devops"]
+        doctor_result = results["doctor"]
 
-    record_invocation("git_mcp")
-    github_result = github_mcp.create_repo(repo_name, f"Generated from: {prompt[:80]}")
-    logs_mcp.store_log("git_mcp", "mcp_tool_call", {
-        "mcp_tool": "Git MCP", "action": "Repository created",
-    })
-    mcp_activity.append(f"🐙 Git MCP: Repository created → synapse-x-org/{repo_name}")
-
-    push_files: dict[str, str] = {}
-    if not dev_result.get("skipped"):
-        code_to_push = doctor_result.get("healed_code") or dev_result.get("service_code", "")
-        push_files["main.py"] = code_to_push
-    if not devops_result.get("skipped"):
-        push_files["Dockerfile"] = devops_result.get("dockerfile", "")
-        push_files["deploy.sh"] = devops_result.get("deployment_script", "")
-        push_files[".github/workflows/ci.yml"] = devops_result.get("ci_config", "")
-
-    record_invocation("git_mcp")
-    push_result = github_mcp.push_code(repo_name, push_files, "feat: initial scaffold by SYNAPSE-X")
-    logs_mcp.store_log("git_mcp", "mcp_tool_call", {
-        "mcp_tool": "Git MCP",
-        "action": f"Code pushed — commit {push_result['commit']['sha']}",
-    })
-    mcp_activity.append(f"🐙 Git MCP: Code pushed — {push_result['commit']['sha']}")
+        repo_name = _repo_name(prompt)
+
+        with timed_invocation("git_mcp"):
+            github_result = github_mcp.create_repo(repo_name, f"Generated from: {prompt[:80]}")
+        created = github_result["status"] == "created"
+        repo_action = "Repository created" if created else "Repository reused"
+        self.log("git_mcp", "mcp_tool_call", {
+            "mcp_tool": "Git MCP", "action": repo_action,
+        })
+        self.activity(f"🐙 Git MCP: {repo_action} → synapse-x-org/{repo_name}")
+
+        push_files: dict[str, str] = {}
+        if not dev_result.get("skipped"):
+            code_to_push = doctor_result.get("healed_code") or dev_result.get("service_code", "")
+            push_files["main.py"] = code_to_push
+        push_files.update(_devops_files(devops_result))
+
+        message = "feat: initial scaffold by SYNAPSE-X" if created else "feat: regenerate scaffold by SYNAPSE-X"
+        with timed_invocation("git_mcp"):
+            # A full snapshot: files this build did not produce are deleted
+            push_result = github_mcp.push_code(repo_name, push_files, message, replace=True)
+        head = push_result["commit"]
+        if push_result["status"] == "up_to_date":
+            action = f"No changes — push skipped, HEAD {head['sha'] if head else 'empty'}"
+        else:
+            action = f"Code pushed — commit {head['sha']} ({len(head['files_changed'])} files changed)"
+        self.log("git_mcp", "mcp_tool_call", {"mcp_tool": "Git MCP", "action": action})
+        self.activity(f"🐙 Git MCP: {action}")
+        return {"repo": github_result, "push": push_result}
+
+
+def run_pipeline(prompt: str) -> dict[str, Any]:
+    """
+    Blocking wrapper around :func:`run_pipeline_async`.
+
+    Intended for scripts and worker threads; must not be called from a
+    thread that is already running an event loop. The LLM client bound to
+    the temporary loop is closed before the loop is.
+    """
+    async def run_and_close() -> dict[str, Any]:
+        try:
+            return await run_pipeline_async(prompt)
+        finally:
+            await llm_client.aclose()
+
+    return asyncio.run(run_and_close())
+
+
+# ── Single-flight coalescing ─────────────────────────────────────────────────
+# Normalised prompt → the run currently building it. Callers may sit on
+# different event loops (job-queue workers, ``run_pipeline`` threads), so a
+# thread-safe ``concurrent.futures.Future`` carries the result. Each run
+# counts the callers waiting on it and is cancelled once none are left.
+
+
+class _Flight:
+    """A shared build in flight and the number of callers waiting on it."""
+
+    __slots__ = ("future", "waiters", "task")
+
+    def __init__(self) -> None:
+        self.future: concurrent.futures.Future = concurrent.futures.Future()
+        self.waiters = 1
+        self.task: asyncio.Task | None = None
+
+
+_inflight_lock = threading.Lock()
+_inflight: dict[str, _Flight] = {}
+_coalesced = 0
+# Strong references to detached shared builds until they finish
+_lead_tasks: set[asyncio.Task] = set()
+
+
+def coalescing_stats() -> dict[str, int]:
+    """Runs in flight and requests that were served by another request's run."""
+    with _inflight_lock:
+        return {"in_flight_runs": len(_inflight), "coalesced_requests": _coalesced}
+
+
+async def run_pipeline_async(
+    prompt: str,
+    on_event: PipelineEventHandler | None = None,
+) -> dict[str, Any]:
+    """
+    Execute the full SYNAPSE-X orchestration pipeline.
+
+    A request whose normalised prompt matches a run already in flight waits
+    for that run and receives a copy of its result (``coalesced: true``)
+    instead of starting a duplicate. Streaming callers (``on_event`` set)
+    always get a dedicated run, since the events are theirs alone.
+    Cancelling a caller cancels the shared run only when no other caller
+    is still waiting on it.
+
+    Flow:
+        1. Parent agent analyses the prompt
+        2. Dev agent generates backend code
+        3. DevOps agent generates deployment artifacts (concurrently with 2)
+        4. Doctor agent audits and heals
+        5. Results pushed to mock GitHub
+        6. Everything logged via Logs MCP
+        7. MCP activity tracked across all stages
+
+    Args:
+        prompt:   The user's natural-language build request.
+        on_event: Optional ``(kind, payload)`` callback, invoked on the
+                  calling event loop with a ``stage`` event as each stage
+                  finishes and an ``mcp_activity`` event per MCP activity line.
+
+    Returns:
+        Unified JSON response with the run's ``run_id``, all pipeline stage
+        outputs, per-stage timings, mcp_activity and this run's logs.
+    """
+    global _coalesced
+    if on_event is not None:
+        return await _execute(prompt, on_event)
+
+    key = parent_agent.normalize_prompt(prompt)
+    with _inflight_lock:
+        flight = _inflight.get(key)
+        leader = flight is None
+        if leader:
+            flight = _inflight[key] = _Flight()
+            # The shared build runs in its own task, so cancelling the request
+            # that started it does not fail the requests waiting on it
+            task = flight.task = asyncio.get_running_loop().create_task(_lead(key, prompt, flight))
+            _lead_tasks.add(task)
+            task.add_done_callback(_lead_tasks.discard)
+        else:
+            flight.waiters += 1
+            _coalesced += 1
+
+    try:
+        # shield: a cancelled caller must not cancel the run others wait on
+        result = await asyncio.shield(asyncio.wrap_future(flight.future))
+    finally:
+        _release(key, flight)
+    if leader:
+        return result
+    follower = copy.deepcopy(result)
+    follower["prompt"] = prompt
+    follower["coalesced"] = True
+    return follower
+
+
+def _release(key: str, flight: _Flight) -> None:
+    """Drop one waiter from ``flight``; cancel the build if it was the last."""
+    with _inflight_lock:
+        flight.waiters -= 1
+        if flight.waiters or flight.future.done():
+            return
+        # Unpublish first so a new request starts a fresh run instead of
+        # joining the one being cancelled
+        if _inflight.get(key) is flight:
+            del _inflight[key]
+    task = flight.task
+    if task is not None and not task.done():
+        task.get_loop().call_soon_threadsafe(task.cancel)
+
+
+async def _lead(key: str, prompt: str, flight: _Flight) -> None:
+    """Run the shared build for ``key`` and settle the future its callers wait on."""
+    try:
+        result = await _execute(prompt, None)
+    except BaseException as exc:
+        _unpublish(key, flight)
+        with _inflight_lock:
+            abandoned = not flight.waiters
+        if abandoned:
+            # Cancelled by _release: nobody is left to read an exception
+            flight.future.cancel()
+        else:
+            flight.future.set_exception(
+                exc if isinstance(exc, Exception) else RuntimeError("coalesced build was cancelled")
+            )
+        if not isinstance(exc, Exception):
+            raise
+        return
+    _unpublish(key, flight)
+    flight.future.set_result(result)
+
+
+def _unpublish(key: str, flight: _Flight) -> None:
+    """Remove ``flight`` from the in-flight table unless it was already replaced."""
+    with _inflight_lock:
+        if _inflight.get(key) is flight:
+            del _inflight[key]
+
+
+async def _execute(prompt: str, on_event: PipelineEventHandler | None) -> dict[str, Any]:
+    """Run every pipeline stage for ``prompt`` and build the unified response."""
+    pipeline_start = datetime.now(timezone.utc)
+    run = _PipelineRun(prompt, on_event)
+    try:
+        results, timings = await run_stages(run.stages(), on_complete=run.stage_complete)
+    except BaseException as exc:
+        # The failing stage's entries, and those of stages running beside
+        # it, are exactly the trace a failed build needs
+        run.log("orchestrator", "pipeline_failed", {"error": f"{type(exc).__name__}: {exc}"}, level="error")
+        run.close_logs()
+        raise
+    mcp_activity = run.mcp_activity
+    parent_result = results["parent"]
 
     # ── Stage 6: Final log ───────────────────────────────────────────────
     pipeline_end = datetime.now(timezone.utc)
     duration = (pipeline_end - pipeline_start).total_seconds()
-    record_invocation("logs_mcp")
-    logs_mcp.store_log("orchestrator", "pipeline_complete", {"duration_seconds": duration})
-    logs_mcp.store_log("logs_mcp", "mcp_tool_call", {
+    run.log("orchestrator", "pipeline_complete", {
+        "duration_seconds": duration,
+        "stage_timings": timings,
+    })
+    run.log("logs_mcp", "mcp_tool_call", {
         "mcp_tool": "Logs MCP",
         "action": f"Full execution trace stored ({len(mcp_activity)} MCP invocations)",
     })
-    mcp_activity.append(f"📊 Logs MCP: Full execution trace stored ({len(mcp_activity)} events)")
+    run.close_logs()
+    run.activity(f"📊 Logs MCP: Full execution trace stored ({len(mcp_activity)} events)")
+    with timed_invocation("logs_mcp"):
+        run_logs = logs_mcp.get_logs(run_id=run.run_id, limit=30)
 
     # ── Unified Response ─────────────────────────────────────────────────
     return {
         "pipeline": "SYNAPSE-X Orchestration Pipeline",
+        "run_id": run.run_id,
         "prompt": prompt,
+        "coalesced": False,
         "duration_seconds": round(duration, 3),
-        "stages": {
-            "1_parent_analysis": parent_result,
-            "2_dev_agent": dev_result,
-            "3_devops_agent": devops_result,
-            "4_doctor_healing": doctor_result,
-            "5_github_push": {
-                "repo": github_result,
-                "push": push_result,
-            },
-        },
+        "stages": {key: results[name] for name, key in STAGE_KEYS.items()},
+        "stage_timings": timings,
         "mcp_activity": mcp_activity,
         "mcp_simulation": simulate_mcp_activity(),
-        "logs": logs_mcp.get_logs(limit=30),
+        "logs": run_logs,
         "metadata": {
             "completed_at": pipeline_end.isoformat(),
             "engine": parent_result.get("metadata", {}).get("engine", "unknown"),
@@ -0,0 +1,104 @@
+"""
+SYNAPSE-X — Batch Builds
+Runs many prompts through the pipeline at once under a parallelism limit
+and reduces each unified response to a compact summary, so bulk scaffold
+generation does not pay per-request overhead or ship every run's logs.
+Results can be collected in prompt order or consumed as they finish.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import time
+from typing import Any, AsyncIterator, Sequence
+
+from agents import parent_agent
+from orchestration.agent_router import run_pipeline_async
+
+
+def compact_result(index: int, prompt: str, result: dict[str, Any]) -> dict[str, Any]:
+    """The fields of a unified pipeline response worth returning in bulk."""
+    stages = result.get("stages", {})
+    doctor = stages.get("4_doctor_healing", {})
+    push = stages.get("5_github_push", {}).get("push", {})
+    return {
+        "index": index,
+        "prompt": prompt,
+        "status": "succeeded",
+        "run_id": result.get("run_id"),
+        "coalesced": result.get("coalesced", False),
+        "duration_seconds": result.get("duration_seconds"),
+        "engine": result.get("metadata", {}).get("engine"),
+        "categories": stages.get("1_parent_analysis", {}).get("categories", []),
+        "issues_found": doctor.get("stats", {}).get("issues_found", 0),
+        "issues_healed": doctor.get("stats", {}).get("issues_healed", 0),
+        "commit": (push.get("commit") or {}).get("sha"),
+        "push_status": push.get("status"),
+        "repo_url": push.get("repo_url"),
+    }
+
+
+async def _run_group(
+    indices: Sequence[int], prompts: Sequence[str], limit: asyncio.Semaphore
+) -> list[dict[str, Any]]:
+    """Build one run for prompts that normalise alike and report it for each index."""
+    first = indices[0]
+    async with limit:
+        try:
+            result = await run_pipeline_async(prompts[first])
+        except Exception as exc:
+            return [
+                {"index": i, "prompt": prompts[i], "status": "failed", "error": str(exc)}
+                for i in indices
+            ]
+    entries = [compact_result(first, prompts[first], result)]
+    for i in indices[1:]:
+        entry = compact_result(i, prompts[i], result)
+        entry["coalesced"] = True
+        entries.append(entry)
+    return entries
+
+
+async def iter_batch(prompts: Sequence[str], concurrency: int) -> AsyncIterator[dict[str, Any]]:
+    """
+    Yield compact results in completion order.
+
+    Prompts that normalise to the same text are grouped up front and built
+    once; every index in the group gets an entry, the duplicates marked
+    ``coalesced``. At most ``concurrency`` pipelines run at once. A failed
+    prompt yields a ``failed`` entry instead of aborting the batch. Closing
+    the iterator early cancels the builds that have not finished, except
+    those another request outside the batch is still waiting on.
+    """
+    groups: dict[str, list[int]] = {}
+    for i, prompt in enumerate(prompts):
+        groups.setdefault(parent_agent.normalize_prompt(prompt), []).append(i)
+    limit = asyncio.Semaphore(max(1, concurrency))
+    tasks = [asyncio.create_task(_run_group(indices, prompts, limit)) for indices in groups.values()]
+    try:
+        for next_done in asyncio.as_completed(tasks):
+            for entry in await next_done:
+                yield entry
+    finally:
+        for task in tasks:
+            task.cancel()
+
+
+def summarize(results: Sequence[dict[str, Any]], concurrency: int, started: float) -> dict[str, Any]:
+    """Totals for a finished batch; ``started`` is a ``time.perf_counter()`` value."""
+    succeeded = sum(1 for r in results if r["status"] == "succeeded")
+    return {
+        "total": len(results),
+        "succeeded": succeeded,
+        "failed": len(results) - succeeded,
+        "concurrency": concurrency,
+        "duration_seconds": round(time.perf_counter() - started, 3),
+    }
+
+
+async def run_batch(prompts: Sequence[str], concurrency: int) -> dict[str, Any]:
+    """Run every prompt and return compact results in prompt order plus a summary."""
+    started = time.perf_counter()
+    results = [r async for r in iter_batch(prompts, concurrency)]
+    results.sort(key=lambda r: r["index"])
+    return {"results": results, "summary": summarize(results, concurrency, started)}
@@ -0,0 +1,149 @@
+"""
+SYNAPSE-X — Build Job Queue
+Background execution of pipeline runs: submissions get a job ID straight
+away, a fixed pool of async workers drains a bounded queue, and callers
+poll for status and result. A full queue is reported to the caller so the
+API can apply back-pressure instead of piling up connections.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import uuid
+from collections import OrderedDict
+from datetime import datetime, timezone
+from typing import Any
+
+from orchestration.agent_router import run_pipeline_async
+
+
+class QueueFullError(Exception):
+    """Raised when a job is submitted while the queue is at capacity."""
+
+
+class BuildJobQueue:
+    """
+    Bounded FIFO of build jobs processed by ``workers`` concurrent workers.
+
+    Args:
+        workers:       Number of pipelines allowed to run at the same time.
+        max_queue:     Jobs allowed to wait for a worker before submissions
+                       are rejected with :class:`QueueFullError`.
+        max_finished:  Completed jobs kept around for polling; the oldest
+                       finished jobs are forgotten first.
+    """
+
+    def __init__(self, workers: int = 4, max_queue: int = 64, max_finished: int = 256) -> None:
+        self.workers = workers
+        self.max_queue = max_queue
+        self.max_finished = max_finished
+        self._jobs: OrderedDict[str, dict[str, Any]] = OrderedDict()
+        self._queue: asyncio.Queue[str] | None = None
+        self._tasks: list[asyncio.Task[None]] = []
+
+    # ── Lifecycle ────────────────────────────────────────────────────────
+    def _ensure_started(self) -> None:
+        """Spawn the worker tasks on the running loop on first use."""
+        if self._tasks:
+            return
+        self._queue = asyncio.Queue(maxsize=self.max_queue)
+        self._tasks = [
+            asyncio.create_task(self._worker(), name=f"synapse-build-worker-{i}")
+            for i in range(self.workers)
+        ]
+
+    async def stop(self) -> None:
+        """
+        Cancel all workers. Running jobs are cancelled and marked ``failed``
+        (their shared build stops unless another caller still waits on it);
+        queued jobs are left in ``queued`` state.
+        """
+        for task in self._tasks:
+            task.cancel()
+        await asyncio.gather(*self._tasks, return_exceptions=True)
+        self._tasks = []
+        self._queue = None
+
+    async def _worker(self) -> None:
+        assert self._queue is not None
+        while True:
+            job_id = await self._queue.get()
+            job = self._jobs.get(job_id)
+            try:
+                if job is None:
+                    continue
+                job["status"] = "running"
+                job["started_at"] = datetime.now(timezone.utc).isoformat()
+                try:
+                    job["result"] = await run_pipeline_async(job["prompt"])
+                    job["status"] = "succeeded"
+                except Exception as exc:
+                    job["error"] = str(exc)
+                    job["status"] = "failed"
+                except asyncio.CancelledError:
+                    # Queue stopped mid-build; the run is cancelled with us
+                    job["error"] = "build cancelled"
+                    job["status"] = "failed"
+                    job["finished_at"] = datetime.now(timezone.utc).isoformat()
+                    raise
+                job["finished_at"] = datetime.now(timezone.utc).isoformat()
+                self._evict_finished()
+            finally:
+                self._queue.task_done()
+
+    def _evict_finished(self) -> None:
+        """Drop the oldest finished jobs beyond ``max_finished``."""
+        finished = [j for j, job in self._jobs.items() if job["status"] in ("succeeded", "failed")]
+        for job_id in finished[: max(0, len(finished) - self.max_finished)]:
+            del self._jobs[job_id]
+
+    # ── Public API ───────────────────────────────────────────────────────
+    def submit(self, prompt: str) -> dict[str, Any]:
+        """
+        Enqueue a pipeline run for ``prompt``.
+
+        Must be called from the event loop that owns the workers.
+
+        Returns:
+            A status snapshot of the new job (see :meth:`get`).
+
+        Raises:
+            QueueFullError: if ``max_queue`` jobs are already waiting.
+        """
+        self._ensure_started()
+        assert self._queue is not None
+        job_id = uuid.uuid4().hex
+        try:
+            self._queue.put_nowait(job_id)
+        except asyncio.QueueFull:
+            raise QueueFullError(
+                f"Build queue is full ({self.max_queue} jobs waiting)"
+            ) from None
+        self._jobs[job_id] = {
+            "job_id": job_id,
+            "status": "queued",
+            "prompt": prompt,
+            "submitted_at": datetime.now(timezone.utc).isoformat(),
+            "started_at": None,
+            "finished_at": None,
+            "result": None,
+            "error": None,
+        }
+        return self.get(job_id)  # type: ignore[return-value]
+
+    def get(self, job_id: str) -> dict[str, Any] | None:
+        """Return a copy of the job's status record, or None if unknown."""
+        job = self._jobs.get(job_id)
+        return dict(job) if job is not None else None
+
+    def stats(self) -> dict[str, int]:
+        """Queue depth and job counts by status."""
+        counts = {"queued": 0, "running": 0, "succeeded": 0, "failed": 0}
+        for job in self._jobs.values():
+            counts[job["status"]] += 1
+        return {
+            "workers": self.workers,
+            "max_queue": self.max_queue,
+            "queue_depth": self._queue.qsize() if self._queue else 0,
+            **counts,
+        }
@@ -0,0 +1,121 @@
+"""
+SYNAPSE-X — Stage Scheduler
+Runs pipeline stages as a dependency DAG: every stage starts as soon as the
+stages it depends on have finished, so independent stages overlap.
+Synchronous stages are dispatched to a shared worker pool; async stages are
+awaited on the calling event loop.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import functools
+import inspect
+import os
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, NamedTuple, Sequence
+
+
+# ── Worker pool ──────────────────────────────────────────────────────────────
+_POOL = ThreadPoolExecutor(
+    max_workers=int(os.getenv("SYNAPSE_STAGE_WORKERS", "8")),
+    thread_name_prefix="synapse-stage",
+)
+
+
+class Stage(NamedTuple):
+    """
+    A single node in the pipeline DAG.
+
+    ``run`` receives the results of all completed stages (keyed by stage
+    name) and may be a plain function or a coroutine function.
+    """
+
+    name: str
+    run: Callable[[dict[str, Any]], Any]
+    after: tuple[str, ...] = ()
+
+
+def _validate(stages: Sequence[Stage]) -> None:
+    """Reject duplicate names, unknown dependencies and cycles."""
+    names = [s.name for s in stages]
+    if len(set(names)) != len(names):
+        raise ValueError(f"Duplicate stage names in {names}")
+    known = set(names)
+    for stage in stages:
+        missing = [d for d in stage.after if d not in known]
+        if missing:
+            raise ValueError(f"Stage {stage.name!r} depends on unknown stages {missing}")
+
+    # Kahn's algorithm — anything left over sits on a cycle
+    pending = {s.name: set(s.after) for s in stages}
+    while pending:
+        ready = [n for n, deps in pending.items() if not deps]
+        if not ready:
+            raise ValueError(f"Dependency cycle between stages {sorted(pending)}")
+        for name in ready:
+            del pending[name]
+        for deps in pending.values():
+            deps.difference_update(ready)
+
+
+async def run_stages(
+    stages: Sequence[Stage],
+    on_complete: Callable[[str, Any, dict[str, float]], None] | None = None,
+) -> tuple[dict[str, Any], dict[str, dict[str, float]]]:
+    """
+    Execute ``stages`` concurrently, respecting their dependencies.
+
+    ``on_complete(name, result, timing)`` is invoked on the event loop as
+    soon as each stage finishes.
+
+    Returns:
+        (results, timings) — results keyed by stage name, and per-stage
+        ``started_at`` (seconds since the scheduler started) and
+        ``duration_seconds``.
+
+    Raises:
+        The first exception raised by any stage; stages that have not
+        finished yet are cancelled.
+    """
+    _validate(stages)
+    loop = asyncio.get_running_loop()
+    origin = time.perf_counter()
+    results: dict[str, Any] = {}
+    timings: dict[str, dict[str, float]] = {}
+    tasks: dict[str, asyncio.Task[Any]] = {}
+
+    async def _execute(stage: Stage) -> None:
+        if stage.after:
+            await asyncio.gather(*(tasks[d] for d in stage.after))
+        started = time.perf_counter()
+        if inspect.iscoroutinefunction(stage.run):
+            value = await stage.run(results)
+        else:
+            value = await loop.run_in_executor(_POOL, functools.partial(stage.run, results))
+        finished = time.perf_counter()
+        results[stage.name] = value
+        timings[stage.name] = {
+            "started_at": round(started - origin, 6),
+            "duration_seconds": round(finished - started, 6),
+        }
+        if on_complete is not None:
+            on_complete(stage.name, value, timings[stage.name])
+
+    by_name = {s.name: s for s in stages}
+    remaining = list(by_name)
+    # Create tasks in dependency order so every awaited dependency exists
+    while remaining:
+        for name in list(remaining):
+            if all(d in tasks for d in by_name[name].after):
+                tasks[name] = asyncio.ensure_future(_execute(by_name[name]))
+                remaining.remove(name)
+
+    try:
+        await asyncio.gather(*tasks.values())
+    except BaseException:
+        for task in tasks.values():
+            task.cancel()
+        raise
+    return results, timings
@@ -2,7 +2,7 @@
 import React, { useState, useEffect, useCallback } from 'react';
 import { SystemStatus, LogEntry, AgentNode, DoctorData, DevOpsData } from './types';
 import { INITIAL_NODES, EXAMPLE_PROMPTS } from './constants';
-import { runPipeline, PipelineResponse } from './services/api';
+import { streamPipeline, PipelineResponse, PipelineStreamEvent } from './services/api';
 import Navbar from './components/Navbar';
 import PromptConsole from './components/PromptConsole';
 import AgentTree from './components/AgentTree';
@@ -69,8 +69,8 @@ function App() {
     setProgress(5);
 
     try {
-      // ── Fire real backend call ──
-      addLog('SYSTEM', `POST /build → "${prompt.slice(0, 60)}…"`, 'INFO');
+      // ── Stream the backend build: every stage renders as soon as it finishes ──
+      addLog('SYSTEM', `POST /build/stream → "${prompt.slice(0, 60)}…"`, 'INFO');
       updateNode('seed', { status: 'DONE' });
       setProgress(10);
 
@@ -79,71 +79,80 @@ function App() {
       addLog('PARENT', 'Backend orchestrator analyzing prompt…', 'INFO');
       setProgress(15);
 
-      const result: PipelineResponse = await runPipeline(prompt);
-
-      // ── Map backend response to UI state ──
-      setPipelineDuration(result.duration_seconds);
-      setMcpActivity(result.mcp_activity || []);
-
-      // Parent done
-      updateNode('parent', { status: 'DONE' });
-      addLog('PARENT', `Analysis complete — engine: ${result.metadata?.engine || 'unknown'}`, 'SUCCESS');
-      setProgress(30);
-
-      // ── Stage 2: Children spawn ──
-      setStatus(SystemStatus.BUILDING);
-      updateNode('child1', { visible: true, status: 'ACTIVE' });
-      updateNode('child2', { visible: true, status: 'ACTIVE' });
-      addLog('CHILD', `Dev Agent: ${result.stages['2_dev_agent']?.status?.endpoints_created ?? 0} endpoints generated`, 'INFO');
-      await new Promise(r => setTimeout(r, 400));
-
-      updateNode('child1', { status: 'DONE' });
-      updateNode('child2', { status: 'DONE' });
-      addLog('CHILD', 'Code generation complete.', 'SUCCESS');
-      setProgress(50);
-
-      // ── Stage 3: DevOps ──
-      setStatus(SystemStatus.DEPLOYING);
-      updateNode('child3', { visible: true, status: 'ACTIVE' });
-      const devops = result.stages['3_devops_agent'];
-      if (devops && !devops.skipped) {
-        setDevopsData(devops as DevOpsData);
-        addLog('CHILD', `DevOps Agent: ${devops.status?.files_generated ?? 0} infra files generated`, 'INFO');
-      }
-      await new Promise(r => setTimeout(r, 400));
-      updateNode('child3', { status: 'DONE' });
-      addLog('CHILD', 'Infrastructure locked and loaded.', 'SUCCESS');
-      setProgress(70);
-
-      // ── Stage 4: Doctor healing ──
-      setStatus(SystemStatus.HEALING);
-      updateNode('doctor', { visible: true, status: 'ACTIVE' });
-      const doctor = result.stages['4_doctor_healing'];
-      if (doctor && !doctor.skipped) {
-        setDoctorData(doctor as DoctorData);
-        addLog('DOCTOR', `Scan complete: ${doctor.stats?.issues_found ?? 0} issues found, ${doctor.stats?.issues_healed ?? 0} auto-healed`, 'WARN');
-        if (doctor.improvement_summary) {
-          doctor.improvement_summary.forEach((imp: string) => {
-            addLog('DOCTOR', imp, 'SUCCESS');
-          });
+      const done = new Set<string>();
+      const final: { result?: Omit<PipelineResponse, 'stages'> } = {};
+
+      const onStage = (stage: string, data: Record<string, any>) => {
+        done.add(stage);
+        setProgress(15 + done.size * 16);
+        switch (stage) {
+          case '1_parent_analysis':
+            updateNode('parent', { status: 'DONE' });
+            addLog('PARENT', `Analysis complete — engine: ${data.metadata?.engine || 'unknown'}`, 'SUCCESS');
+            // Dev and DevOps run concurrently on the backend
+            setStatus(SystemStatus.BUILDING);
+            updateNode('child1', { visible: true, status: 'ACTIVE' });
+            updateNode('child2', { visible: true, status: 'ACTIVE' });
+            updateNode('child3', { visible: true, status: 'ACTIVE' });
+            break;
+          case '2_dev_agent':
+            addLog('CHILD', `Dev Agent: ${data.status?.endpoints_created ?? 0} endpoints generated`, 'INFO');
+            updateNode('child1', { status: 'DONE' });
+            updateNode('child2', { status: 'DONE' });
+            addLog('CHILD', 'Code generation complete.', 'SUCCESS');
+            break;
+          case '3_devops_agent':
+            setStatus(SystemStatus.DEPLOYING);
+            if (!data.skipped) {
+              setDevopsData(data as DevOpsData);
+              addLog('CHILD', `DevOps Agent: ${data.status?.files_generated ?? 0} infra files generated`, 'INFO');
+            }
+            updateNode('child3', { status: 'DONE' });
+            addLog('CHILD', 'Infrastructure locked and loaded.', 'SUCCESS');
+            break;
+          case '4_doctor_healing':
+            updateNode('doctor', { visible: true, status: 'DONE' });
+            if (!data.skipped) {
+              setDoctorData(data as DoctorData);
+              addLog('DOCTOR', `Scan complete: ${data.stats?.issues_found ?? 0} issues found, ${data.stats?.issues_healed ?? 0} auto-healed`, 'WARN');
+              (data.improvement_summary || []).forEach((imp: string) => addLog('DOCTOR', imp, 'SUCCESS'));
+            }
+            break;
+          case '5_github_push':
+            if (data.push?.status === 'up_to_date') {
+              addLog('MCP', `Git MCP: no changes, push skipped (HEAD ${data.push.commit?.sha ?? 'empty'})`, 'INFO');
+            } else if (data.push?.commit?.sha) {
+              addLog('MCP', `Git MCP: code pushed → ${data.push.commit.sha}`, 'SUCCESS');
+            }
+            break;
         }
-      }
-      await new Promise(r => setTimeout(r, 600));
-      updateNode('doctor', { status: 'DONE' });
-      setProgress(90);
-
-      // ── MCP activity logs ──
-      if (result.mcp_activity) {
-        result.mcp_activity.forEach((act: string) => {
-          addLog('MCP', act, 'INFO');
-        });
-      }
+        // The Doctor starts once both child agents have delivered
+        if ((stage === '2_dev_agent' || stage === '3_devops_agent') && done.has('2_dev_agent') && done.has('3_devops_agent')) {
+          setStatus(SystemStatus.HEALING);
+          updateNode('doctor', { visible: true, status: 'ACTIVE' });
+        }
+      };
+
+      await streamPipeline(prompt, (evt: PipelineStreamEvent) => {
+        switch (evt.event) {
+          case 'stage':
+            onStage(evt.data.stage, evt.data.result);
+            break;
+          case 'mcp_activity':
+            setMcpActivity(prev => [...prev, evt.data.message]);
+            addLog('MCP', evt.data.message, 'INFO');
+            break;
+          case 'error':
+            throw new Error(evt.data.detail);
+          case 'complete':
+            final.result = evt.data;
+            break;
+        }
+      });
 
-      // ── Stage 5: GitHub push ──
-      const gh = result.stages['5_github_push'];
-      if (gh?.push?.commit?.sha) {
-        addLog('MCP', `Git MCP: code pushed → ${gh.push.commit.sha}`, 'SUCCESS');
-      }
+      const result = final.result;
+      if (!result) throw new Error('Pipeline stream ended before completion');
+      setPipelineDuration(result.duration_seconds);
 
       setProgress(100);
       setStatus(SystemStatus.COMPLETE);
@@ -62,7 +62,7 @@ const MCPPanel: React.FC = () => {
                 </div>
                 <div>
                   <span className="text-[10px] font-space font-bold text-slate-300 block">{mcp.name}</span>
-                  <span className="text-[8px] font-mono text-slate-600">{mcp.invocations} calls</span>
+                  <span className="text-[8px] font-mono text-slate-600">{mcp.invocations} calls{mcp.errors ? ` · ${mcp.errors} err` : ''}{mcp.latency?.p95_ms != null ? ` · p95 ${mcp.latency.p95_ms}ms` : ''}</span>
                 </div>
               </div>
               <div className="flex items-center gap-2">
@@ -12,6 +12,7 @@ export interface BackendLogEntry {
   level: string;
   timestamp: string;
   data?: Record<string, unknown>;
+  run_id?: string | null;
 }
 
 export interface MCPServerInfo {
@@ -21,12 +22,27 @@ export interface MCPServerInfo {
   capabilities: string[];
   icon: string;
   invocations: number;
+  errors: number;
   last_used: string | null;
+  latency: MCPLatency;
+  stats?: Record<string, any>;
+}
+
+export interface MCPLatency {
+  count: number;
+  mean_ms: number | null;
+  max_ms: number | null;
+  p50_ms: number | null;
+  p95_ms: number | null;
+  p99_ms: number | null;
+  buckets: Record<string, number>;
 }
 
 export interface PipelineResponse {
   pipeline: string;
+  run_id: string;
   prompt: string;
+  coalesced: boolean;
   duration_seconds: number;
   stages: {
     "1_parent_analysis": Record<string, any>;
@@ -35,20 +51,85 @@ export interface PipelineResponse {
     "4_doctor_healing": Record<string, any>;
     "5_github_push": Record<string, any>;
   };
+  stage_timings: Record<string, { started_at: number; duration_seconds: number }>;
   mcp_activity: string[];
   logs: BackendLogEntry[];
   metadata: Record<string, any>;
 }
 
-/** Trigger the full orchestration pipeline */
+export interface BuildJob {
+  job_id: string;
+  status: "queued" | "running" | "succeeded" | "failed";
+  prompt: string;
+  submitted_at: string;
+  started_at: string | null;
+  finished_at: string | null;
+  result: PipelineResponse | null;
+  error: string | null;
+}
+
+const BUILD_POLL_INTERVAL_MS = 500;
+
+/**
+ * Trigger the full orchestration pipeline and wait for the queued job to finish.
+ * Jobs are held in the server process, so this needs a long-lived backend;
+ * the dashboard uses `streamPipeline`, which completes within one request.
+ */
 export async function runPipeline(prompt: string): Promise<PipelineResponse> {
   const res = await fetch(`${API_BASE_URL}/build`, {
     method: "POST",
     headers: { "Content-Type": "application/json" },
     body: JSON.stringify({ prompt }),
   });
+  if (res.status === 429) throw new Error("Pipeline queue is full, try again shortly");
   if (!res.ok) throw new Error(`Pipeline failed: HTTP ${res.status}`);
-  return res.json();
+  let job: BuildJob = await res.json();
+
+  while (job.status === "queued" || job.status === "running") {
+    await new Promise((resolve) => setTimeout(resolve, BUILD_POLL_INTERVAL_MS));
+    const poll = await fetch(`${API_BASE_URL}/build/${job.job_id}`);
+    if (!poll.ok) throw new Error(`Pipeline status failed: HTTP ${poll.status}`);
+    job = await poll.json();
+  }
+  if (job.status === "failed" || !job.result) {
+    throw new Error(`Pipeline failed: ${job.error ?? "unknown error"}`);
+  }
+  return job.result;
+}
+
+export type PipelineStreamEvent =
+  | { event: "stage"; data: { stage: keyof PipelineResponse["stages"]; result: Record<string, any>; timing: { started_at: number; duration_seconds: number } } }
+  | { event: "mcp_activity"; data: { message: string } }
+  | { event: "complete"; data: Omit<PipelineResponse, "stages"> }
+  | { event: "error"; data: { detail: string } };
+
+/** Run the pipeline, invoking `onEvent` for each Server-Sent Event as stages complete */
+export async function streamPipeline(
+  prompt: string,
+  onEvent: (evt: PipelineStreamEvent) => void,
+): Promise<void> {
+  const res = await fetch(`${API_BASE_URL}/build/stream`, {
+    method: "POST",
+    headers: { "Content-Type": "application/json", Accept: "text/event-stream" },
+    body: JSON.stringify({ prompt }),
+  });
+  if (!res.ok || !res.body) throw new Error(`Pipeline stream failed: HTTP ${res.status}`);
+
+  const reader = res.body.pipeThrough(new TextDecoderStream()).getReader();
+  let buffer = "";
+  for (;;) {
+    const { value, done } = await reader.read();
+    if (done) break;
+    buffer += value;
+    let boundary: number;
+    while ((boundary = buffer.indexOf("\n\n")) !== -1) {
+      const frame = buffer.slice(0, boundary);
+      buffer = buffer.slice(boundary + 2);
+      const event = frame.match(/^event: (.*)$/m)?.[1];
+      const data = frame.match(/^data: (.*)$/m)?.[1];
+      if (event && data) onEvent({ event, data: JSON.parse(data) } as PipelineStreamEvent);
+    }
+  }
 }
 
 /** Fetch live MCP server registry */
@@ -58,13 +139,29 @@ export async function fetchMCPStatus(): Promise<Record<string, MCPServerInfo>> {
   return res.json();
 }
 
-/** Fetch pipeline logs */
-export async function fetchLogs(limit = 50): Promise<BackendLogEntry[]> {
-  const res = await fetch(`${API_BASE_URL}/logs?limit=${limit}`);
+/** Fetch pipeline logs, optionally scoped to a single run */
+export async function fetchLogs(limit = 50, runId?: string): Promise<BackendLogEntry[]> {
+  const params = new URLSearchParams({ limit: String(limit) });
+  if (runId) params.set("run_id", runId);
+  const res = await fetch(`${API_BASE_URL}/logs?${params}`);
   if (!res.ok) throw new Error(`Logs fetch failed: HTTP ${res.status}`);
   return res.json();
 }
 
+/** Live-tail new log entries over SSE; returns a function that closes the stream */
+export function subscribeLogs(
+  onEntry: (entry: BackendLogEntry) => void,
+  filters: { agent?: string; level?: string; runId?: string } = {},
+): () => void {
+  const params = new URLSearchParams();
+  if (filters.agent) params.set("agent", filters.agent);
+  if (filters.level) params.set("level", filters.level);
+  if (filters.runId) params.set("run_id", filters.runId);
+  const source = new EventSource(`${API_BASE_URL}/logs/stream?${params}`);
+  source.addEventListener("log", (evt) => onEntry(JSON.parse((evt as MessageEvent).data)));
+  return () => source.close();
+}
+
 /** Backend health check */
 export async function fetchHealth(): Promise<{ status: string }> {
   const res = await fetch(`${API_BASE_URL}/health`);
@@ -50,20 +50,40 @@ export interface MCPService {
 }
 
 export interface DoctorData {
-  issues_detected: Array<{ id: string; severity: string; description: string }>;
+  issues_detected: Array<{
+    id: string;
+    severity: string;
+    description: string;
+    locations?: Array<{ line: number; start: number; end: number }>;
+  }>;
   healed_code: string;
+  healing_diff?: string;
+  service_code_skipped?: boolean;
   improvement_summary: string[];
   stats: { issues_found: number; issues_healed: number; advisory_only: number };
+  artifact_audit?: {
+    artifacts: Record<string, {
+      file_type: string | null;
+      skipped?: boolean;
+      issues_detected?: DoctorData['issues_detected'];
+      duration_seconds: number;
+    }>;
+    stats: { artifacts_audited: number; issues_found: number; critical: number };
+    duration_seconds: number;
+  };
 }
 
 export interface DevOpsData {
   dockerfile: string;
   deployment_script: string;
   ci_config: string;
+  ci_config_path: string;
   infra_metadata: {
     container_runtime: string;
     ci_provider: string;
     exposed_port: number;
+    health_endpoint: string;
+    python_version: string;
   };
   status: { files_generated: number };
 }